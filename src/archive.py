@@ -0,0 +1,123 @@
+"""
+Archive Module - keeps the live download tree within a disk budget
+
+Whole months (files/<ministry>/<year>/<month>/) are moved, least recently accessed
+first, into files/archive/<ministry>/<year>/<month>.zip. A zip's central directory
+lets a single gazette be read back without unpacking the rest, which is how the file
+browser opens archived PDFs (see materialize). Archived gazettes are recorded in the
+catalogue so later runs never download them again.
+"""
+
+import hashlib
+import os
+import shutil
+import zipfile
+from datetime import date
+
+ARCHIVE_DIR = 'archive'
+
+
+def _folder_size(folder):
+    return sum(entry.stat().st_size for entry in os.scandir(folder) if entry.is_file())
+
+
+class DiskBudget:
+    """Archives the least recently used months once the live tree exceeds budget_bytes"""
+
+    def __init__(self, files_root, catalogue, budget_bytes):
+        self.files_root = files_root
+        self.catalogue = catalogue
+        self.budget_bytes = budget_bytes
+
+    def month_folders(self):
+        """(ministry, year, month, folder) of every live month folder"""
+        months = []
+        for ministry in sorted(os.listdir(self.files_root)) if os.path.isdir(self.files_root) else ():
+            ministry_path = os.path.join(self.files_root, ministry)
+            if not os.path.isdir(ministry_path):
+                continue
+            for year in os.listdir(ministry_path):
+                year_path = os.path.join(ministry_path, year)
+                if not (year.isdigit() and os.path.isdir(year_path)):
+                    continue
+                for month in os.listdir(year_path):
+                    folder = os.path.join(year_path, month)
+                    if month.isdigit() and os.path.isdir(folder):
+                        months.append((ministry, int(year), int(month), folder))
+        return months
+
+    def _last_access(self, ministry, year, month, folder):
+        # Files that predate the catalogue only have their modification time to go by
+        newest_file = max((entry.stat().st_mtime for entry in os.scandir(folder) if entry.is_file()), default=0)
+        return max(self.catalogue.last_access(ministry, year, month) or 0, newest_file)
+
+    def enforce(self):
+        """Archive old months until the live tree fits the budget; returns the archives written"""
+        if not self.budget_bytes:
+            return []
+        today = date.today()
+        months = self.month_folders()
+        sizes = {folder: _folder_size(folder) for *_, folder in months}
+        usage = sum(sizes.values())
+        if usage <= self.budget_bytes:
+            return []
+        # The current month is still being downloaded into and is never archived
+        candidates = [m for m in months if (m[1], m[2]) != (today.year, today.month)]
+        candidates.sort(key=lambda m: self._last_access(*m))
+        written = []
+        for ministry, year, month, folder in candidates:
+            if usage <= self.budget_bytes:
+                break
+            written.append(self.archive_month(ministry, year, month, folder))
+            usage -= sizes[folder]
+        print(f"Disk budget: archived {len(written)} months, live downloads now {usage / 1024 ** 2:.0f} MB "
+              f"of {self.budget_bytes / 1024 ** 2:.0f} MB")
+        return written
+
+    def archive_month(self, ministry, year, month, folder):
+        """Move one month folder into its zip (appending if the month was archived before)"""
+        archive_path = os.path.join(self.files_root, ARCHIVE_DIR, ministry, str(year), f"{month}.zip")
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        names = sorted(entry.name for entry in os.scandir(folder) if entry.is_file() and not entry.name.endswith('.part'))
+        partial = archive_path + '.part'
+        if os.path.exists(archive_path):
+            shutil.copyfile(archive_path, partial)
+        with zipfile.ZipFile(partial, 'a', compression=zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+            existing = set(zf.namelist())
+            for name in names:
+                if name not in existing:
+                    zf.write(os.path.join(folder, name), name)
+        # Only drop the folder once the complete archive is in place
+        os.replace(partial, archive_path)
+        gids = [os.path.splitext(name)[0] for name in names if name.lower().endswith('.pdf')]
+        self.catalogue.mark_archived(ministry, year, month, archive_path, gids)
+        shutil.rmtree(folder)
+        print(f"Archived {ministry} {year}-{month:02d}: {len(gids)} gazettes -> {archive_path}")
+        return archive_path
+
+
+def split_archive_path(path):
+    """(zip path, member) for a path that points inside an archive, else None"""
+    head, member = os.path.split(path)
+    if head.lower().endswith('.zip') and os.path.isfile(head):
+        return head, member
+    return None
+
+
+def materialize(path, cache_dir):
+    """Return a real file for path, extracting it from its archive into cache_dir if needed"""
+    inside = split_archive_path(path)
+    if inside is None:
+        return path
+    archive_path, member = inside
+    folder = hashlib.sha1(os.path.abspath(archive_path).encode('utf-8')).hexdigest()[:12]
+    target = os.path.join(cache_dir, folder, member)
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with zipfile.ZipFile(archive_path) as zf:
+            # The month's keywords.json comes along so the viewer can highlight matches
+            for name in [member] + [n for n in ('keywords.json',) if n in zf.namelist() and n != member]:
+                with zf.open(name) as src, open(os.path.join(os.path.dirname(target), name + '.part'), 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(os.path.join(os.path.dirname(target), name + '.part'), os.path.join(os.path.dirname(target), name))
+    return target
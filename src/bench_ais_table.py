@@ -0,0 +1,93 @@
+"""
+ARAI Table Benchmark - per-row locator reads versus the single evaluate_all read
+
+Renders a synthetic ARAI downloads table in a local page (no network needed) and times
+the row walk ais_extract_pdfs used to do, one locator round-trip per cell plus a
+rows.count() per iteration, against the AIS_ROWS_JS bulk read it does now.
+
+Usage:
+    python bench_ais_table.py                      # 50, 200 and 800 rows with Edge
+    python bench_ais_table.py --rows 300 --channel chromium --repeat 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+ROW_HTML = ('<tr><td>{i}</td><td>AIS-{i:03d} (Rev. 1)</td><td>Draft standard {i}</td>'
+            '<td><a href="/uploads/ais/AIS-{i:03d}.pdf">Download</a></td></tr>')
+
+
+def table_html(rows):
+    body = ''.join(ROW_HTML.format(i=i) for i in range(rows))
+    return f"<html><body><table><thead><tr><th>#</th><th>Code</th><th>Title</th><th>File</th></tr></thead><tbody>{body}</tbody></table></body></html>"
+
+
+async def read_per_row(rows):
+    """The row walk ais_extract_pdfs used before the bulk read"""
+    entries = []
+    for i in range(await rows.count()):
+        row = rows.nth(i)
+        code = await row.locator('td').nth(1).text_content()
+        if not code:
+            continue
+        pdf_url = await row.locator('td').nth(3).locator('a').get_attribute('href')
+        entries.append([code, pdf_url])
+    return entries
+
+
+async def read_bulk(rows, rows_js):
+    return await rows.evaluate_all(rows_js)
+
+
+async def measure(page, selector, rows_js, row_count, repeat):
+    """Best and median seconds of each read for one table size"""
+    await page.set_content(table_html(row_count))
+    rows = page.locator(selector).first.locator('tbody tr')
+    results = {}
+    for name, read in (('per-row', lambda: read_per_row(rows)), ('evaluate_all', lambda: read_bulk(rows, rows_js))):
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            entries = await read()
+            times.append(time.perf_counter() - started)
+        if len(entries) != row_count:
+            raise RuntimeError(f"{name} read {len(entries)} of {row_count} rows")
+        results[name] = (min(times), statistics.median(times))
+    return results
+
+
+async def run(args):
+    from playwright.async_api import async_playwright
+    # The shipped selector and script, so the benchmark follows changes to them
+    from page_scripts import AIS_ROWS_JS, AIS_TABLE_SELECTOR
+
+    async with async_playwright() as p:
+        try:
+            browser = await p.chromium.launch(channel=args.channel, headless=True)
+        except Exception as e:
+            print(f"Could not launch the {args.channel} browser ({e}); run this where the app's browser is installed")
+            return 2
+        page = await browser.new_page()
+        print(f"{'rows':>6}  {'per-row ms':>11}  {'evaluate_all ms':>15}  speedup  (best of {args.repeat}, median in brackets)")
+        for row_count in args.rows:
+            results = await measure(page, AIS_TABLE_SELECTOR, AIS_ROWS_JS, row_count, args.repeat)
+            (slow, slow_median), (fast, fast_median) = results['per-row'], results['evaluate_all']
+            print(f"{row_count:6d}  {slow * 1000:6.0f} ({slow_median * 1000:4.0f})  {fast * 1000:10.1f} ({fast_median * 1000:4.1f})  {slow / fast:6.0f}x")
+        await browser.close()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reading the ARAI table per row versus in one evaluate_all")
+    parser.add_argument("--rows", type=int, nargs='+', default=[50, 200, 800], help="table sizes to measure")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per table size")
+    parser.add_argument("--channel", default="msedge", help="browser channel, as used by the app (msedge) or chromium")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Browser Pool Module - pre-warmed Playwright contexts with recycling and crash recovery
+"""
+
+import asyncio
+from playwright.async_api import Error as PlaywrightError
+
+try:
+    import psutil
+except ImportError:  # RSS based recycling is skipped without psutil
+    psutil = None
+
+BROWSER_PROCESS_NAMES = ('msedge', 'chrome', 'chromium', 'headless_shell')
+
+
+class PooledContext:
+    """A browser context with its working page and health bookkeeping"""
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+        self.crashed = False
+        self.last_beat = asyncio.get_running_loop().time()
+
+    def beat(self, *_):
+        """Record that the page is still making progress"""
+        self.last_beat = asyncio.get_running_loop().time()
+
+
+class BrowserPool:
+    """Keeps warm contexts ready and replaces them when they age, bloat, crash or hang"""
+
+    def __init__(self, browser, setup=None, size=2, max_uses=10, max_rss_mb=1500,
+                 hang_timeout=90, retries=1):
+        self.browser = browser
+        self.setup = setup
+        self.size = size
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self.hang_timeout = hang_timeout
+        self.retries = retries
+        self.idle = asyncio.Queue()
+        self.warming = set()
+
+    async def _new_slot(self):
+        context = await self.browser.new_context(accept_downloads=True)
+        page = await context.new_page()
+        slot = PooledContext(context, page)
+        page.on('crash', lambda *_: setattr(slot, 'crashed', True))
+        page.on('response', slot.beat)
+        if self.setup:
+            try:
+                await self.setup(page)
+            except Exception:
+                await self._dispose(slot)
+                raise
+        return slot
+
+    async def _warm(self):
+        try:
+            await self.idle.put(await self._new_slot())
+        except Exception as e:
+            print(f"Could not warm a browser context: {e}")
+            # Wakes up a waiting acquire(), which then builds the context itself
+            await self.idle.put(None)
+
+    def _warm_in_background(self):
+        task = asyncio.create_task(self._warm())
+        self.warming.add(task)
+        task.add_done_callback(self.warming.discard)
+
+    async def start(self):
+        """Pre-warm contexts until the pool holds `size` of them"""
+        missing = self.size - self.idle.qsize() - len(self.warming)
+        await asyncio.gather(*(self._warm() for _ in range(max(missing, 0))))
+
+    async def acquire(self):
+        """Take a warm context, building one if none is ready"""
+        slot = None
+        if not self.idle.empty() or self.warming:
+            slot = await self.idle.get()
+        return slot or await self._new_slot()
+
+    async def release(self, slot, healthy=True):
+        """Return a context to the pool, or replace it when it should be recycled"""
+        slot.uses += 1
+        recycle = not healthy or slot.crashed or slot.uses >= self.max_uses
+        if not recycle and self._over_rss_limit():
+            print(f"Browser RSS above {self.max_rss_mb} MB, recycling contexts")
+            recycle = True
+            while not self.idle.empty():
+                stale = self.idle.get_nowait()
+                if stale:
+                    await self._dispose(stale)
+                    self._warm_in_background()
+        if recycle:
+            await self._dispose(slot)
+            self._warm_in_background()
+        else:
+            await self.idle.put(slot)
+
+    async def run(self, job, label):
+        """Run job(page) on a pooled context, retrying on a fresh one after a crash or hang"""
+        for attempt in range(self.retries + 1):
+            slot = await self.acquire()
+            slot.beat()
+            task = asyncio.create_task(job(slot.page))
+            hung = False
+            while not task.done():
+                try:
+                    await asyncio.wait({task}, timeout=1)
+                except asyncio.CancelledError:
+                    # Abort the in-flight Playwright calls and drop the half-used page with them
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    await self.release(slot, healthy=False)
+                    raise
+                idle_for = asyncio.get_running_loop().time() - slot.last_beat
+                if not task.done() and (slot.crashed or idle_for > self.hang_timeout):
+                    hung = not slot.crashed
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+            failed = slot.crashed or hung
+            if not failed and task.exception() and isinstance(task.exception(), PlaywrightError):
+                failed = slot.page.is_closed()
+            await self.release(slot, healthy=not failed)
+            if not failed:
+                return task.result()
+            reason = "crashed" if slot.crashed else "hung" if hung else "closed"
+            print(f"Browser page {reason} while processing {label} (attempt {attempt + 1})")
+        return None
+
+    def _over_rss_limit(self):
+        if psutil is None or not self.max_rss_mb:
+            return False
+        rss = 0
+        for child in psutil.Process().children(recursive=True):
+            try:
+                if child.name().lower().startswith(BROWSER_PROCESS_NAMES):
+                    rss += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return rss / (1024 * 1024) > self.max_rss_mb
+
+    async def _dispose(self, slot):
+        try:
+            await slot.context.close()
+        except Exception as e:
+            print(f"Error closing browser context: {e}")
+
+    async def close(self):
+        """Close every context held by the pool"""
+        for task in list(self.warming):
+            task.cancel()
+        await asyncio.gather(*self.warming, return_exceptions=True)
+        while not self.idle.empty():
+            slot = self.idle.get_nowait()
+            if slot:
+                await self._dispose(slot)
@@ -0,0 +1,153 @@
+"""
+Gazette Catalogue Module - sqlite record of every downloaded or archived gazette
+
+Rows are keyed by (ministry, gid), where gid is the file name stem used on disk. The
+catalogue outlives the files: once a month is archived (see archive.py) its gazettes stay
+here with status 'archived', so they are never fetched again, and last_access drives
+which months are archived first.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+
+
+class Catalogue:
+    """Thread-safe sqlite catalogue; connects lazily so importing it costs nothing"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = Lock()
+        self.db = None
+
+    def _connect(self):
+        if self.db is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            # The GUI touches rows while the engine writes them, so allow a short wait
+            self.db = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            self.db.row_factory = sqlite3.Row
+            self.db.executescript("""
+                PRAGMA journal_mode = WAL;
+                CREATE TABLE IF NOT EXISTS gazettes (
+                    ministry TEXT NOT NULL,
+                    gid TEXT NOT NULL,
+                    ugid TEXT,
+                    year INTEGER,
+                    month INTEGER,
+                    subject TEXT,
+                    score REAL,
+                    keywords TEXT,
+                    path TEXT,
+                    size INTEGER,
+                    status TEXT NOT NULL,
+                    archive TEXT,
+                    downloaded_at REAL,
+                    last_access REAL,
+                    PRIMARY KEY (ministry, gid)
+                );
+                CREATE INDEX IF NOT EXISTS gazettes_path ON gazettes (path);
+                CREATE INDEX IF NOT EXISTS gazettes_month ON gazettes (ministry, year, month);
+            """)
+        return self.db
+
+    def record(self, ministry, gid, path, ugid=None, year=None, month=None, details=None):
+        """Add or refresh a downloaded gazette; details is its keywords.json entry, if any"""
+        details = details or {}
+        now = time.time()
+        size = os.path.getsize(path) if os.path.exists(path) else None
+        with self.lock:
+            db = self._connect()
+            db.execute("""
+                INSERT INTO gazettes (ministry, gid, ugid, year, month, subject, score, keywords, path, size,
+                                      status, archive, downloaded_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'downloaded', NULL, ?, ?)
+                ON CONFLICT (ministry, gid) DO UPDATE SET
+                    ugid = COALESCE(excluded.ugid, ugid), year = excluded.year, month = excluded.month,
+                    subject = COALESCE(excluded.subject, subject), score = COALESCE(excluded.score, score),
+                    keywords = COALESCE(excluded.keywords, keywords), path = excluded.path,
+                    size = excluded.size, status = 'downloaded', archive = NULL
+            """, (ministry, gid, ugid or details.get('ugid'), year, month, details.get('subject'), details.get('score'),
+                  json.dumps(details['keywords']) if 'keywords' in details else None, path, size, now, now))
+            db.commit()
+
+    def touch(self, path):
+        """Note that a gazette was opened, keeping its month off the archive list"""
+        with self.lock:
+            db = self._connect()
+            db.execute("UPDATE gazettes SET last_access = ? WHERE path = ?", (time.time(), path))
+            db.commit()
+
+    def last_access(self, ministry, year, month):
+        """Latest access (download or view) of any catalogued gazette of a month, or None"""
+        with self.lock:
+            row = self._connect().execute(
+                "SELECT MAX(last_access) FROM gazettes WHERE ministry = ? AND year = ? AND month = ?",
+                (ministry, year, month)).fetchone()
+        return row[0]
+
+    def mark_archived(self, ministry, year, month, archive_path, gids):
+        """Record gids (all files of one month) as moved into archive_path"""
+        with self.lock:
+            db = self._connect()
+            db.executemany("""
+                INSERT INTO gazettes (ministry, gid, year, month, status, archive)
+                VALUES (?, ?, ?, ?, 'archived', ?)
+                ON CONFLICT (ministry, gid) DO UPDATE SET status = 'archived', archive = excluded.archive, path = NULL
+            """, [(ministry, gid, year, month, archive_path) for gid in gids])
+            db.commit()
+
+    def is_archived(self, ministry, gid):
+        with self.lock:
+            row = self._connect().execute("SELECT status FROM gazettes WHERE ministry = ? AND gid = ?",
+                                          (ministry, gid)).fetchone()
+        return row is not None and row[0] == 'archived'
+
+    def search(self, text=None, ministry=None, status=None, limit=100, offset=0, year=None, month=None):
+        """Catalogued gazettes, newest first; text matches subject, ids and keywords"""
+        clauses = []
+        params = []
+        if text:
+            clauses.append("(subject LIKE ? OR gid LIKE ? OR ugid LIKE ? OR keywords LIKE ?)")
+            params += [f"%{text}%"] * 4
+        if ministry:
+            clauses.append("ministry = ?")
+            params.append(ministry)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if year:
+            clauses.append("year = ?")
+            params.append(year)
+        if month:
+            clauses.append("month = ?")
+            params.append(month)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.lock:
+            rows = self._connect().execute(
+                f"SELECT * FROM gazettes {where} ORDER BY year DESC, month DESC, score DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]).fetchall()
+        results = []
+        for row in rows:
+            entry = dict(row)
+            entry['keywords'] = json.loads(entry['keywords']) if entry['keywords'] else []
+            results.append(entry)
+        return results
+
+    def merge(self, records):
+        """Upsert rows as returned by search() (e.g. from another worker's catalogue)"""
+        columns = ('ministry', 'gid', 'ugid', 'year', 'month', 'subject', 'score', 'keywords', 'path', 'size',
+                   'status', 'archive', 'downloaded_at', 'last_access')
+        rows = [tuple(json.dumps(record.get(column) or []) if column == 'keywords' else record.get(column)
+                      for column in columns) for record in records]
+        with self.lock:
+            db = self._connect()
+            db.executemany(f"INSERT OR REPLACE INTO gazettes ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", rows)
+            db.commit()
+
+    def close(self):
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
@@ -0,0 +1,141 @@
+"""
+Classification Cache Module - persistent per-query hit counts of gazette subjects across runs
+
+Each normalised subject maps to {query fingerprint: hit count}. A fingerprint covers one
+kwlist query as written plus the matcher version, so editing, adding or removing a keyword
+only invalidates that keyword: the other queries of an already seen subject are served
+from the cache and only the changed ones are evaluated again. Weights are applied when
+scoring and are not part of the key.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from threading import Lock
+
+from query import MATCHER_VERSION
+
+MAX_ENTRIES = 200000
+# Buffered subjects are written out once this many have piled up, so a long batch does not grow memory
+FLUSH_ROWS = 5000
+
+
+def normalize_subject(text):
+    """Collapse whitespace; case is kept because queries may be case sensitive"""
+    return ' '.join(text.split())
+
+
+def fingerprint(query, case_sensitive):
+    key = f"{MATCHER_VERSION}\0{int(bool(case_sensitive))}\0{query}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+class ClassificationCache:
+    """sqlite-backed memo of hit counts with least-recently-used eviction of subjects.
+
+    One row per subject keeps the lookup to a single primary-key read. Recency is
+    tracked per run: subjects read or written are stamped with the current generation
+    when the run commits, and the oldest generations are evicted first once there are
+    more than max_entries subjects. New counts are buffered in memory and written in one
+    transaction per commit, or every flush_rows subjects during a long batch.
+    """
+
+    def __init__(self, db_path, max_entries=MAX_ENTRIES, flush_rows=FLUSH_ROWS):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.flush_rows = flush_rows
+        self.lock = Lock()
+        self.rows = {}  # subject -> counts, everything read or written since the last commit
+        self.dirty = set()
+        self.db = None
+
+    def _connect(self):
+        if self.db is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self.db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.db.executescript("""
+                PRAGMA journal_mode = WAL;
+                PRAGMA synchronous = NORMAL;
+                CREATE TABLE IF NOT EXISTS subjects (
+                    subject TEXT PRIMARY KEY,
+                    counts TEXT NOT NULL,
+                    used INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS subjects_used ON subjects (used);
+            """)
+            row = self.db.execute("SELECT MAX(used) FROM subjects").fetchone()
+            self.generation = (row[0] or 0) + 1
+        return self.db
+
+    def lookup(self, subject, fingerprints):
+        """{fingerprint: hit count} for the fingerprints already known for subject"""
+        with self.lock:
+            found = self.rows.get(subject)
+            if found is None:
+                row = self._connect().execute("SELECT counts FROM subjects WHERE subject = ?", (subject,)).fetchone()
+                found = self.rows[subject] = json.loads(row[0]) if row else {}
+                self._flush_if_full()
+        return {fp: found[fp] for fp in fingerprints if fp in found}
+
+    def store(self, subject, counts):
+        """Record {fingerprint: hit count} for subject, on top of what is already known"""
+        with self.lock:
+            if subject not in self.rows:
+                row = self._connect().execute("SELECT counts FROM subjects WHERE subject = ?", (subject,)).fetchone()
+                self.rows[subject] = json.loads(row[0]) if row else {}
+            self.rows[subject].update(counts)
+            self.dirty.add(subject)
+            self._flush_if_full()
+
+    def _flush_if_full(self):
+        if len(self.rows) >= self.flush_rows:
+            self._write()
+            self.db.commit()
+
+    def _write(self):
+        """Write buffered subjects stamped with the current generation and empty the buffer"""
+        self.db.executemany("INSERT OR REPLACE INTO subjects (subject, counts, used) VALUES (?, ?, ?)",
+                            [(subject, json.dumps(self.rows[subject], separators=(',', ':')), self.generation)
+                             for subject in self.dirty])
+        self.db.executemany("UPDATE subjects SET used = ? WHERE subject = ?",
+                            [(self.generation, subject) for subject in self.rows.keys() - self.dirty])
+        self.rows.clear()
+        self.dirty.clear()
+
+    def commit(self):
+        """Stamp this run's subjects as recently used, evict the oldest subjects and save"""
+        with self.lock:
+            if self.db is None:
+                return
+            self._write()
+            excess = self.db.execute("SELECT COUNT(*) FROM subjects").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self.db.execute("DELETE FROM subjects WHERE subject IN "
+                                "(SELECT subject FROM subjects ORDER BY used LIMIT ?)", (excess,))
+            self.db.commit()
+            self.generation += 1
+
+    def merge(self, other_path):
+        """Fold in the subjects of another cache file, e.g. a coordinator worker's copy"""
+        with self.lock:
+            db = self._connect()
+            self._write()
+            db.commit()
+            db.execute("ATTACH DATABASE ? AS other", (other_path,))
+            try:
+                db.execute("INSERT INTO subjects (subject, counts, used) "
+                           "SELECT subject, counts, ? FROM other.subjects WHERE true "
+                           "ON CONFLICT (subject) DO UPDATE SET counts = json_patch(subjects.counts, excluded.counts), "
+                           "used = excluded.used", (self.generation,))
+                db.commit()
+            finally:
+                db.execute("DETACH DATABASE other")
+        self.commit()
+
+    def close(self):
+        self.commit()
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
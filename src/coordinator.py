@@ -0,0 +1,486 @@
+"""
+Coordinator Module - shares (ministry, month) work units between worker processes and hosts
+
+The coordinator splits a run into one unit per ministry and month and leases units to
+workers over multiprocessing.connection (TCP, authenticated with a shared key). Each
+worker drives its own browser and extends its lease with heartbeats while a unit runs;
+a unit whose lease runs out (dead or unreachable worker) goes back to the queue and is
+leased again. Completed units send back their catalogue rows and scheduler and timeout
+observations, which the coordinator merges into the shared files.
+
+Workers share the download tree but keep their stats, caches and catalogue in
+files/workers/<worker id>/, so the coordinator is the only writer of the shared state
+and the only process that enforces the disk budget, once every unit is finished.
+
+    python coordinator.py serve --months 5 6 --ministries ... --workers 4 [--keywords kw.json]
+    python coordinator.py serve --host 0.0.0.0 --port 6000 --ministries ...
+    python coordinator.py work --address host:6000 --processes 4
+
+Messages are pickled, so anyone holding the key can run code on the coordinator and the
+workers. On localhost the coordinator makes a new key every run and leaves it in a file
+only the user can read, where local workers pick it up. Any other --host needs a shared
+secret in EPUB_COORDINATOR_KEY (or --authkey) on every machine.
+"""
+
+import argparse
+import ipaddress
+import json
+import multiprocessing as mp
+import os
+import secrets
+import shutil
+import socket
+import sys
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from threading import Event, Lock, Thread
+
+from archive import DiskBudget
+from catalogue import Catalogue
+from classification_cache import ClassificationCache
+from scheduler import MinistryScheduler
+from timeouts import AdaptiveTimeouts
+
+LEASE_SECONDS = 90
+HEARTBEAT_SECONDS = 20
+MAX_ATTEMPTS = 3
+WAIT_SECONDS = 2
+CONNECT_SECONDS = 30
+KEY_ENV = 'EPUB_COORDINATOR_KEY'
+DISK_BUDGET_GB = 20
+# ARAI lists (codes 9999/9998 in extraction.valdict) are not split by month
+UNSPLIT_MINISTRIES = ("ARAI - AIS - draft", "ARAI - AIS - published")
+
+
+def _files_path(*parts):
+    """Path under the app's files directory, accounting for PyInstaller bundle"""
+    base = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base, "files", *parts)
+
+
+def _authkey(value=None):
+    """The configured shared secret, or None"""
+    value = value or os.environ.get(KEY_ENV)
+    return value.encode('utf-8') if value else None
+
+
+def _is_loopback(host):
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def _key_path(port):
+    return _files_path("workers", f"coordinator-{port}.key")
+
+
+def _write_key(port, authkey):
+    """Leave a per-run key where local workers find it, readable by this user only"""
+    path = _key_path(port)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(authkey)
+    return path
+
+
+def _read_key(port):
+    try:
+        with open(_key_path(port), 'rb') as f:
+            return f.read() or None
+    except FileNotFoundError:
+        return None
+
+
+class Coordinator:
+    """Leases work units to workers and merges their results.
+
+    Unit states: pending -> leased -> done, or back to pending when a lease expires or the
+    worker reports a failure; after MAX_ATTEMPTS failures a unit is given up as failed.
+    A late completion of a unit that was re-leased is still accepted (first one wins).
+    """
+
+    def __init__(self, units, keywords, catalogue, lease_seconds=LEASE_SECONDS, scheduler=None, timeouts=None):
+        self.keywords = keywords
+        self.catalogue = catalogue
+        self.scheduler = scheduler
+        self.timeouts = timeouts
+        self.stats_lock = Lock()
+        self.lease_seconds = lease_seconds
+        self.lock = Lock()
+        self.finished = Event()
+        self.units = {}
+        for unit_id, (ministry, month) in enumerate(units, 1):
+            self.units[unit_id] = {'id': unit_id, 'ministry': ministry, 'month': month, 'state': 'pending',
+                                   'worker': None, 'expires': None, 'leases': 0, 'attempts': 0, 'records': 0,
+                                   'error': None}
+        if not self.units:
+            self.finished.set()
+
+    def lease(self, worker):
+        """Next unit for worker: ('unit', id, ministry, month, keywords), ('wait', s) or ('finished',)"""
+        with self.lock:
+            self._expire()
+            for unit in self.units.values():
+                if unit['state'] == 'pending':
+                    unit.update(state='leased', worker=worker, expires=time.monotonic() + self.lease_seconds)
+                    unit['leases'] += 1
+                    print(f"Unit {unit['id']} ({unit['ministry']}, month {unit['month']}) leased to {worker}")
+                    return ('unit', unit['id'], unit['ministry'], unit['month'], self.keywords)
+            if any(unit['state'] == 'leased' for unit in self.units.values()):
+                return ('wait', WAIT_SECONDS)
+            return ('finished',)
+
+    def heartbeat(self, worker, unit_id):
+        """Extend the lease; ('lost',) tells a worker its unit was given to someone else"""
+        with self.lock:
+            self._expire()
+            unit = self.units.get(unit_id)
+            if unit is None or unit['state'] != 'leased' or unit['worker'] != worker:
+                return ('lost',)
+            unit['expires'] = time.monotonic() + self.lease_seconds
+            return ('ok',)
+
+    def complete(self, worker, unit_id, records, telemetry=None):
+        if telemetry:
+            self._merge_telemetry(telemetry)
+        with self.lock:
+            unit = self.units.get(unit_id)
+            if unit is None or unit['state'] == 'done':
+                return ('ok',)
+            unit.update(state='done', worker=worker, expires=None, records=len(records))
+        self.catalogue.merge(records)
+        print(f"Unit {unit_id} ({unit['ministry']}, month {unit['month']}) done by {worker}: {len(records)} gazettes")
+        self._check_finished()
+        return ('ok',)
+
+    def _merge_telemetry(self, telemetry):
+        """Fold a worker's scheduler observations and timeout samples into the shared ones"""
+        with self.stats_lock:
+            if self.scheduler is not None:
+                for observation in telemetry.get('scheduler', ()):
+                    self.scheduler.record(*observation)
+            if self.timeouts is not None:
+                self.timeouts.merge(telemetry.get('timeouts', {}))
+
+    def save_stats(self):
+        with self.stats_lock:
+            if self.scheduler is not None:
+                self.scheduler.save()
+            if self.timeouts is not None:
+                self.timeouts.save()
+
+    def fail(self, worker, unit_id, error):
+        with self.lock:
+            unit = self.units.get(unit_id)
+            if unit is None or unit['state'] != 'leased' or unit['worker'] != worker:
+                return ('ok',)
+            self._release(unit, error)
+        self._check_finished()
+        return ('ok',)
+
+    def release_worker(self, worker):
+        """Return the units of a worker whose connection dropped"""
+        with self.lock:
+            for unit in self.units.values():
+                if unit['state'] == 'leased' and unit['worker'] == worker:
+                    self._release(unit, "worker disconnected")
+        self._check_finished()
+
+    def _release(self, unit, error):
+        unit['attempts'] += 1
+        unit['error'] = error
+        unit['state'] = 'failed' if unit['attempts'] >= MAX_ATTEMPTS else 'pending'
+        unit.update(worker=None, expires=None)
+        print(f"Unit {unit['id']} ({unit['ministry']}, month {unit['month']}) {unit['state']}: {error}")
+
+    def _expire(self):
+        now = time.monotonic()
+        for unit in self.units.values():
+            if unit['state'] == 'leased' and unit['expires'] < now:
+                self._release(unit, f"lease of {unit['worker']} expired")
+
+    def _check_finished(self):
+        with self.lock:
+            self._expire()
+            if all(unit['state'] in ('done', 'failed') for unit in self.units.values()):
+                self.finished.set()
+
+    def summary(self):
+        with self.lock:
+            units = list(self.units.values())
+        done = [unit for unit in units if unit['state'] == 'done']
+        failed = [unit for unit in units if unit['state'] == 'failed']
+        return (f"{len(done)}/{len(units)} units done, {len(failed)} failed, "
+                f"{sum(unit['records'] for unit in done)} gazettes catalogued")
+
+    def handle(self, conn):
+        """Serve one worker connection until it closes"""
+        worker = None
+        try:
+            while True:
+                message = conn.recv()
+                kind = message[0]
+                if kind == 'hello':
+                    worker = message[1]
+                    reply = ('ok',)
+                elif kind == 'lease':
+                    reply = self.lease(worker)
+                elif kind == 'heartbeat':
+                    reply = self.heartbeat(worker, message[1])
+                elif kind == 'complete':
+                    reply = self.complete(worker, message[1], message[2], message[3] if len(message) > 3 else None)
+                elif kind == 'failed':
+                    reply = self.fail(worker, message[1], message[2])
+                else:
+                    reply = ('error', f"unknown message {kind!r}")
+                conn.send(reply)
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+            if worker is not None:
+                self.release_worker(worker)
+
+    def serve(self, address, authkey):
+        """Accept workers until every unit is done or failed"""
+        listener = Listener(address, authkey=authkey)
+        print(f"Coordinator listening on {address[0]}:{address[1]} with {len(self.units)} units")
+
+        def accept():
+            while not self.finished.is_set():
+                try:
+                    conn = listener.accept()
+                except (OSError, EOFError, AuthenticationError) as e:
+                    if not self.finished.is_set():
+                        print(f"Rejected worker connection: {e}")
+                    continue
+                Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+        Thread(target=accept, name="coordinator-accept", daemon=True).start()
+        # Leases must also expire when no worker is asking for work
+        while not self.finished.wait(1):
+            self._check_finished()
+        # Let workers that are between polls hear that there is nothing left
+        time.sleep(WAIT_SECONDS + 1)
+        listener.close()
+        self.save_stats()
+        print(f"Coordinator finished: {self.summary()}")
+
+
+class ExtractionRunner:
+    """Runs work units in this process with one browser kept warm between units"""
+
+    def __init__(self, worker_id):
+        import asyncio
+        import extraction as egz
+        self.egz = egz
+        egz.use_worker_state(worker_id)
+        self.loop = asyncio.new_event_loop()
+        if self.loop.run_until_complete(egz.egz_extract_defaults()) < 0:
+            raise RuntimeError("Browser initialization failed")
+
+    def run(self, ministry, month, keywords):
+        """Extract and download one unit; returns its catalogue rows and telemetry for the coordinator"""
+        egz = self.egz
+        egz.set_month(month)
+        egz.eve_sig.set()
+        try:
+            result = self.loop.run_until_complete(
+                egz.run_until_cancelled(egz.extract_mids([ministry], keywords or egz.kwlist)))
+            if result is not None and result < 0:
+                raise RuntimeError(f"Extraction failed for {ministry}")
+            if not egz.eve_sig.is_set():
+                raise RuntimeError("Unit cancelled")
+            egz.egz_download()
+            telemetry = {'scheduler': egz.scheduler.observations, 'timeouts': egz.timeouts.take_fresh()}
+            if egz.inv_valdict.get(ministry) in (9999, 9998):
+                # ARAI lists are not split by month
+                return egz.catalogue.search(ministry=ministry, limit=-1), telemetry
+            return egz.catalogue.search(ministry=ministry, year=egz.today.year, month=egz.today.month, limit=-1), telemetry
+        finally:
+            egz.set_month(None)
+
+    def cancel(self):
+        self.egz.eve_sig.clear()
+
+    def close(self):
+        self.loop.run_until_complete(self.egz.cleanup_browser())
+        self.loop.close()
+
+
+def _connect(address, authkey):
+    """Connect to the coordinator, waiting up to CONNECT_SECONDS for it to start listening"""
+    deadline = time.monotonic() + CONNECT_SECONDS
+    while True:
+        try:
+            return Client(address, authkey=authkey)
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.5)
+
+
+def run_worker(address, authkey, worker_id, runner_factory=ExtractionRunner):
+    """Lease and run units from the coordinator at address until it has none left.
+
+    runner_factory(worker_id) returns an object with run(ministry, month, keywords) ->
+    (records, telemetry or None), cancel() and close().
+    """
+    conn = _connect(address, authkey)
+    runner = runner_factory(worker_id)
+    conn_lock = Lock()
+
+    def call(*message):
+        with conn_lock:
+            conn.send(message)
+            return conn.recv()
+
+    def keep_lease(unit_id, done):
+        while not done.wait(HEARTBEAT_SECONDS):
+            try:
+                if call('heartbeat', unit_id)[0] == 'lost':
+                    print(f"{worker_id}: lease on unit {unit_id} lost, stopping it")
+                    runner.cancel()
+                    return
+            except (EOFError, OSError):
+                return
+
+    try:
+        call('hello', worker_id)
+        while True:
+            reply = call('lease')
+            if reply[0] == 'finished':
+                break
+            if reply[0] == 'wait':
+                time.sleep(reply[1])
+                continue
+            _, unit_id, ministry, month, keywords = reply
+            done = Event()
+            Thread(target=keep_lease, args=(unit_id, done), daemon=True).start()
+            try:
+                records, telemetry = runner.run(ministry, month, keywords)
+            except Exception as e:
+                done.set()
+                call('failed', unit_id, str(e))
+                continue
+            done.set()
+            call('complete', unit_id, records, telemetry)
+    except (EOFError, OSError) as e:
+        print(f"{worker_id}: lost the coordinator ({e})")
+    finally:
+        conn.close()
+        runner.close()
+
+
+def split_units(ministries, months):
+    """(ministry, month) units; ARAI lists get a single (ministry, None) unit whatever the months"""
+    units = []
+    for ministry in dict.fromkeys(ministries):
+        if ministry in UNSPLIT_MINISTRIES or not months:
+            units.append((ministry, None))
+        else:
+            units.extend((ministry, month) for month in months)
+    return units
+
+
+def _parse_address(text):
+    host, _, port = text.rpartition(':')
+    return (host or 'localhost', int(port))
+
+
+def _start_workers(address, authkey, count):
+    """Spawn count local worker processes; returns (processes, worker ids)"""
+    ctx = mp.get_context('spawn')
+    host = os.uname().nodename if hasattr(os, 'uname') else os.environ.get('COMPUTERNAME', 'worker')
+    worker_ids = [f"{host}-{os.getpid()}-{i}" for i in range(count)]
+    workers = [ctx.Process(target=run_worker, args=(address, authkey, worker_id), name=f"worker-{i}")
+               for i, worker_id in enumerate(worker_ids)]
+    for worker in workers:
+        worker.start()
+    return workers, worker_ids
+
+
+def _merge_worker_state(worker_ids):
+    """Fold finished workers' classification caches into the shared one and remove their state"""
+    cache = ClassificationCache(_files_path("cache", "classification.sqlite"))
+    try:
+        for worker_id in worker_ids:
+            folder = _files_path("workers", worker_id)
+            path = os.path.join(folder, "cache", "classification.sqlite")
+            if os.path.exists(path):
+                cache.merge(path)
+            shutil.rmtree(folder, ignore_errors=True)
+    finally:
+        cache.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Share extraction work between processes and hosts")
+    parser.add_argument('--authkey', help=f"shared secret (default: ${KEY_ENV}; on localhost a new key per run)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help="split a run into units and lease them to workers")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=6000)
+    serve.add_argument('--ministries', nargs='+', required=True, help="ministry names as shown in the GUI")
+    serve.add_argument('--months', nargs='*', type=int, default=[], help="months (1-12) of the current year")
+    serve.add_argument('--keywords', help="JSON file of [query, case_sensitive, weight] entries")
+    serve.add_argument('--lease', type=int, default=LEASE_SECONDS, help="lease length in seconds")
+    serve.add_argument('--workers', type=int, default=0, help="local worker processes to start")
+    serve.add_argument('--disk-budget-gb', type=float, default=DISK_BUDGET_GB,
+                       help="archive the least recently used months above this size once all units are done (0 = no limit)")
+    work = commands.add_parser('work', help="run worker processes against a coordinator")
+    work.add_argument('--address', default='localhost:6000')
+    work.add_argument('--processes', type=int, default=1)
+    args = parser.parse_args()
+    authkey = _authkey(args.authkey)
+
+    if args.command == 'serve':
+        key_path = None
+        if authkey is None:
+            if not _is_loopback(args.host):
+                parser.error(f"serving on {args.host} needs a shared key: set {KEY_ENV} or pass --authkey")
+            authkey = secrets.token_hex(32).encode('utf-8')
+            key_path = _write_key(args.port, authkey)
+        keywords = None
+        if args.keywords:
+            with open(args.keywords, 'r') as f:
+                keywords = json.load(f)
+        units = split_units(args.ministries, args.months)
+        catalogue = Catalogue(_files_path("catalogue", "catalogue.sqlite"))
+        coordinator = Coordinator(units, keywords, catalogue, args.lease,
+                                  scheduler=MinistryScheduler(_files_path("stats", "ministry_stats.json")),
+                                  timeouts=AdaptiveTimeouts(_files_path("stats", "timeouts.json")))
+        try:
+            workers, worker_ids = _start_workers((args.host, args.port), authkey, args.workers) if args.workers else ([], [])
+            coordinator.serve((args.host, args.port), authkey)
+            for worker in workers:
+                worker.join()
+            _merge_worker_state(worker_ids)
+        finally:
+            if key_path:
+                os.remove(key_path)
+        try:
+            DiskBudget(_files_path(), catalogue, int(args.disk_budget_gb * 1024 ** 3)).enforce()
+        except OSError as e:
+            print(f"Could not archive old downloads: {e}")
+        catalogue.close()
+    else:
+        address = _parse_address(args.address)
+        if authkey is None and _is_loopback(address[0]):
+            authkey = _read_key(address[1])
+        if authkey is None:
+            parser.error(f"no key for {args.address}: set {KEY_ENV} or pass --authkey")
+        workers, worker_ids = _start_workers(address, authkey, args.processes)
+        for worker in workers:
+            worker.join()
+        _merge_worker_state(worker_ids)
+
+
+if __name__ == "__main__":
+    mp.freeze_support()
+    main()
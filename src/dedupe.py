@@ -0,0 +1,110 @@
+"""
+Near-duplicate Module - MinHash signatures and LSH banding to cluster near-identical gazettes
+
+Amendments, corrigenda and the Hindi/English editions of one notification arrive under
+separate UGIDs with almost the same subject. Each text is reduced to character shingles
+of its canonical words (see fuzzy.py), summarised by a MinHash signature and bucketed by
+LSH bands, so a new row is only compared with the few rows sharing a band. Rows whose
+estimated Jaccard similarity reaches the threshold join the same cluster.
+"""
+
+import zlib
+
+import numpy as np
+
+import fuzzy
+
+PRIME = (1 << 31) - 1
+NUM_PERM = 128
+BANDS = 32  # 4 rows per band: a pair at 0.7 similarity shares a band with probability > 0.999
+SHINGLE = 5
+SEED = 1989
+
+
+def _numbers(words):
+    return {word for word in words if any(ch.isdigit() for ch in word)}
+
+
+class DuplicateIndex:
+    """Incremental MinHash/LSH clustering of texts by item id.
+
+    Texts quoting different notification numbers never cluster, even when their wording
+    is otherwise identical (two draft rules from the same template); a corrigendum that
+    repeats the original's numbers and adds its own still can.
+    """
+
+    def __init__(self, threshold=0.7, num_perm=NUM_PERM, bands=BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(SEED)
+        self.a = rng.integers(1, PRIME, num_perm, dtype=np.int64)[:, None]
+        self.b = rng.integers(0, PRIME, num_perm, dtype=np.int64)[:, None]
+        self.reset()
+
+    def reset(self):
+        self.signatures = {}
+        self.numbers = {}
+        self.buckets = [{} for _ in range(self.bands)]
+        self.parent = {}
+        self.canonical = {}  # cluster root -> member chosen to be kept
+
+    def signature(self, text):
+        words = [fuzzy.canonical(word) for word in fuzzy.tokenize(text)]
+        joined = ' '.join(word for word in words if word)
+        shingles = {joined[i:i + SHINGLE] for i in range(max(len(joined) - SHINGLE + 1, 1))}
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) & 0x7fffffff for s in shingles), dtype=np.int64)
+        # a * h stays below 2**62, so the universal hash needs no overflow handling
+        return ((self.a * hashes + self.b) % PRIME).min(axis=1), _numbers(words)
+
+    def similarity(self, first, second):
+        """Estimated Jaccard similarity of two indexed items"""
+        return float(np.mean(self.signatures[first] == self.signatures[second]))
+
+    def _find(self, item):
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def _union(self, first, second):
+        first, second = self._find(first), self._find(second)
+        if first != second:
+            self.parent[second] = first
+            # A cluster keeps the canonical member chosen first
+            if first not in self.canonical and second in self.canonical:
+                self.canonical[first] = self.canonical[second]
+            self.canonical.pop(second, None)
+
+    def add(self, item, text):
+        """Index item and return the ids of the already indexed items it duplicates"""
+        signature, numbers = self.signature(text)
+        self.signatures[item] = signature
+        self.numbers[item] = numbers
+        self.parent[item] = item
+        candidates = set()
+        for band, buckets in enumerate(self.buckets):
+            key = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            members = buckets.setdefault(key, [])
+            candidates.update(members)
+            members.append(item)
+        matches = []
+        for other in candidates:
+            other_numbers = self.numbers[other]
+            if not (numbers <= other_numbers or other_numbers <= numbers):
+                continue
+            if self.similarity(item, other) >= self.threshold:
+                matches.append(other)
+                self._union(other, item)
+        return matches
+
+    def cluster(self, item):
+        return self._find(item)
+
+    def claim(self, item):
+        """Make item its cluster's canonical member unless one was chosen; return the canonical"""
+        return self.canonical.setdefault(self._find(item), item)
@@ -0,0 +1,235 @@
+"""
+Extraction Engine Module - runs the Playwright extraction worker in a child process
+"""
+
+import multiprocessing as mp
+import queue
+import sys
+from contextlib import nullcontext
+from threading import Event
+
+MAX_RESTARTS = 3
+
+
+class QueueSignal:
+    """Stand-in for a Qt signal that forwards emits to the GUI over a queue"""
+
+    def __init__(self, msg_queue, kind):
+        self.msg_queue = msg_queue
+        self.kind = kind
+
+    def emit(self, *args):
+        self.msg_queue.put((self.kind, *args))
+
+
+class QueueLogEmitter:
+    """Engine-side counterpart of gui.LogSignalEmitter"""
+
+    def __init__(self, msg_queue):
+        self.log_message = QueueSignal(msg_queue, 'log')
+        self.progress_update = QueueSignal(msg_queue, 'progress')
+        self.stats_update = QueueSignal(msg_queue, 'stats')
+
+
+class QueueStream:
+    """stdout replacement that sends printed lines to the GUI log"""
+
+    def __init__(self, msg_queue):
+        self.msg_queue = msg_queue
+
+    def write(self, text):
+        if text.strip():
+            self.msg_queue.put(('log', text.strip()))
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+async def _next_command(cmd_queue):
+    """Wait up to a second for a GUI command without blocking the event loop"""
+    import asyncio
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(None, cmd_queue.get, True, 1)
+    except queue.Empty:
+        return None
+
+
+def _no_stage(name):
+    return nullcontext()
+
+
+async def extraction_worker(egz, cmd_queue, msg_queue):
+    """Initialise the browser, then serve extraction requests until shutdown"""
+    import profiling
+    try:
+        print("Starting data initialization (engine)...")
+        res = await egz.egz_extract_defaults()
+        if res < 0:
+            print("Data initialization failed!")
+        else:
+            print("Data initialization successful!")
+        msg_queue.put(('ready', dict(egz.valdict), [list(i) for i in egz.kwlist], list(egz.mlist_input)))
+
+        while True:
+            command = await _next_command(cmd_queue)
+            if command is None:
+                continue
+            if command[0] == 'shutdown':
+                break
+
+            _, run_id, domain_names, keyword_data, months, profile = command
+            print("Processing extraction request...")
+            downloaded = 0
+            profiler = None
+            if profile or profiling.enabled_by_env():
+                profiler = profiling.RunProfiler.for_run(run_id, egz.get_files_path)
+                profiler.start()
+            stage = profiler.stage if profiler else _no_stage
+            try:
+                for month in months or [None]:
+                    egz.set_month(month)
+                    if month:
+                        print(f"Extracting month {month}...")
+                    with stage(f"extract {month or 'default'}"):
+                        result = await egz.run_until_cancelled(egz.extract_mids(domain_names, keyword_data))
+                    if result is not None and result < 0:
+                        break
+                    if not egz.eve_sig.is_set():
+                        print("Extraction was cancelled, stopping...")
+                        break
+                    print("Extraction completed successfully!\nNow downloading files...")
+                    msg_queue.put(('downloading',))
+                    with stage(f"download {month or 'default'}"):
+                        egz.egz_download()
+                    downloaded += egz.dwnld_count
+            except Exception as e:
+                print(f"Error during extraction: {e}")
+            finally:
+                egz.set_month(None)
+                if profiler is not None:
+                    try:
+                        print(profiler.stop())
+                    except Exception as e:
+                        print(f"Could not write profile: {e}")
+                msg_queue.put(('done', run_id, downloaded))
+    finally:
+        await egz.cleanup_browser()
+
+
+def run_engine(eve_sig, timeout_event, empty_domains, cmd_queue, msg_queue):
+    """Entry point of the engine process"""
+    # asyncio and extraction are only needed here, keeping them off the GUI's import path
+    import asyncio
+    sys.stdout = QueueStream(msg_queue)
+    import extraction as egz
+    egz.eve_sig = eve_sig
+    egz.timeout_event = timeout_event
+    egz.empty_domains = empty_domains
+    egz.dwnld_count = 0
+    egz.set_log_emitter(QueueLogEmitter(msg_queue))
+    try:
+        asyncio.run(extraction_worker(egz, cmd_queue, msg_queue))
+    except KeyboardInterrupt:
+        print("Extraction engine interrupted")
+
+
+class EngineProcess:
+    """Owns the engine child process and mirrors the extraction state the GUI reads"""
+
+    def __init__(self):
+        self.ctx = mp.get_context('spawn')
+        # Shared with the child: the GUI sets/clears eve_sig, the engine raises the others
+        self.eve_sig = self.ctx.Event()
+        self.timeout_event = self.ctx.Event()
+        self.empty_domains = self.ctx.Event()
+        # Local: only set once the matching message has been received
+        self.browser_ready = Event()
+        self.valdict = {}
+        self.kwlist = []
+        self.mlist_input = []
+        self.dwnld_count = 0
+        self.run_id = 0
+        self.restarts = 0
+        self.stopping = False
+        self.process = None
+
+    def start(self):
+        """Launch a fresh engine process"""
+        self.cmd_queue = self.ctx.Queue()
+        self.msg_queue = self.ctx.Queue()
+        self.browser_ready.clear()
+        self.process = self.ctx.Process(
+            target=run_engine,
+            args=(self.eve_sig, self.timeout_event, self.empty_domains, self.cmd_queue, self.msg_queue),
+            name="extraction-engine",
+            daemon=True,
+        )
+        self.process.start()
+
+    def request_extraction(self, domains, keywords, months=None, profile=False):
+        """Ask the engine to extract and download for the given domains and keywords.
+
+        months lists months (1-12) of the current year to process in turn; by default the
+        engine's usual listing is used. profile writes a profile of the run to
+        files/profiles/ (see profiling.py), as does setting EPUB_PROFILE for every run.
+        """
+        self.run_id += 1
+        self.eve_sig.set()
+        self.cmd_queue.put(('start', self.run_id, domains, keywords, list(months or []), bool(profile)))
+        return self.run_id
+
+    def cancel(self):
+        """Signal the running extraction to stop"""
+        self.eve_sig.clear()
+
+    def poll(self, limit=200):
+        """Drain pending engine messages and return them for display"""
+        messages = []
+        if self.process is None:
+            return messages
+        for _ in range(limit):
+            try:
+                message = self.msg_queue.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == 'ready':
+                _, self.valdict, self.kwlist, self.mlist_input = message
+                self.browser_ready.set()
+            elif message[0] == 'done':
+                _, run_id, self.dwnld_count = message
+                # A late 'done' from a cancelled run must not end the current one
+                if run_id == self.run_id:
+                    self.eve_sig.clear()
+            messages.append(message)
+
+        if not messages and not self.stopping and not self.process.is_alive():
+            messages.append(self._recover())
+        return messages
+
+    def _recover(self):
+        """Handle an engine that died on its own, restarting it a bounded number of times"""
+        exitcode = self.process.exitcode
+        if self.eve_sig.is_set():
+            self.eve_sig.clear()
+            self.timeout_event.set()
+        if self.restarts >= MAX_RESTARTS:
+            self.stopping = True
+            self.browser_ready.set()
+            return ('crashed', exitcode, False)
+        self.restarts += 1
+        self.start()
+        return ('crashed', exitcode, True)
+
+    def shutdown(self, timeout=5):
+        """Stop the engine, closing the browser cleanly when possible"""
+        self.stopping = True
+        self.eve_sig.clear()
+        if self.process is None or not self.process.is_alive():
+            return
+        self.cmd_queue.put(('shutdown',))
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(1)
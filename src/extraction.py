@@ -2,13 +2,29 @@ from requests import get
 from requests.exceptions import Timeout, RequestException
 from playwright.async_api import async_playwright
 from playwright._impl._errors import TimeoutError
-from bs4 import BeautifulSoup as bs
-from os import chdir, makedirs
-from os.path import dirname, join, abspath, exists
-from re import search, escape, IGNORECASE, sub, compile, MULTILINE
+from os import chdir, fdopen, makedirs, remove, replace
+from os.path import basename, dirname, join, abspath, exists
+from shutil import copyfile
+from tempfile import mkstemp
+import sqlite3
+from re import sub, MULTILINE
 import sys
-from urllib.parse import quote
-from threading import Event
+import json
+from urllib.parse import quote, urljoin
+from threading import Event, Thread
+import asyncio
+from browser_pool import BrowserPool
+from scheduler import MinistryScheduler
+from timeouts import AdaptiveTimeouts
+from progress import ProgressAggregator, format_progress
+from query import compile_keywords
+from scoring import RelevanceScorer
+from classification_cache import ClassificationCache
+from dedupe import DuplicateIndex
+from catalogue import Catalogue
+from archive import DiskBudget
+from page_scripts import GAZETTE_ROWS_JS, AIS_TABLE_SELECTOR, AIS_ROWS_JS
+from time import perf_counter
 
 def get_base_path():
     """Get the base path for files, accounting for PyInstaller bundle"""
@@ -22,6 +38,12 @@ def get_files_path(*path_parts):
     base = get_base_path()
     return join(base, "files", *path_parts)
 
+state_root = None  # set by use_worker_state; None keeps stats, caches and catalogue in files/
+
+def get_state_path(*path_parts):
+    """Path of a stats, cache or catalogue file of this process"""
+    return join(state_root, *path_parts) if state_root else get_files_path(*path_parts)
+
 _log_signal_emitter = None
 ht_parser = 'html.parser'
 
@@ -39,29 +61,102 @@ def log_print(*args, **kwargs):
         _log_signal_emitter.log_message.emit(message)
 
 def emit_progress_update(ministry_name, status, count="-"):
+    """Queue a progress update; the aggregator forwards the latest one per ministry to the GUI"""
+    progress_tracker.status(ministry_name, status, count)
+
+def _publish_status(ministry_name, status, count):
     """Emit progress update signal for GUI color changes"""
     if _log_signal_emitter:
         _log_signal_emitter.progress_update.emit(ministry_name,  status, count)
 
+_last_progress_log = 0.0
+
+def _publish_stats(snapshot):
+    """Send the run snapshot to the GUI and a summary line to the log every few seconds"""
+    global _last_progress_log
+    if _log_signal_emitter and hasattr(_log_signal_emitter, 'stats_update'):
+        _log_signal_emitter.stats_update.emit(snapshot)
+    if perf_counter() - _last_progress_log >= PROGRESS_LOG_INTERVAL:
+        _last_progress_log = perf_counter()
+        print(f"Progress: {format_progress(snapshot)}")
+
+def _save_progress_metrics():
+    """Publish the final snapshot and keep it as the last run's metrics"""
+    progress_tracker.flush()
+    snapshot = progress_tracker.snapshot()
+    print(f"Run summary: {format_progress(snapshot)}")
+    metrics_path = get_state_path("stats", "progress.json")
+    makedirs(dirname(metrics_path), exist_ok=True)
+    with open(metrics_path, 'w') as f:
+        json.dump(snapshot, f, indent=2)
+
+progress_tracker = ProgressAggregator(_publish_status, _publish_stats)
+
 base_path = get_base_path()
 if getattr(sys, 'frozen', False):
     print(f"Running as PyInstaller bundle, base path: {base_path}")
 else:
     chdir(dirname(abspath(__file__)))
 
+dialog_handled = False
+CANCEL_POLL = 0.1  # seconds between cancellation checks
+DOWNLOAD_CHUNK = 256 * 1024
+PROGRESS_LOG_INTERVAL = 5  # seconds between progress lines in the log
+scheduler = MinistryScheduler(get_files_path("stats", "ministry_stats.json"))
+timeouts = AdaptiveTimeouts(get_files_path("stats", "timeouts.json"), timeout_errors=(TimeoutError, Timeout))
+classification_cache = ClassificationCache(get_files_path("cache", "classification.sqlite"))
+catalogue = Catalogue(get_files_path("catalogue", "catalogue.sqlite"))
+# Live downloads above this size get their least recently used months archived (0 = no limit)
+disk_budget_gb = 20
+
+def _copy_database(source, target):
+    """Consistent copy of a sqlite file that other processes may be writing"""
+    makedirs(dirname(target), exist_ok=True)
+    if not exists(source):
+        return
+    src, dst = sqlite3.connect(source, timeout=10), sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        src.close()
+        dst.close()
+
+def use_worker_state(name):
+    """Keep this process's stats, caches and catalogue in files/workers/<name>/.
+
+    Coordinator workers share the download tree, but each one writes its own copy of the
+    state files (seeded from the shared ones) and sends its results to the coordinator,
+    which is the only writer of the shared files. The disk budget is left to the coordinator.
+    """
+    global state_root, scheduler, timeouts, classification_cache, catalogue, disk_budget_gb
+    state_root = get_files_path("workers", name)
+    for parts in (("stats", "ministry_stats.json"), ("stats", "timeouts.json"), ("cache", "arai_api.json")):
+        makedirs(dirname(get_state_path(*parts)), exist_ok=True)
+        if exists(get_files_path(*parts)):
+            copyfile(get_files_path(*parts), get_state_path(*parts))
+    for parts in (("cache", "classification.sqlite"), ("catalogue", "catalogue.sqlite")):
+        _copy_database(get_files_path(*parts), get_state_path(*parts))
+    classification_cache.close()
+    catalogue.close()
+    scheduler = MinistryScheduler(get_state_path("stats", "ministry_stats.json"))
+    timeouts = AdaptiveTimeouts(get_state_path("stats", "timeouts.json"), timeout_errors=(TimeoutError, Timeout))
+    classification_cache = ClassificationCache(get_state_path("cache", "classification.sqlite"))
+    catalogue = Catalogue(get_state_path("catalogue", "catalogue.sqlite"))
+    disk_budget_gb = 0
 eve_sig = Event()
 browser_ready = Event()  # Signal when browser is initialized
 empty_domains = Event()
 timeout_event = Event()  # Signal when timeout occurs
 import datetime
 today = datetime.datetime.now()
+target_month = None  # month of the current year being extracted; None keeps the default listing
 valdict = {9999: "ARAI - AIS - draft", 9998: "ARAI - AIS - published"}
 inv_valdict = {"ARAI - AIS - draft": 9999, "ARAI - AIS - published": 9998}
 base_url = None
 mlist_input = [9999, 9998, 133, 9, 397, 70, 55, 34, 37, 378, 12, 6, 508, 28, 83]
 kwlist = [
-  ['CMVR 1989', True],
-  ['Motor Vehicle Act 1988', True],
+  ['CMVR 1989', True, 3],
+  ['Motor Vehicle Act 1988', True, 3],
   ['Draft Rules', False],
   ['Amended', False],
   ['Final Draft', False],
@@ -77,7 +172,7 @@ kwlist = [
   ['Steel', False],
   ['Brake system', False],
   ['Emission', False],
-  ['AdBlue', True],
+  ['AdBlue', True, 2],
   ['Urea', False],
   ['Smoke', False],
   ['Pollution', False],
@@ -85,36 +180,116 @@ kwlist = [
   ['Electric', False],
   ['EV', True],
   ['PM', True],
-  ['Type Approval', False],
-  ['Registration', False],
-  ['Safety', False],
-  ['Compliance', False],
-  ['Fire', False],
+  ['Type Approval', False, 2],
+  ['Registration', False, 0.5],
+  ['Safety', False, 0.5],
+  ['Compliance', False, 0.5],
+  ['Fire', False, 0.5],
   ['Air Conditioning', False],
-  ['Light', False],
+  ['Light', False, 0.5],
   ['Diesel', False],
   ['Fuel', False],
-  ['Coal', False],
-  ['Mines', False],
+  ['Coal', False, 0.5],
+  ['Mines', False, 0.5],
   ['Hydrogen', False],
   ['Alternate Fuel', False],
-  ['Test', False]
+  ['Test', False, 0.5]
 ]
+# Optional third kwlist element is the keyword weight (default 1)
+# Per ministry batch: minimum relevance score and cap on the number of files kept (None = no cap)
+score_threshold = 0.0
+score_top_k = None
+# Near-duplicate gazettes (amendments, corrigenda, other-language editions) of one run:
+# 'canonical' downloads only the best ranked member of each cluster, 'all' downloads every
+# member; both record the duplicates next to the canonical entry in keywords.json, and a
+# duplicate of another ministry's gazette under its own ministry with a 'duplicate_of' reference
+dedupe_policy = 'canonical'
+duplicate_index = DuplicateIndex(threshold=0.7)
+canonical_ministry = {}  # ugid -> ministry name of every gazette kept as canonical this run
 
 def pattern_matcher(bstring, patterns=kwlist):
-    count = 0
-    for pattern in patterns:
-        if pattern[1]:
-            match = search(escape(pattern[0]), bstring)
-            if match:
-                count += 1
-                print(f"Matched keyword: {pattern[0]} in {match.group(0)}")
-        else:
-            match = search(escape(pattern[0]), bstring, IGNORECASE)
-            if match:
-                count += 1
-                print(f"Matched keyword: {pattern[0]} in {match.group(0)}")
-    return count
+    """Number of kwlist queries (see query.py) that match bstring"""
+    matched = compile_keywords(patterns).matching(bstring)
+    for query in matched:
+        print(f"Matched keyword: {query}")
+    return len(matched)
+
+def _http_get(url, **kwargs):
+    """requests.get with the learned HTTP timeout; latency is time to response headers"""
+    limit = timeouts.get('http')
+    try:
+        response = get(url, timeout=limit / 1000, **kwargs)
+    except Timeout:
+        timeouts.timed_out('http', limit)
+        raise
+    timeouts.observe('http', response.elapsed.total_seconds() * 1000)
+    return response
+
+def _download(url, file_path, ministry_name):
+    """Stream url into file_path, returning False if cancelled mid-transfer.
+
+    The transfer runs on a helper thread so a cancel is noticed within CANCEL_POLL
+    seconds even while a connect or read is blocked; the abandoned transfer closes its
+    response and removes its partial file on its own. It watches its own cancel token
+    rather than eve_sig, which a new run may have set again by then, and writes to a
+    temp file of its own, so it never touches a later download of the same file.
+    """
+    cancelled = Event()
+    outcome = {}
+
+    def transfer():
+        response = None
+        part_path = None
+        try:
+            response = _http_get(url, stream=True)
+            response.raise_for_status()
+            makedirs(dirname(file_path), exist_ok=True)
+            fd, part_path = mkstemp(dir=dirname(file_path), prefix=basename(file_path) + ".", suffix=".part")
+            # read1 returns whatever has arrived instead of waiting for a full chunk,
+            # so a cancel is seen between packets (urllib3 1.x only has read)
+            read = getattr(response.raw, 'read1', response.raw.read)
+            with fdopen(fd, "wb") as f:
+                while not cancelled.is_set():
+                    chunk = read(DOWNLOAD_CHUNK, decode_content=True)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    progress_tracker.add_bytes(ministry_name, len(chunk))
+            if cancelled.is_set():
+                return
+            replace(part_path, file_path)
+            outcome['done'] = True
+        except Exception as e:
+            outcome['error'] = e
+        finally:
+            if response is not None:
+                response.close()
+            if 'done' not in outcome and part_path and exists(part_path):
+                remove(part_path)
+
+    worker = Thread(target=transfer, daemon=True)
+    worker.start()
+    while worker.is_alive():
+        worker.join(CANCEL_POLL)
+        if not eve_sig.is_set():
+            cancelled.set()
+            print(f"Download of {url} cancelled")
+            return False
+    if 'error' in outcome:
+        raise outcome['error']
+    return 'done' in outcome
+
+async def run_until_cancelled(coro):
+    """Run coro, cancelling it as soon as eve_sig is cleared; returns None when cancelled"""
+    task = asyncio.ensure_future(coro)
+    while not task.done():
+        await asyncio.wait({task}, timeout=CANCEL_POLL)
+        if not task.done() and not eve_sig.is_set():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            print("Extraction cancelled")
+            return None
+    return task.result()
 
 def clean_text(text):
     text = sub(r'[^\x00-\x7F]', '', text)
@@ -126,34 +301,43 @@ def clean_text(text):
 async def browser_init():
     try:
         print("Starting browser initialization (egz)...")
-        global p, browser, page, context
+        global p, browser, pool
         p = await async_playwright().start()
         browser = await p.chromium.launch(channel="msedge", headless=True, args = ["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu", "--disable-extensions", "--disable-plugins", "--disable-images"]) 
-        context = await browser.new_context(accept_downloads=True)
-        page = await context.new_page()
+        pool = BrowserPool(browser, setup=_open_search_menu)
     except Exception as e:
         print(f"Error during browser initialization: {e}")
         timeout_event.set()
         await cleanup_browser()
         return -1
+    return 0
+
+async def _open_search_menu(work_page):
+    """Bring a fresh page to the ministry-wise search form"""
+    with timeouts.track('egz_goto') as limit:
+        await work_page.goto("https://egazette.gov.in/", timeout=limit)
+    print("Successfully navigated to eGazette website.")
+    global base_url
+    base_url = work_page.url.split(sep="default.aspx")[0]
+    print(f"Current URL: {base_url}\nLoading search menu...")
+    res = await work_page.context.request.get("{url}SearchMenu.aspx".format(url=base_url), headers={
+        'Referer': '{base}/'.format(base=base_url)
+    })
+    await work_page.set_content(await res.text())
+    await work_page.click('input[name="btnMinistry"]')
+    with timeouts.track('search_menu') as limit:
+        await work_page.wait_for_selector('select[name="ddlMinistry"]', timeout=limit)
+    work_page.on('dialog', handle_dialog)
 
 async def egz_extract_defaults():
     print("Starting data initialization (egz)...")
     try:
-        await browser_init()
-        global page
-        await page.goto("https://egazette.gov.in/", timeout=45000)
-        print("Successfully navigated to eGazette website.")
-        global base_url
-        base_url = page.url.split(sep="default.aspx")[0]
-        print(f"Current URL: {base_url}\nLoading search menu...")
-        res = await context.request.get("{url}SearchMenu.aspx".format(url=base_url), headers={
-            'Referer': '{base}/'.format(base=base_url)
-        })
-        await page.set_content(await res.text())
-        await page.click('input[name="btnMinistry"]')
-        await page.wait_for_selector('select[name="ddlMinistry"]', timeout=20000)
-        chpage = bs(await page.content(), ht_parser).find('select', {'name': 'ddlMinistry'})
+        if await browser_init() < 0:
+            return -1
+        from bs4 import BeautifulSoup as bs
+        slot = await pool.acquire()
+        chpage = bs(await slot.page.content(), ht_parser).find('select', {'name': 'ddlMinistry'})
+        await pool.release(slot)
         if not chpage:
             print("Could not find ministry dropdown in page content")
             await cleanup_browser()
@@ -172,6 +356,7 @@ async def egz_extract_defaults():
             print("No valid ministries found")
             await cleanup_browser()
             return -1
+        await pool.start()
         
     except TimeoutError:
         print("Timeout occurred while extracting defaults.")
@@ -192,6 +377,12 @@ async def egz_extract_defaults():
     return 0
 
 async def cleanup_browser():
+    try:
+        if 'pool' in globals() and pool:
+            await pool.close()
+    except Exception as e:
+        print(f"Error closing browser pool: {e}")
+    
     try:
         if 'browser' in globals() and browser:
             await browser.close()
@@ -215,38 +406,47 @@ async def handle_dialog(dialog):
     
 async def egz_extract_pdfs(mlist, kwlist):
     """Main extraction function with reduced complexity"""
-    global dwnld_count, page
+    global dwnld_count
     dwnld_count = 0
-    page.on('dialog', handle_dialog)     
     print(f"Extracting gazettes for month: {today.month}, year: {today.year}, ministries: {mlist}")
     global mcode
     for mcode in mlist:
         if not eve_sig.is_set():
             break
-            
-        if mcode == 9999:
-            await ais_extract_pdfs()
-            continue    
-        if mcode == 9998:
-            await ais_extract_pdfs('published')
-            continue
         
-        await _process_ministry(mcode, kwlist)
+        started = perf_counter()
+        if mcode == 9999:
+            found = await ais_extract_pdfs()
+        elif mcode == 9998:
+            found = await ais_extract_pdfs('published')
+        else:
+            found = await pool.run(lambda work_page: _process_ministry(mcode, kwlist, work_page), valdict.get(mcode, mcode))
+        if not eve_sig.is_set():
+            # A cancelled ministry says nothing about its yield
+            break
+        # Empty results, timeouts and errors count as no yield, so they are not retried first
+        scheduler.record(mcode, *(found or (0, 0)), perf_counter() - started)
+    scheduler.save()
 
-async def _process_ministry(mcode, kwlist):
+async def _process_ministry(mcode, kwlist, work_page):
     """Process a single ministry - reduces nesting"""
+    global page
+    page = work_page
     ministry_name = valdict.get(mcode, f"Ministry {mcode}")
     emit_progress_update(ministry_name, 'extracting')
         
     try:
-        await page.select_option('select[name="ddlMinistry"]', str(mcode), timeout=15000)
-        await page.select_option('select[name="ddlmonth"]', 'June', timeout=15000)
-        await page.click('input[name="ImgSubmitDetails"]', timeout=15000)
+        with timeouts.track('select') as limit:
+            await page.select_option('select[name="ddlMinistry"]', str(mcode), timeout=limit)
+        with timeouts.track('select') as limit:
+            await page.select_option('select[name="ddlmonth"]', today.strftime('%B') if target_month else 'June', timeout=limit)
+        with timeouts.track('submit') as limit:
+            await page.click('input[name="ImgSubmitDetails"]', timeout=limit)
         gazette_data = await _extract_gazette_data(ministry_name)
         if gazette_data:
-            print(gazette_data)
-            await _process_gazette_pages(gazette_data, ministry_name)
-            _save_filtered_results(mcode, gazette_data['gid_dict'], kwlist, ministry_name)
+            print(f"{ministry_name}: {gazette_data['gcount']} gazettes to scan")
+            rows = _iter_gazette_rows(gazette_data, ministry_name)
+            return await _save_filtered_results(mcode, rows, kwlist, ministry_name)
     except Exception as e:
         print(f"Error processing ministry {ministry_name}: {e}")
         emit_progress_update(ministry_name, 'error')
@@ -254,10 +454,12 @@ async def _process_ministry(mcode, kwlist):
 async def _extract_gazette_data(ministry_name):
     """Extract initial gazette data and count"""
     try:
-        await page.wait_for_selector('table#gvGazetteList', timeout=15000)
+        with timeouts.track('results') as limit:
+            await page.wait_for_selector('table#gvGazetteList', timeout=limit)
         
         # Get total count
-        await page.wait_for_selector('span#lbl_Result', timeout=10000)
+        with timeouts.track('result_count') as limit:
+            await page.wait_for_selector('span#lbl_Result', timeout=limit)
         lab = page.locator('span#lbl_Result')
         tbres = await lab.text_content()
         gcount = int(tbres.split(sep=":")[1])
@@ -265,18 +467,15 @@ async def _extract_gazette_data(ministry_name):
         print(f"Found! {tbres}")
         
         # Get initial table
-        html = await page.content()
-        sd = bs(html, ht_parser)
-        found = sd.find('table', {'id': 'gvGazetteList'})
+        found = await _read_gazette_rows()
         
-        if not found:
+        if found is None:
             print("No gazettes found for the given criteria.")
             return None
             
         return {
             'gcount': gcount,
-            'rows': found.find_all('tr'),
-            'gid_dict': {},
+            'rows': found,
             'index': 0,
             'page_num': 1
         }
@@ -296,10 +495,13 @@ def _handle_dialog_or_timeout(ministry_name):
     timeout_event.set()
     return None
 
-async def _process_gazette_pages(gazette_data, ministry_name):
-    """Process all pages of gazette results"""
+async def _iter_gazette_rows(gazette_data, ministry_name):
+    """Yield (ugid, subject) for every result row, holding only the current page"""
     while gazette_data['index'] < gazette_data['gcount']:
-        _extract_rows_data(gazette_data)
+        if not gazette_data['rows']:
+            break
+        for entry in _extract_rows_data(gazette_data):
+            yield entry
         
         if gazette_data['index'] >= gazette_data['gcount']:
             break
@@ -308,34 +510,22 @@ async def _process_gazette_pages(gazette_data, ministry_name):
         if not await _navigate_next_page(gazette_data, ministry_name):
             break
 
+async def _read_gazette_rows():
+    """Return the current results page as (ugid, subject) tuples, None if the grid is missing"""
+    rows = await page.evaluate(GAZETTE_ROWS_JS)
+    if rows is None:
+        return None
+    return [(entry_text, subj_text) for entry_text, subj_text in rows]
+
 def _extract_rows_data(gazette_data):
-    """Extract data from current page rows"""
-    rows = gazette_data['rows']
-    
-    for i in range(1, len(rows)):
-        row = rows[i]
-        
-        """Extract entry data from a single row"""
-        subj = row.find('span', {'id': compile(r'gvGazetteList_lbl_Subject_[\d]+')})
-        entry = row.find('span', {'id': compile(r'gvGazetteList_lbl_UGID_[\d]+')})
-        
-        if not entry or not subj:
-            return None
-            
-        entry_text = entry.get_text()
-        subj_text = subj.get_text()
-        
+    """Yield entries of the current page rows while advancing the row and page counters"""
+    for entry_text, subj_text in gazette_data['rows']:
         print(f"{gazette_data['index']} {entry_text} {subj_text}")
-        entry_data = [entry_text, subj_text]
         
-        if not entry_data:
-            break
-            
         gazette_data['index'] += 1
-        gazette_data['gid_dict'][gazette_data['index']] = entry_data
-        
         if gazette_data['index'] % 15 == 0:
             gazette_data['page_num'] += 1
+        yield entry_text, subj_text
 
 async def _navigate_next_page(gazette_data, ministry_name):
     """Navigate to next page of results"""
@@ -347,19 +537,19 @@ async def _navigate_next_page(gazette_data, ministry_name):
         
     try:
         print(f"Clicking page button: {page_num}")
-        await page_button.click(timeout=15000)
-        await page.wait_for_selector('table#gvGazetteList', timeout=10000)
+        with timeouts.track('page_click') as limit:
+            await page_button.click(timeout=limit)
+        with timeouts.track('page_load') as limit:
+            await page.wait_for_selector('table#gvGazetteList', timeout=limit)
         
         # Update rows for next iteration
-        html = await page.content()
-        sd = bs(html, ht_parser)
-        found = sd.find('table', {'id': 'gvGazetteList'})
+        found = await _read_gazette_rows()
         
-        if not found:
+        if found is None:
             print("No gazettes found for the given criteria.")
             return False
             
-        gazette_data['rows'] = found.find_all('tr')
+        gazette_data['rows'] = found
         return True
         
     except TimeoutError:
@@ -368,26 +558,96 @@ async def _navigate_next_page(gazette_data, ministry_name):
         timeout_event.set()
         return False
 
-def _save_filtered_results(mcode, gid_dict, kwlist, ministry_name):
-    """Save filtered results to file"""
+async def _save_filtered_results(mcode, rows, kwlist, ministry_name):
+    """Score streamed (ugid, subject) rows and write the relevant ones, best first"""
     list_path = get_files_path(valdict[mcode], str(today.year), str(today.month), 'gids_list.txt')
     makedirs(dirname(list_path), exist_ok=True)
     
-    relevant_count = 0
+    scorer = RelevanceScorer(kwlist, score_threshold, score_top_k, classification_cache)
+    row_count = 0
+    hits = {}
+    async for ugid, subject in rows:
+        row_count += 1
+        progress_tracker.add_rows(ministry_name)
+        matched = scorer.add(ugid, subject)
+        if matched:
+            print(f"Matched keywords: {', '.join(matched)}")
+            hits[ugid] = (subject, scorer.matcher.search_terms(matched))
+            duplicate_index.add(ugid, subject)
+            scheduler.note_hit()
+        else:
+            print(f"Gazette ID {ugid} - {subject} keyword mismatch.")
+    
+    classification_cache.commit()
+    # IDF needs the whole batch, so the ranking is written once the rows are exhausted
+    ranked, duplicates, elsewhere = _pick_canonical(scorer.ranked(), ministry_name)
     with open(list_path, 'w') as f:
-        for value in gid_dict.values():
-            if pattern_matcher(value[1], kwlist) > 0:
-                f.write(f"1#{value[0]}\n")
-                relevant_count += 1
-            else:
-                print(f"Gazette ID {value[0]} - {value[1]} keyword mismatch.")
+        f.writelines(f"{score:.3f}#{ugid}\n" for score, ugid in ranked)
+    _save_gazette_details(dirname(list_path), ranked, hits, duplicates, elsewhere)
+    relevant_count = len(ranked)
     if relevant_count > 0:
-        print(f"Ministry {ministry_name}: {relevant_count} new relevant files found")
+        print(f"Ministry {ministry_name}: {relevant_count} new relevant files found (top score {ranked[0][0]:.2f})")
         emit_progress_update(ministry_name, 'completed', f'0/{relevant_count}')
     else:
         emit_progress_update(ministry_name, 'completed', '0')
         print(f"Ministry {ministry_name}: No new relevant files found")
+    return row_count, relevant_count
     
+def _pick_canonical(ranked, ministry_name):
+    """Apply dedupe_policy to ranked rows.
+
+    Also returns {canonical ugid: duplicate ugids} for clusters kept in this ministry and
+    {duplicate ugid: (score, ministry, canonical ugid)} for duplicates of another ministry's gazette.
+    """
+    kept = []
+    duplicates = {}
+    elsewhere = {}
+    for score, ugid in ranked:
+        # Best first, so the first member of a cluster to claim it is its best ranked one
+        canonical = duplicate_index.claim(ugid)
+        if canonical == ugid:
+            canonical_ministry[ugid] = ministry_name
+            kept.append((score, ugid))
+        elif canonical_ministry.get(canonical, ministry_name) != ministry_name:
+            elsewhere[ugid] = (score, canonical_ministry[canonical], canonical)
+            print(f"Gazette ID {ugid} is a near-duplicate of {canonical} ({canonical_ministry[canonical]})")
+        else:
+            duplicates.setdefault(canonical, []).append(ugid)
+            print(f"Gazette ID {ugid} is a near-duplicate of {canonical}")
+    if dedupe_policy == 'all':
+        return ranked, duplicates, elsewhere
+    return kept, duplicates, elsewhere
+
+def _load_gazette_details(folder):
+    try:
+        with open(join(folder, 'keywords.json'), 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _save_gazette_details(folder, ranked, hits, duplicates=None, elsewhere=None):
+    """Record subject, score, matched keywords and near-duplicates per PDF in the folder's keywords.json.
+
+    Duplicates of another ministry's gazette (see _pick_canonical) get an entry too, even
+    when they are not downloaded, so they stay visible under their own ministry.
+    """
+    details_path = join(folder, 'keywords.json')
+    details = _load_gazette_details(folder)
+    elsewhere = elsewhere or {}
+    listed = {ugid for _, ugid in ranked}
+    rows = list(ranked) + [(score, ugid) for ugid, (score, _, _) in elsewhere.items() if ugid not in listed]
+    for score, ugid in rows:
+        subject, keywords = hits[ugid]
+        gid_u = ugid.split(sep='-')[-1].strip()
+        details[gid_u] = {'ugid': ugid, 'subject': subject, 'score': round(score, 3), 'keywords': keywords}
+        if duplicates and ugid in duplicates:
+            details[gid_u]['duplicates'] = duplicates[ugid]
+        if ugid in elsewhere:
+            _, ministry, canonical = elsewhere[ugid]
+            details[gid_u]['duplicate_of'] = {'ministry': ministry, 'ugid': canonical}
+    with open(details_path, 'w') as f:
+        json.dump(details, f, indent=2)
+
 def egz_download():
     print("Gazette extraction completed. Now downloading PDFs...")
     filtered_gids = []
@@ -408,6 +668,8 @@ def egz_download():
         except FileNotFoundError:
             print(f"List file {list_path} not found. Skipping ministry code {valdict[mcode]}.")
             continue
+        progress_tracker.expect_files(valdict[mcode], len(filtered_gids))
+        details = _load_gazette_details(dirname(list_path))
         mincount = 0
         for gid in filtered_gids:
             if not eve_sig.is_set():
@@ -417,62 +679,173 @@ def egz_download():
             pdf_url = f'https://egazette.gov.in/WriteReadData/{today.year}/{gid_u}.pdf'
             print(f'url: {pdf_url}')
             file_path = get_files_path(valdict[mcode], str(today.year), str(today.month), f"{gid_u}.pdf")
+            if catalogue.is_archived(valdict[mcode], gid_u):
+                print(f"Gazette {gid_u} is already in the archive, skipping download.")
+                progress_tracker.file_done(valdict[mcode])
+                continue
             if exists(file_path):
                 print(f"File {file_path} already exists, skipping download.")
+                catalogue.record(valdict[mcode], gid_u, file_path, year=today.year, month=today.month, details=details.get(gid_u))
+                progress_tracker.file_done(valdict[mcode])
                 continue
-            response = get(pdf_url, timeout=30)
-            response.raise_for_status()
-            makedirs(dirname(file_path), exist_ok=True)
-            with open(file_path, "wb") as f:
-                f.write(response.content)
-                mincount += 1
-                emit_progress_update(valdict[mcode], 'completed', f'{mincount}/{len(filtered_gids)}')
+            if not _download(pdf_url, file_path, valdict[mcode]):
+                break
+            catalogue.record(valdict[mcode], gid_u, file_path, year=today.year, month=today.month, details=details.get(gid_u))
+            mincount += 1
+            progress_tracker.file_done(valdict[mcode])
+            scheduler.note_download()
+            emit_progress_update(valdict[mcode], 'completed', f'{mincount}/{len(filtered_gids)}')
         total_files += mincount
         emit_progress_update(valdict[mcode], 'completed', str(mincount))
     files_path = get_files_path()
     dwnld_count += total_files
     print(f"Total {total_files} new gazettes downloaded. Files are stored in {files_path} directory")
+    try:
+        DiskBudget(files_path, catalogue, int(disk_budget_gb * 1024 ** 3)).enforce()
+    except OSError as e:
+        print(f"Could not archive old downloads: {e}")
+    scheduler.finish_run()
+    _save_progress_metrics()
+    for line in timeouts.report():
+        print(line)
+    timeouts.save()
+    timeouts.reset_telemetry()
     
+ARAI_URL = "https://www.araiindia.com/downloads"
+
+def _ais_api_cache_path():
+    return get_state_path("cache", "arai_api.json")
+
+def _load_ais_endpoints():
+    try:
+        with open(_ais_api_cache_path(), 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _save_ais_endpoint(draft_type, url):
+    endpoints = _load_ais_endpoints()
+    if url:
+        endpoints[draft_type] = url
+    else:
+        endpoints.pop(draft_type, None)
+    makedirs(dirname(_ais_api_cache_path()), exist_ok=True)
+    with open(_ais_api_cache_path(), 'w') as f:
+        json.dump(endpoints, f, indent=2)
+
+def _ais_rows_from_json(payload):
+    """Find the list of AIS records in an API payload and return (code, href) pairs"""
+    if isinstance(payload, dict):
+        for value in payload.values():
+            rows = _ais_rows_from_json(value)
+            if rows:
+                return rows
+        return []
+    if not isinstance(payload, list) or not payload or not isinstance(payload[0], dict):
+        return []
+    rows = []
+    for record in payload:
+        if not isinstance(record, dict):
+            continue
+        href = next((v for v in record.values() if isinstance(v, str) and v.lower().split('?')[0].endswith('.pdf')), None)
+        code = next((v for k, v in record.items() if isinstance(v, str) and 'code' in k.lower()), None)
+        if code is None:
+            code = next((v for k, v in record.items() if isinstance(v, str) and ('ais' in k.lower() or 'title' in k.lower())), None)
+        if code and href:
+            rows.append([code, urljoin(ARAI_URL, href)])
+    return rows
+
+def _ais_fetch_api(draft_type):
+    """Fetch AIS rows straight from a previously captured ARAI API endpoint"""
+    url = _load_ais_endpoints().get(draft_type)
+    if not url:
+        return []
+    try:
+        response = _http_get(url, headers={'Accept': 'application/json', 'Referer': ARAI_URL})
+        response.raise_for_status()
+        rows = _ais_rows_from_json(response.json())
+    except (RequestException, ValueError) as e:
+        print(f"ARAI API request failed ({e}), falling back to the browser")
+        rows = []
+    if not rows:
+        _save_ais_endpoint(draft_type, None)
+    return rows
+
+async def _ais_capture(draft_type):
+    """Load the ARAI downloads page and read the table from the XHR feeding it"""
+    page = await browser.new_page()
+    captured = []
+    clicked = draft_type != "draft"
+
+    async def on_response(response):
+        if response.request.resource_type not in ('xhr', 'fetch') or 'json' not in response.headers.get('content-type', ''):
+            return
+        try:
+            rows = _ais_rows_from_json(await response.json())
+        except Exception:
+            return
+        # The draft list must come from a request made after switching the toggle
+        if rows and clicked:
+            captured.append((response.url, rows))
+
+    page.on('response', on_response)
+    try:
+        with timeouts.track('ais_goto') as limit:
+            await page.goto(ARAI_URL, timeout=limit)
+        if draft_type == "draft":
+            clicked = True
+            await page.click("input[id='draftAIS']")
+        with timeouts.track('ais_idle') as limit:
+            await page.wait_for_load_state('networkidle', timeout=limit)
+        if captured:
+            url, rows = captured[-1]
+            print(f"Captured ARAI API response from {url}")
+            _save_ais_endpoint(draft_type, url)
+            return rows
+        print("No ARAI API response captured, reading the rendered table")
+        with timeouts.track('ais_table') as limit:
+            await page.wait_for_selector(AIS_TABLE_SELECTOR, timeout=limit)
+        rows = page.locator(AIS_TABLE_SELECTOR).first.locator('tbody tr')
+        with timeouts.track('ais_rows') as limit:
+            await rows.last.wait_for(state='attached', timeout=limit)
+        return await rows.evaluate_all(AIS_ROWS_JS)
+    finally:
+        await page.close()
+
 async def ais_extract_pdfs(draft_type="draft"):
     aistype = 9999 if draft_type == "draft" else 9998
-    page = await context.new_page()
     print("Extracting AIS from ARAI India...")
     emit_progress_update(valdict[aistype], 'extracting')
-    try:
-        await page.goto("https://www.araiindia.com/downloads", timeout=30000)
-        if(draft_type == "draft"):
-            await page.click("input[id='draftAIS']")
-        await page.wait_for_selector("table[_ngcontent-arai-c19]", timeout=15000)
-        table = page.locator("table[_ngcontent-arai-c19]")
-        if(not table):
-            print("Table not found!!!")
+    started = perf_counter()
+    # requests blocks; on the loop it would stall cancellation and the pool watchdog
+    entries = await asyncio.get_running_loop().run_in_executor(None, _ais_fetch_api, draft_type)
+    if not entries:
+        try:
+            entries = await _ais_capture(draft_type)
+        except TimeoutError:
+            print("Timeout occurred while waiting for table rows to load")
+            timeout_event.set()
             return
-        rows = table.locator('tbody tr')
-        await rows.last.wait_for(state='attached', timeout=10000)
-    except TimeoutError:
-        print("Timeout occurred while waiting for table rows to load")
-        timeout_event.set()
-        return    
-    print(f"Found {await rows.count()} entries. Downloading PDF files...")
-    emit_progress_update(valdict[aistype], 'completed', f"0/{await rows.count()}")
+    print(f"Found {len(entries)} entries in {perf_counter() - started:.2f}s. Downloading PDF files...")
+    emit_progress_update(valdict[aistype], 'completed', f"0/{len(entries)}")
+    if not eve_sig.is_set():
+        return
+    lines = []
+    for code, pdf_url in entries:
+        if not code or not pdf_url:
+            continue
+        code = sub(r'[<>:"/\\|?*\s]', '_', code)
+        pdf_url = quote(pdf_url, safe=":/?&=%")
+        print(f"Code: {pdf_url}")
+        lines.append(f"{code} {pdf_url}\n")
     aids_list_path = get_files_path(valdict[aistype], "aids_list.txt")
-    makedirs(dirname(aids_list_path), exist_ok=True)    
+    makedirs(dirname(aids_list_path), exist_ok=True)
     with open(aids_list_path, 'w') as f:
-        for i in range(await rows.count()):
-            if not eve_sig.is_set():
-                break
-            row = rows.nth(i)
-            code = await row.locator('td').nth(1).text_content()
-            if not code:
-                continue
-            code = sub(r'[<>:"/\\|?*\s]', '_', code)
-            dl = row.locator('td').nth(3).locator('a')
-            if not dl:
-                continue
-            pdf_url = await dl.get_attribute('href')
-            pdf_url = quote(pdf_url, safe=":/?&=%")
-            print(f"Code: {pdf_url}")
-            f.write(f"{code} {pdf_url}\n")
+        f.writelines(lines)
+    if lines:
+        scheduler.note_hit()
+    return len(entries), len(lines)
+
 def ais_download(aistype):
     alist = []
     global dwnld_count
@@ -480,6 +853,7 @@ def ais_download(aistype):
     aids_list_path = get_files_path(valdict[aistype], "aids_list.txt")
     with open(aids_list_path, 'r') as f:
         alist = f.readlines()
+    progress_tracker.expect_files(valdict[aistype], len(alist))
     for aid in alist:
         if not eve_sig.is_set():
             break
@@ -488,33 +862,49 @@ def ais_download(aistype):
         pdf_url = asp[1]
         print(f"Downloading {code} from {pdf_url}")
         file_path = get_files_path(valdict[aistype], f"{code}.{pdf_url.split('.')[-1][:-1]}")
+        if catalogue.is_archived(valdict[aistype], code):
+            print(f"{code} is already in the archive, skipping download.")
+            progress_tracker.file_done(valdict[aistype])
+            continue
         if exists(file_path):
             print(f"File {file_path} already exists, skipping download.")
+            catalogue.record(valdict[aistype], code, file_path)
+            progress_tracker.file_done(valdict[aistype])
             continue
-        response = get(pdf_url[:-1], timeout=30)
-        response.raise_for_status()
-            
-        makedirs(dirname(file_path), exist_ok=True)
-        print(response)
-        with open(file_path, "wb") as f:
-            f.write(response.content)
-            total_files += 1
-            emit_progress_update(valdict[aistype], 'completed', f"{total_files}/{len(alist)}")
+        if not _download(pdf_url[:-1], file_path, valdict[aistype]):
+            break
+        catalogue.record(valdict[aistype], code, file_path)
+        total_files += 1
+        progress_tracker.file_done(valdict[aistype])
+        scheduler.note_download()
+        emit_progress_update(valdict[aistype], 'completed', f"{total_files}/{len(alist)}")
     emit_progress_update(valdict[aistype], 'completed', str(total_files))
     files_path = get_files_path()
     dwnld_count += total_files
     print(f"Total {total_files} new files downloaded. Files are stored in {files_path} directory")
 
+def set_month(month=None):
+    """Point the next extraction and download at a month (1-12) of the current year"""
+    global today, target_month
+    now = datetime.datetime.now()
+    today = now.replace(day=1, month=month) if month else now
+    target_month = month
+
 async def extract_mids(user_domains, user_keywords):
     mlist_input.clear()
     for domain in user_domains:
         mlist_input.append(inv_valdict[domain])
-    print(f"Ministries selected: {mlist_input}")
+    mlist_input[:] = scheduler.order(mlist_input)
+    print(f"Ministries selected (scheduled order): {mlist_input}")
     if not mlist_input:
         print("No ministries selected. Exiting...")
         empty_domains.set()
         return -1
     if eve_sig.is_set():
+        scheduler.start_run()
+        progress_tracker.start_run(len(mlist_input))
+        duplicate_index.reset()
+        canonical_ministry.clear()
         await egz_extract_pdfs(mlist_input, user_keywords)
     # Don't set eve_sig here - let the GUI manage the signal state
     return 0
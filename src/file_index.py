@@ -0,0 +1,261 @@
+"""
+File Index Module - background metadata index of the downloaded files for the file browser
+"""
+
+import datetime
+import json
+import os
+import zipfile
+from threading import Condition
+
+from PySide6.QtCore import Qt, QThread, Signal, QAbstractTableModel, QModelIndex
+from PySide6.QtPdf import QPdfDocument
+
+# Bookkeeping files and folders of the app itself, not downloads
+SKIP_FILES = ('gids_list.txt', 'keywords.json')
+SKIP_DIRS = ('cache', 'stats', 'logs', 'catalogue', 'profiles')
+ARCHIVE_DIR = 'archive'
+COLUMNS = ('Name', 'Ministry', 'Date', 'Pages', 'Size', 'Score', 'Keywords', 'Subject')
+SORT_ROLE = Qt.ItemDataRole.UserRole
+PATH_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+def _format_size(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class FileIndexer(QThread):
+    """Walks directories under root on a worker thread and reports file metadata.
+
+    Page counts are the only expensive part; they are cached on disk by path, size and
+    mtime, so after the first build a rescan only opens new or changed PDFs.
+    """
+    updated = Signal(list, list)  # changed records, removed paths
+    directories = Signal(list)
+
+    def __init__(self, root, cache_path, parent=None):
+        super().__init__(parent)
+        self.root = os.path.abspath(root)
+        self.cache_path = cache_path
+        self.pending = []
+        self.condition = Condition()
+        self.stopping = False
+        self.known = {}  # path -> record, as last reported
+        self.page_counts = self._load_cache()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, 'w') as f:
+                json.dump(self.page_counts, f)
+        except OSError as e:
+            print(f"Could not save file index: {e}")
+
+    def rescan(self, directory=None):
+        """Queue a directory (default: the whole root) for an incremental rescan"""
+        directory = os.path.abspath(directory or self.root)
+        with self.condition:
+            if directory not in self.pending:
+                self.pending.append(directory)
+            self.condition.notify()
+
+    def stop(self):
+        with self.condition:
+            self.stopping = True
+            self.condition.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopping:
+                    self.condition.wait()
+                if self.stopping:
+                    break
+                directory = self.pending.pop(0)
+            self._scan(directory)
+
+    def _scan(self, directory):
+        found = {}
+        folders = []
+        for folder, dirnames, filenames in os.walk(directory):
+            if folder == self.root:
+                dirnames[:] = [name for name in dirnames if name not in SKIP_DIRS]
+            folders.append(folder)
+            details = self._details(folder) if 'keywords.json' in filenames else {}
+            for name in filenames:
+                if name in SKIP_FILES or name.endswith('.part'):
+                    continue
+                if name.endswith('.zip'):
+                    found.update((record['path'], record) for record in self._archive_records(os.path.join(folder, name)))
+                    continue
+                record = self._record(os.path.join(folder, name), details)
+                if record is not None:
+                    found[record['path']] = record
+        prefix = directory + os.sep
+        removed = [path for path in self.known if path.startswith(prefix) and path not in found]
+        changed = [record for path, record in found.items() if self.known.get(path) != record]
+        for path in removed:
+            del self.known[path]
+            self.page_counts.pop(path, None)
+        self.known.update((record['path'], record) for record in changed)
+        if changed or removed:
+            self._save_cache()
+            self.updated.emit(changed, removed)
+        self.directories.emit(folders)
+
+    def _details(self, folder):
+        try:
+            with open(os.path.join(folder, 'keywords.json'), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _page_count(self, path, stat):
+        stamp = [stat.st_size, stat.st_mtime_ns]
+        cached = self.page_counts.get(path)
+        if cached and cached[:2] == stamp:
+            return cached[2]
+        document = QPdfDocument()
+        document.load(path)
+        pages = document.pageCount() if document.status() == QPdfDocument.Status.Ready else None
+        document.close()
+        self.page_counts[path] = stamp + [pages]
+        return pages
+
+    def _record(self, path, details):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        parts = os.path.relpath(path, self.root).split(os.sep)
+        name = parts[-1]
+        # files/<ministry>/<year>/<month>/<gid>.pdf for gazettes, files/<AIS list>/<file> for ARAI
+        if len(parts) >= 4 and parts[1].isdigit() and parts[2].isdigit():
+            date = f"{parts[1]}-{int(parts[2]):02d}"
+        else:
+            date = datetime.date.fromtimestamp(stat.st_mtime).isoformat()
+        entry = details.get(os.path.splitext(name)[0], {})
+        return {
+            'path': path,
+            'name': name,
+            'ministry': parts[0] if len(parts) > 1 else '',
+            'date': date,
+            'pages': self._page_count(path, stat) if name.lower().endswith('.pdf') else None,
+            'size': stat.st_size,
+            'score': entry.get('score'),
+            'keywords': ', '.join(entry.get('keywords', [])),
+            'subject': entry.get('subject', ''),
+        }
+
+
+    def _archive_records(self, archive_path):
+        """Records for the gazettes inside an archived month (archive/<ministry>/<year>/<month>.zip)"""
+        parts = os.path.relpath(archive_path, self.root).split(os.sep)
+        if len(parts) != 4 or parts[0] != ARCHIVE_DIR:
+            return []
+        try:
+            with zipfile.ZipFile(archive_path) as zf:
+                members = zf.infolist()
+                names = zf.namelist()
+                details = json.loads(zf.read('keywords.json')) if 'keywords.json' in names else {}
+        except (OSError, ValueError, zipfile.BadZipFile):
+            return []
+        month = os.path.splitext(parts[3])[0]
+        records = []
+        for member in members:
+            if member.filename in SKIP_FILES:
+                continue
+            entry = details.get(os.path.splitext(member.filename)[0], {})
+            records.append({
+                'path': os.path.join(archive_path, member.filename),
+                'name': member.filename,
+                'ministry': parts[1],
+                'date': f"{parts[2]}-{int(month):02d}" if month.isdigit() else parts[2],
+                # Counting pages would mean unpacking the archive
+                'pages': None,
+                'size': member.file_size,
+                'score': entry.get('score'),
+                'keywords': ', '.join(entry.get('keywords', [])),
+                'subject': entry.get('subject', ''),
+            })
+        return records
+
+
+class FileIndexModel(QAbstractTableModel):
+    """Indexed files as table rows; updated in place as the indexer reports changes"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records = []
+        self.rows = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self.records[index.row()]
+        key = COLUMNS[index.column()].lower()
+        value = record[key]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if value is None:
+                return ""
+            if key == 'size':
+                return _format_size(value)
+            if key == 'score':
+                return f"{value:.2f}"
+            return str(value)
+        if role == SORT_ROLE:
+            # Missing numbers sort below every real value
+            return -1 if value is None else value
+        if role == PATH_ROLE:
+            return record['path']
+        if role == Qt.ItemDataRole.ToolTipRole and key in ('subject', 'keywords', 'name'):
+            return record['subject'] or record['path']
+        return None
+
+    def apply(self, changed, removed):
+        for path in removed:
+            row = self.rows.get(path)
+            if row is None:
+                continue
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.records[row]
+            self.rows = {record['path']: i for i, record in enumerate(self.records)}
+            self.endRemoveRows()
+        new = []
+        for record in changed:
+            row = self.rows.get(record['path'])
+            if row is None:
+                new.append(record)
+                continue
+            self.records[row] = record
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+        if new:
+            start = len(self.records)
+            self.beginInsertRows(QModelIndex(), start, start + len(new) - 1)
+            for i, record in enumerate(new, start):
+                self.records.append(record)
+                self.rows[record['path']] = i
+            self.endInsertRows()
@@ -0,0 +1,153 @@
+"""
+Fuzzy Keyword Module - normalisation, light stemming and bounded edit-distance lookup
+
+Subject words are reduced to a canonical form (case folded, hyphens and accents
+dropped, known spelling variants mapped, suffixes stripped) and looked up in a BK-tree
+built over the canonical keyword words. Lookups are memoised per distinct subject word,
+so after the first few pages a fuzzy match costs about one dict lookup per word.
+"""
+
+import re
+import unicodedata
+
+TOKEN_RE = re.compile(r'\w+(?:[-\'’]\w+)*')
+# Spelling variants seen in gazette subjects, mapped to one form before stemming
+VARIANTS = {
+    'tyre': 'tire',
+    'tyres': 'tires',
+    'evehicle': 'ev',
+    'evehicles': 'ev',
+    'aluminium': 'aluminum',
+    'licence': 'license',
+    'licences': 'licenses',
+    'centre': 'center',
+    'centres': 'centers',
+    'metre': 'meter',
+    'metres': 'meters',
+    'litre': 'liter',
+    'litres': 'liters',
+    'fibre': 'fiber',
+    'sulphur': 'sulfur',
+    'programme': 'program',
+    'colour': 'color',
+    'kerb': 'curb',
+}
+# Longest first; (suffix, replacement)
+SUFFIXES = (
+    ('ations', ''), ('ation', ''), ('ments', ''), ('ment', ''), ('ings', ''), ('ing', ''),
+    ('ies', 'y'), ('ied', 'y'), ('ed', ''), ('es', ''), ('s', ''),
+)
+MEMO_LIMIT = 50000
+
+
+def normalize(word):
+    """Case fold, drop accents, hyphens and apostrophes"""
+    word = unicodedata.normalize('NFKD', word.casefold())
+    return ''.join(ch for ch in word if ch.isalnum())
+
+
+def stem(word):
+    """Strip one common English suffix and a trailing 'e' (amendment/amended -> amend)"""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    for suffix, replacement in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == 's' and word.endswith('ss'):
+                break
+            word = word[:-len(suffix)] + replacement
+            break
+    if len(word) > 3 and word.endswith('e'):
+        word = word[:-1]
+    return word
+
+
+def canonical(word):
+    word = normalize(word)
+    return stem(VARIANTS.get(word, word))
+
+
+def max_distance(word):
+    """Edits tolerated for a canonical keyword word of this length"""
+    if len(word) <= 4:
+        return 0
+    return 1 if len(word) <= 7 else 2
+
+
+def tokenize(text):
+    return [m.group() for m in TOKEN_RE.finditer(text)]
+
+
+def levenshtein(a, b, limit):
+    """Edit distance between a and b, or limit + 1 once it is certain to exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """Metric tree over words for bounded edit-distance search"""
+
+    def __init__(self, words=()):
+        self.root = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        if self.root is None:
+            self.root = (word, {})
+            return
+        node = self.root
+        while True:
+            distance = levenshtein(word, node[0], max(len(word), len(node[0])))
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                return
+            node = child
+
+    def search(self, word, limit):
+        """(candidate, distance) pairs within limit edits of word"""
+        found = []
+        pending = [self.root] if self.root else []
+        while pending:
+            candidate, children = pending.pop()
+            distance = levenshtein(word, candidate, max(len(word), len(candidate)))
+            if distance <= limit:
+                found.append((candidate, distance))
+            for edge in range(distance - limit, distance + limit + 1):
+                child = children.get(edge)
+                if child is not None:
+                    pending.append(child)
+        return found
+
+
+class FuzzyIndex:
+    """Maps subject words to the canonical keyword words they may stand for"""
+
+    def __init__(self, keyword_words):
+        self.words = set(keyword_words)
+        self.tree = BKTree(sorted(self.words))
+        self.widest = max((max_distance(word) for word in self.words), default=0)
+        self.memo = {}
+
+    def lookup(self, token):
+        found = self.memo.get(token)
+        if found is None:
+            if len(self.memo) >= MEMO_LIMIT:
+                self.memo.clear()
+            word = canonical(token)
+            # Each keyword word keeps its own tolerance, so search with the widest and filter
+            found = frozenset(candidate for candidate, distance in self.tree.search(word, self.widest)
+                              if distance <= max_distance(candidate))
+            self.memo[token] = found
+        return found
@@ -1,14 +1,25 @@
-from threading import Thread
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QTextEdit, QFileSystemModel, QTreeView, QMessageBox, QScrollArea, QCheckBox, QComboBox, QCompleter, QProgressBar, QSplitter, QApplication
-from PySide6.QtCore import Qt, QTimer, Signal, QObject, QDir
+from time import perf_counter
+startup_started = perf_counter()
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QTextEdit, QTableView, QMessageBox, QComboBox, QCompleter, QProgressBar, QSplitter, QApplication, QListView, QAbstractItemView, QStyledItemDelegate, QStyleOptionViewItem, QStyle
+from PySide6.QtCore import Qt, QTimer, Signal, QObject, QFileSystemWatcher, QSortFilterProxyModel, QAbstractListModel, QModelIndex, QRect, QSize, QEvent
+from PySide6.QtGui import QColor, QCursor, QIcon, QPainter, QPalette
 import sys
-import asyncio
 import io
 import os
 import datetime
-import extraction as egz
-import qtawesome as qta
-import pdf_viewer as pv
+import multiprocessing
+from engine import EngineProcess
+from progress import format_progress
+from query import parse_query, QuerySyntaxError
+
+_icon_cache = {}
+
+def trash_icon():
+    """Return the shared trash icon, importing qtawesome only when first needed"""
+    if 'trash' not in _icon_cache:
+        import qtawesome as qta
+        _icon_cache['trash'] = qta.icon('fa6s.trash-can')
+    return _icon_cache['trash']
 
 def get_base_path():
     """Get the base path for files, accounting for PyInstaller bundle"""
@@ -17,6 +28,13 @@ def get_base_path():
     else:
         return os.path.dirname(os.path.abspath(__file__))
 
+def record_startup_time(elapsed_ms):
+    """Append a first-paint measurement to files/stats/startup.csv for tracking"""
+    stats_path = os.path.join(get_base_path(), "files", "stats", "startup.csv")
+    os.makedirs(os.path.dirname(stats_path), exist_ok=True)
+    with open(stats_path, "a") as f:
+        f.write(f"{datetime.datetime.now().isoformat(timespec='seconds')},{elapsed_ms:.1f},{int(getattr(sys, 'frozen', False))}\n")
+
 class LogStream(io.StringIO):
     def __init__(self, log_signal):
         super().__init__()
@@ -30,11 +48,13 @@ class LogStream(io.StringIO):
 class LogSignalEmitter(QObject):
     log_message = Signal(str)
     progress_update = Signal(str, str, str)
+    stats_update = Signal(dict)
 
 # Global log signal emitter
 log_emitter = LogSignalEmitter()
 
 class FileBrowser(QWidget):
+    """Downloaded files with their metadata, indexed in the background once first shown"""
     def __init__(self):
         super().__init__()
         
@@ -43,37 +63,109 @@ class FileBrowser(QWidget):
         self.path_Edit.setPlaceholderText("Enter file path or URL")
         layout.addWidget(self.path_Edit)
 
-        self.model = QFileSystemModel()
-        self.model.setRootPath(QDir.rootPath())
-        self.tree_view = QTreeView()
-        self.tree_view.setModel(self.model)
-        self.tree_view.setRootIndex(self.model.index(QDir.currentPath()+"/files"))
-        layout.addWidget(self.tree_view)
+        self.filter_Edit = QLineEdit()
+        self.filter_Edit.setPlaceholderText("Filter by name, ministry, date, keyword or subject")
+        self.filter_Edit.setClearButtonEnabled(True)
+        layout.addWidget(self.filter_Edit)
+
+        self.root_path = os.path.join(get_base_path(), "files")
+        self.table_view = QTableView()
+        self.table_view.setSortingEnabled(True)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table_view.verticalHeader().setVisible(False)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table_view)
 
         self.setLayout(layout)
+        # Built on first show so the index (and QtPdf) stay off the startup path
+        self.indexer = None
+        self.catalogue = None
+        self.changed_dirs = set()
+        self.rescan_timer = QTimer(self)
+        self.rescan_timer.setSingleShot(True)
+        self.rescan_timer.setInterval(500)
+        self.rescan_timer.timeout.connect(self.rescan_changed)
+
+        # Connect signals (e.g., table_view selection changed, button clicks)
+        self.table_view.clicked.connect(self.update_path_bar)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.indexer is None:
+            self.start_index()
+
+    def start_index(self):
+        """Build the metadata index on a worker thread and keep it current as files land"""
+        import file_index
+        os.makedirs(self.root_path, exist_ok=True)
+        self.model = file_index.FileIndexModel(self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setSortRole(file_index.SORT_ROLE)
+        self.proxy.setFilterKeyColumn(-1)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.table_view.setModel(self.proxy)
+        self.path_role = file_index.PATH_ROLE
+        self.table_view.sortByColumn(file_index.COLUMNS.index('Date'), Qt.SortOrder.DescendingOrder)
+        self.filter_Edit.textChanged.connect(self.proxy.setFilterFixedString)
 
-        # Connect signals (e.g., tree_view selection changed, button clicks)
-        self.tree_view.clicked.connect(self.update_path_bar)
+        self.indexer = file_index.FileIndexer(self.root_path, os.path.join(self.root_path, "cache", "file_index.json"))
+        self.indexer.updated.connect(self.model.apply)
+        self.indexer.directories.connect(self.watch_directories)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.directory_changed)
+        QApplication.instance().aboutToQuit.connect(self.indexer.stop)
+        self.indexer.start()
+        self.indexer.rescan()
+
+    def watch_directories(self, folders):
+        watched = set(self.watcher.directories())
+        new = [folder for folder in folders if folder not in watched]
+        if new:
+            self.watcher.addPaths(new)
+
+    def directory_changed(self, path):
+        # Downloads arrive in bursts; rescan each touched folder once the burst settles
+        self.changed_dirs.add(path)
+        self.rescan_timer.start()
+
+    def rescan_changed(self):
+        for path in self.changed_dirs:
+            self.indexer.rescan(path)
+        self.changed_dirs.clear()
 
     def update_path_bar(self, index):
-        path = self.model.filePath(index)
+        path = index.data(self.path_role)
         self.path_Edit.setText(path)
         
-        if os.path.isfile(path) and path.lower().endswith('.pdf'):
+        if path.lower().endswith('.pdf'):
             try:
+                import archive
+                # Archived gazettes are unpacked into the cache on first open
+                path = archive.materialize(path, os.path.join(self.root_path, "cache", "archive"))
+                if not os.path.isfile(path):
+                    return
                 print(f"Opening PDF: {path}")
-                viewer = pv.create_pdf_viewer(path)
-                viewer.show()
-                
-                # Keep reference to prevent garbage collection
-                if not hasattr(self, 'pdf_viewers'):
-                    self.pdf_viewers = []
-                self.pdf_viewers.append(viewer)
+                import pdf_viewer as pv
+                # The pool keeps the window alive and reuses it if the file is already open
+                pv.open_pdf(path)
+                self.note_access(path)
                 
             except Exception as e:
                 print(f"Error opening PDF viewer: {e}")
                 QMessageBox.warning(self, "Error", f"Could not open PDF: {str(e)}")
 
+    def note_access(self, path):
+        """Record the view in the catalogue so the disk budget archives this month last"""
+        if self.catalogue is None:
+            from catalogue import Catalogue
+            self.catalogue = Catalogue(os.path.join(self.root_path, "catalogue", "catalogue.sqlite"))
+        try:
+            self.catalogue.touch(path)
+        except Exception as e:
+            print(f"Could not update catalogue: {e}")
+
 class LogWindow(QWidget):
     def __init__(self):
         super().__init__()
@@ -148,140 +240,259 @@ class LogWindow(QWidget):
         """Clear all log messages"""
         self.log_display.clear()
 
-class DomainEntries(QScrollArea):
-    def __init__(self, items, parent=None):
+# Status pill colours of the domain list
+STATUS_COLORS = {
+    'default': 'transparent',
+    'extracting': '#ffeb3b',
+    'completed': '#4caf50',
+    'error': '#f44336',
+    'skipped': "#2a5dd5",
+}
+STATUS_ROLE = Qt.ItemDataRole.UserRole
+ROW_HEIGHT = 29
+BUTTON_SIZE = 25
+PILL_WIDTH = 50
+
+class EntryListModel(QAbstractListModel):
+    """Items of a domain or keyword list; keyword rows are [text, checked] pairs"""
+    def __init__(self, items, checkable=False, parent=None):
         super().__init__(parent)
-        self.setWidgetResizable(True)
-        self.content = QWidget()
-        self.layout = QVBoxLayout(self.content)
-        self.layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.items_list = items.copy()
-        self.item_widgets = {}
-        self.extraction_in_progress = False  # Track extraction state
-        self._refresh_display()
-        self.content.setLayout(self.layout)
-        self.setWidget(self.content)
-        
-        self.blink_timer = QTimer(self)
-        self.blink_timer.setInterval(500)
-        self.blink_timer.timeout.connect(self._handle_blink)
-        self.blinking_item = None
-        self.blink_state = False
-
-    def _create_item_row(self, item_text):
-        """Create a row with item text and delete button"""
-        row_widget = QWidget()
-        row_layout = QHBoxLayout(row_widget)
-        row_layout.setContentsMargins(0, 2, 0, 2)
-        row_widget.setStyleSheet("""
-            QWidget:hover {
-                background-color: #2a5dd5;                     
-            }
-        """)
-        
-        label = QLabel(item_text)
-        label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+        self.items = items
+        self.checkable = checkable
+        self.status = {}  # text -> (status, count)
+        self.locked = False  # trash buttons are disabled while extracting
+        self.blink_on = False
+        self._reindex()
+    
+    def text(self, row):
+        item = self.items[row]
+        return item[0] if self.checkable else item
+    
+    def _reindex(self):
+        self.rows = {self.text(row): row for row in range(len(self.items))}
+    
+    def row_of(self, text):
+        return self.rows.get(text, -1)
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+    
+    def flags(self, index):
+        flags = Qt.ItemFlag.ItemIsEnabled
+        if self.checkable:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.text(row)
+        if role == STATUS_ROLE:
+            return self.status.get(self.text(row), ('default', ''))
+        if self.checkable and role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if self.items[row][1] else Qt.CheckState.Unchecked
+        if self.checkable and role == Qt.ItemDataRole.ToolTipRole:
+            weight = f" (relevance weight {self.items[row][2]})" if len(self.items[row]) > 2 else ""
+            return "Check this item to perform case-sensitive keyword-matching" + weight
+        return None
+    
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not (self.checkable and index.isValid() and role == Qt.ItemDataRole.CheckStateRole):
+            return False
+        self.items[index.row()][1] = Qt.CheckState(value) == Qt.CheckState.Checked
+        self.dataChanged.emit(index, index, [role])
+        return True
+    
+    def append(self, item):
+        row = len(self.items)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.items.append(item)
+        self.rows[self.text(row)] = row
+        self.endInsertRows()
+    
+    def remove(self, text):
+        row = self.row_of(text)
+        if row < 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.items[row]
+        self.status.pop(text, None)
+        self._reindex()
+        self.endRemoveRows()
+    
+    def reset(self, items):
+        self.beginResetModel()
+        self.items = items
+        self.status.clear()
+        self._reindex()
+        self.endResetModel()
+    
+    def touch(self, text):
+        """Repaint a single row"""
+        row = self.row_of(text)
+        if row >= 0:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [STATUS_ROLE])
+    
+    def set_status(self, text, status, count):
+        if self.row_of(text) < 0 or self.status.get(text) == (status, count):
+            return
+        self.status[text] = (status, count)
+        self.touch(text)
+    
+    def clear_statuses(self):
+        if self.status and self.items:
+            self.status.clear()
+            self.dataChanged.emit(self.index(0), self.index(len(self.items) - 1), [STATUS_ROLE])
+    
+    def set_locked(self, locked):
+        changed = self.locked != locked
+        self.locked = locked
+        if changed and self.items:
+            self.dataChanged.emit(self.index(0), self.index(len(self.items) - 1))
 
-        indicator = QLabel()
-        indicator.setAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter)
-        indicator.setFixedSize(50, 25)
-        indicator.setStyleSheet("padding: 5px; background-color: transparent; border-radius: 12px;")
-        
-        delete_btn = QPushButton()
-        delete_btn.setIcon(qta.icon('fa6s.trash-can'))
-        delete_btn.setFixedSize(25, 25)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #969696;
-                border: none;
-                border-radius: 12px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #cc0000;
-            }
-        """)
-        delete_btn.clicked.connect(lambda: self._delete_item(item_text))
-        
-        row_layout.addWidget(label)
-        row_layout.addWidget(indicator)
-        row_layout.addWidget(delete_btn)
-        row_layout.setStretch(0, 1)
-        
-        self.item_widgets[item_text] = {
-            'widget': row_widget,
-            'label': indicator,
-            'delete_btn': delete_btn
-        }
-        
-        # If extraction is in progress, disable the delete button
-        if self.extraction_in_progress:
-            delete_btn.setEnabled(False)
-            
-        return row_widget
+class EntryDelegate(QStyledItemDelegate):
+    """Paints a row with an optional status pill and a trash button, and turns trash clicks into delete requests"""
+    delete_requested = Signal(str)
     
-    def _handle_blink(self):
-        """Handle the blinking timer timeout"""
-        if self.blinking_item and self.blinking_item in self.item_widgets:
-            self.blink_state = not self.blink_state
-            color = '#ffeb3b' if self.blink_state else 'transparent'
-            label = self.item_widgets[self.blinking_item]['label']
-            label.setStyleSheet(f"padding: 5px; background-color: {color}; border-radius: 3px;")
+    def __init__(self, show_status, parent=None):
+        super().__init__(parent)
+        self.show_status = show_status
+    
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+    
+    def _trash_rect(self, rect):
+        return QRect(rect.right() - BUTTON_SIZE, rect.top() + (rect.height() - BUTTON_SIZE) // 2, BUTTON_SIZE, BUTTON_SIZE)
+    
+    def _pill_rect(self, rect):
+        trash = self._trash_rect(rect)
+        return QRect(trash.left() - 6 - PILL_WIDTH, trash.top(), PILL_WIDTH, BUTTON_SIZE)
+    
+    def paint(self, painter, option, index):
+        model = index.model()
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        if hovered:
+            painter.fillRect(option.rect, QColor('#2a5dd5'))
+        
+        trash = self._trash_rect(option.rect)
+        text_option = QStyleOptionViewItem(option)
+        text_option.state &= ~QStyle.StateFlag.State_MouseOver
+        text_option.rect = QRect(option.rect)
+        text_option.rect.setRight((self._pill_rect(option.rect) if self.show_status else trash).left() - 6)
+        super().paint(painter, text_option, index)
+        
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        if self.show_status:
+            status, count = index.data(STATUS_ROLE)
+            color = STATUS_COLORS.get(status, STATUS_COLORS['default'])
+            if status == 'extracting' and not model.blink_on:
+                color = STATUS_COLORS['default']
+            pill = self._pill_rect(option.rect)
+            painter.setBrush(QColor(color))
+            painter.drawRoundedRect(pill, 3, 3)
+            painter.setPen(option.palette.color(QPalette.ColorRole.Text))
+            painter.drawText(pill, Qt.AlignmentFlag.AlignCenter, count)
+            painter.setPen(Qt.PenStyle.NoPen)
+        
+        over_trash = False
+        if hovered and not model.locked and option.widget is not None:
+            over_trash = trash.contains(option.widget.viewport().mapFromGlobal(QCursor.pos()))
+        painter.setBrush(QColor('#cc0000' if over_trash else '#969696'))
+        painter.drawEllipse(trash)
+        mode = QIcon.Mode.Disabled if model.locked else QIcon.Mode.Normal
+        trash_icon().paint(painter, trash.adjusted(5, 5, -5, -5), Qt.AlignmentFlag.AlignCenter, mode)
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index):
+        if event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease) \
+                and self._trash_rect(option.rect).contains(event.position().toPoint()):
+            if event.type() == QEvent.Type.MouseButtonRelease and not model.locked:
+                self.delete_requested.emit(index.data())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+class EntryListView(QListView):
+    """Virtualised list whose rows are painted by EntryDelegate, so updates cost O(visible rows)"""
+    def __init__(self, entries, show_status, parent=None):
+        super().__init__(parent)
+        self.entries = entries
+        self.setModel(entries)
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.delegate = EntryDelegate(show_status, self)
+        self.delegate.delete_requested.connect(self._delete_item)
+        self.setItemDelegate(self.delegate)
+        self.extraction_in_progress = False  # Track extraction state
+    
+    def mouseMoveEvent(self, event):
+        # Repaint the hovered row so the trash button tracks the cursor
+        super().mouseMoveEvent(event)
+        index = self.indexAt(event.position().toPoint())
+        if index.isValid():
+            self.update(index)
     
     def disable_trash(self):
         """Disable the delete button for all items"""
         self.extraction_in_progress = True
-        for item_text, widgets in self.item_widgets.items():
-            widgets['delete_btn'].setEnabled(False)
-            
+        self.entries.set_locked(True)
+    
     def enable_trash(self):
         """Enable the delete button for all items"""
         self.extraction_in_progress = False
-        for item_text, widgets in self.item_widgets.items():
-            widgets['delete_btn'].setEnabled(True)
+        self.entries.set_locked(False)
+    
+    def _delete_item(self, item_text):
+        """Remove item from the list"""
+        self.entries.remove(item_text)
+
+class DomainEntries(EntryListView):
+    def __init__(self, items, parent=None):
+        super().__init__(EntryListModel(items.copy()), show_status=True, parent=parent)
+        self.blink_timer = QTimer(self)
+        self.blink_timer.setInterval(500)
+        self.blink_timer.timeout.connect(self._handle_blink)
+        self.blinking_item = None
+    
+    def _handle_blink(self):
+        """Handle the blinking timer timeout"""
+        if self.blinking_item:
+            self.entries.blink_on = not self.entries.blink_on
+            self.entries.touch(self.blinking_item)
 
     def update_item_color(self, item_text, status, count="-"):
         """Update the color of a specific item based on status"""
-        if item_text not in self.item_widgets:
+        if self.entries.row_of(item_text) < 0:
             return
-            
-        colors = {
-            'default': 'transparent',
-            'extracting': '#ffeb3b',
-            'completed': '#4caf50',
-            'error': '#f44336',
-            'skipped': "#2a5dd5",
-        }
         
         if status == 'extracting':
-            if self.blink_timer.isActive():
-                self.blink_timer.stop()
-                self.blink_state = True
-                self._handle_blink()
-            
+            if self.blinking_item and self.blinking_item != item_text:
+                self.entries.touch(self.blinking_item)
             self.blinking_item = item_text
-            self.blink_state = True
+            self.entries.blink_on = True
+            # Keep showing the last count while blinking
+            self.entries.set_status(item_text, status, self.entries.status.get(item_text, ('default', ''))[1])
+            self.entries.touch(item_text)
             self.blink_timer.start()
             return
-        else:
-            if self.blinking_item == item_text:
-                self.blink_timer.stop()
-                self.blinking_item = None
-                self.blink_state = False
-                
-        color = colors.get(status, colors['default'])
-        label = self.item_widgets[item_text]['label']
-        label.setStyleSheet(f"padding: 5px; background-color: {color}; border-radius: 3px;")
-        label.setText(count)
+        elif self.blinking_item == item_text:
+            self.blink_timer.stop()
+            self.blinking_item = None
+        
+        self.entries.set_status(item_text, status, count)
     
     def reset_all_colors(self):
         """Reset all items to default color and stop any blinking"""
         # Use Qt's thread-safe way to stop timer
-        if hasattr(self, 'blink_timer'):
-            QTimer.singleShot(0, self._stop_blinking)
-        
-        for item_text in self.item_widgets:
-            self.update_item_color(item_text, 'default')
+        QTimer.singleShot(0, self._stop_blinking)
+        self.entries.clear_statuses()
         
         # Only enable trash if extraction is not in progress
         if not self.extraction_in_progress:
@@ -289,180 +500,49 @@ class DomainEntries(QScrollArea):
     
     def _stop_blinking(self):
         """Thread-safe method to stop blinking timer"""
-        if hasattr(self, 'blink_timer') and self.blink_timer.isActive():
+        if self.blink_timer.isActive():
             self.blink_timer.stop()
         self.blinking_item = None
-        self.blink_state = False
-    
-    def _delete_item(self, item_text):
-        """Remove item from list and refresh display"""
-        if item_text in self.items_list:
-            self.items_list.remove(item_text)
-            if item_text in self.item_widgets:
-                del self.item_widgets[item_text]
-            self._refresh_display()
-    
-    def _refresh_display(self):
-        """Clear and rebuild the display"""
-        for i in reversed(range(self.layout.count())):
-            child = self.layout.itemAt(i).widget()
-            if child:
-                child.deleteLater()
-        
-        self.item_widgets.clear()
-        
-        for item in self.items_list:
-            row_widget = self._create_item_row(item)
-            self.layout.addWidget(row_widget)
     
     def get_items(self):
         """Return current list of items"""
-        return self.items_list.copy()
+        return list(self.entries.items)
     
     def add_item(self, item_text):
         """Add new item to the list"""
-        if item_text and item_text not in self.items_list:
-            self.items_list.append(item_text)
-            self._refresh_display()
+        if item_text and self.entries.row_of(item_text) < 0:
+            self.entries.append(item_text)
             return True
-        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        self.scrollToBottom()
         return False
     
     def refresh(self, items):
         """Update the entire list with new items"""
-        self.items_list = items.copy()
-        self._refresh_display()
+        self.entries.reset(items.copy())
     
     def cleanup(self):
         """Clean up timers and resources in a thread-safe way"""
-        # Use Qt's thread-safe way to stop timer
-        if hasattr(self, 'blink_timer'):
-            QTimer.singleShot(0, self._stop_blinking)
+        QTimer.singleShot(0, self._stop_blinking)
 
-class KeywordEntries(QScrollArea):
+class KeywordEntries(EntryListView):
     def __init__(self, items, parent=None):
-        super().__init__(parent)
-        self.setWidgetResizable(True)
-        self.content = QWidget()
-        self.layout = QVBoxLayout(self.content)
-        self.layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.items_list = items
-        self.widgets_list = {}
-        self.extraction_in_progress = False  # Track extraction state
-        self._refresh_display()
-        self.content.setLayout(self.layout)
-        self.setWidget(self.content)
-    
-    def _create_item_row(self, item_data):
-        """Create a row with checkbox, item text and delete button"""
-        item_text, is_checked = item_data
-        row_widget = QWidget()
-        row_layout = QHBoxLayout(row_widget)
-        row_layout.setContentsMargins(0, 2, 0, 2)
-        row_widget.setStyleSheet("""
-            QWidget:hover {
-                background-color: #2a5dd5;
-            }
-        """)
-        
-        checkbox = QCheckBox()
-        checkbox.setToolTip("Check this item to perform case-sensitive keyword-matching")
-        checkbox.setChecked(is_checked)
-        checkbox.setFixedSize(20, 20)
-        checkbox.toggled.connect(lambda checked: self._toggle_item(item_text, checked))
-        
-        label = QLabel(item_text)
-        label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-        label.setStyleSheet("padding: 5px;")
-        
-        delete_btn = QPushButton()
-        delete_btn.setIcon(qta.icon('fa6s.trash-can'))
-        delete_btn.setFixedSize(25, 25)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #969696;
-                border: none;
-                border-radius: 12px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #cc0000;
-            }
-        """)
-        delete_btn.clicked.connect(lambda: self._delete_item(item_text))
-        
-        # Store widget reference properly
-        self.widgets_list[item_text] = {
-            'widget': row_widget,
-            'delete_btn': delete_btn
-        }
-        
-        row_layout.addWidget(checkbox)
-        row_layout.addWidget(label)
-        row_layout.addWidget(delete_btn)
-        row_layout.setStretch(1, 1)
-        
-        return row_widget
-    
-    def enable_trash(self):
-        """Enable the delete button for all items"""
-        self.extraction_in_progress = False
-        for widget in self.widgets_list.values():
-            widget['delete_btn'].setEnabled(True)
-            
-    def disable_trash(self):
-        """Disable the delete button for all items"""
-        self.extraction_in_progress = True
-        for widget in self.widgets_list.values():
-            widget['delete_btn'].setEnabled(False)
-
-    def _toggle_item(self, item_text, checked):
-        """Update the toggle state of an item"""
-        for i, (text, _) in enumerate(self.items_list):
-            if text == item_text:
-                self.items_list[i][1] = checked
-                break
-    
-    def _delete_item(self, item_text):
-        """Remove item from list and refresh display"""
-        self.items_list = [item for item in self.items_list if item[0] != item_text]
-        self._refresh_display()
-    
-    def _refresh_display(self):
-        """Clear and rebuild the display"""
-        for i in reversed(range(self.layout.count())):
-            child = self.layout.itemAt(i).widget()
-            if child:
-                child.deleteLater()
-        
-        # Clear the widgets list before rebuilding
-        self.widgets_list.clear()
-        
-        for item_data in self.items_list:
-            row_widget = self._create_item_row(item_data)
-            self.layout.addWidget(row_widget)
-            self.widgets_list[item_data[0]] = {
-                'widget': row_widget,
-                'delete_btn': row_widget.findChild(QPushButton)
-            }
+        super().__init__(EntryListModel(items, checkable=True), show_status=False, parent=parent)
     
     def get_items(self):
         """Return current list of items as [text, boolean] pairs"""
-        return [item.copy() for item in self.items_list]
+        return [item.copy() for item in self.entries.items]
     
     def add_item(self, item_text, checked=False):
         """Add new item to the list with optional checked state"""
-        if item_text and not any(text == item_text for text, _ in self.items_list):
-            self.items_list.append([item_text, checked])
-            self._refresh_display()
+        if item_text and self.entries.row_of(item_text) < 0:
+            self.entries.append([item_text, checked])
             return True
-        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        self.scrollToBottom()
         return False
     
     def refresh(self, items):
         """Update the entire list with new items"""
-        self.items_list = [[item, False] for item in items] if items else []
-        self._refresh_display()
+        self.entries.reset([[item, False] for item in items] if items else [])
 
 class ColumnSection(QWidget):
     def submit_action(self, content, items):
@@ -472,6 +552,11 @@ class ColumnSection(QWidget):
             return
         if content != "":
             if self.mode == "keywords":
+                try:
+                    parse_query(content)
+                except QuerySyntaxError as e:
+                    QMessageBox.warning(self, "Warning", f"Invalid keyword query: {e}")
+                    return
                 # For keywords, add to KeywordEntries
                 if self.frame.add_item(content):
                     self.combo.clear()
@@ -490,6 +575,7 @@ class ColumnSection(QWidget):
             self.mode="keywords"
             self.combo = QLineEdit()
             self.combo.setPlaceholderText("Enter Keywords")
+            self.combo.setToolTip('A phrase, or a query using AND, OR, NOT, (...), "phrase", =word, ~fuzzy and NEAR/n')
             self.combo.returnPressed.connect(lambda: self.submit_action(self.combo.text(), frame_items))
             self.button.clicked.connect(lambda: self.submit_action(self.combo.text(), frame_items))
             self.frame = KeywordEntries(frame_items)
@@ -512,13 +598,14 @@ class ColumnSection(QWidget):
 def submit_action():
     """Handle start/cancel button clicks"""
     if window.start_button.text() == "Cancel":
-        egz.eve_sig.clear()
+        engine.cancel()
         if hasattr(window, '_status_timer') and window._status_timer.isActive():
             window._status_timer.stop()
         if hasattr(window, '_progress_popup') and window._progress_popup.isVisible():
             window._progress_popup.close()
         
         window.section1.frame.reset_all_colors()
+        window.run_progress.setVisible(False)
         window.section1.frame.enable_trash()
         window.section2.frame.enable_trash()
         window.start_button.setText("Start")
@@ -527,7 +614,6 @@ def submit_action():
     
     window.section1.frame.disable_trash()
     window.section2.frame.disable_trash()  # Also disable trash for keywords
-    egz.eve_sig.set()
     window.start_button.setText("Cancel")
     print("Start button clicked - setting extraction signal")
     
@@ -545,11 +631,15 @@ def submit_action():
     
     progress_popup.buttonClicked.connect(handle_popup_cancel)
     
-    egz.eve_sig.set()
-    egz.timeout_event.clear()
-    egz.empty_domains.clear()
+    engine.timeout_event.clear()
+    engine.empty_domains.clear()
     
     window.section1.frame.reset_all_colors()
+    window.run_progress.setValue(0)
+    window.run_progress.setFormat("Starting...")
+    window.run_progress.setVisible(True)
+    engine.request_extraction(window.section1.frame.get_items(), window.section2.frame.get_items(),
+                              profile=window.profile_tog.isChecked())
     
     print("Extraction signal set, starting extraction...")
     
@@ -571,7 +661,7 @@ def check_extraction_status(progress_popup, status_timer):
         if hasattr(window, '_progress_popup'):
             delattr(window, '_progress_popup')
     
-    if egz.timeout_event.is_set():
+    if engine.timeout_event.is_set():
         cleanup_and_close()
         
         error_popup = QMessageBox(window)
@@ -581,9 +671,9 @@ def check_extraction_status(progress_popup, status_timer):
         error_popup.show()
         return
     
-    if egz.empty_domains.is_set():
+    if engine.empty_domains.is_set():
         cleanup_and_close()
-        egz.empty_domains.clear()
+        engine.empty_domains.clear()
         
         error_popup = QMessageBox(window)
         error_popup.setText("No domains selected! Please select at least one domain.")
@@ -592,13 +682,13 @@ def check_extraction_status(progress_popup, status_timer):
         error_popup.show()
         return
         
-    if not egz.eve_sig.is_set():
+    if not engine.eve_sig.is_set():
         cleanup_and_close()
         
         success_popup = QMessageBox(window)
         base_path = get_base_path()
         files_path = os.path.join(base_path, "files")
-        success_popup.setText(f"Extraction completed!\nTotal {egz.dwnld_count} files downloaded.\nFiles saved in {files_path} directory")
+        success_popup.setText(f"Extraction completed!\nTotal {engine.dwnld_count} files downloaded.\nFiles saved in {files_path} directory")
         success_popup.setStandardButtons(QMessageBox.StandardButton.Ok)
         print("Extraction completed!")
         submit_action()
@@ -627,6 +717,7 @@ class HomePage(QWidget):
         self.start_button.clicked.connect(submit_action)
         
         log_emitter.progress_update.connect(self.update_domain_color)
+        log_emitter.stats_update.connect(self.update_run_progress)
         
         self.file_browser = FileBrowser()
         self.file_browser.setVisible(False)
@@ -660,7 +751,7 @@ class HomePage(QWidget):
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         progress_layout.addWidget(self.status_label)
         
-        wid_show = egz.browser_ready.is_set()
+        wid_show = engine.browser_ready.is_set()
         self.section1.setVisible(wid_show)
         self.section2.setVisible(wid_show)
         self.progress_widget.setVisible(not wid_show)
@@ -672,11 +763,22 @@ class HomePage(QWidget):
         self.log_tog = QPushButton("Show Logs")
         self.log_tog.setCheckable(True)
         self.log_tog.clicked.connect(self.log_toggle)
+
+        # Writes cProfile, sampling and memory reports of the next runs to files/profiles/
+        self.profile_tog = QPushButton("Profile run")
+        self.profile_tog.setCheckable(True)
+        self.profile_tog.setToolTip("Write cProfile, sampling and memory reports of each run to files/profiles/")
+        
+        # Overall run progress, shown only while an extraction is running
+        self.run_progress = QProgressBar()
+        self.run_progress.setRange(0, 100)
+        self.run_progress.setVisible(False)
         
         row_buttons = QHBoxLayout()
         row_buttons.addWidget(self.start_button)
         row_buttons.addWidget(self.file_tog)
         row_buttons.addWidget(self.log_tog)
+        row_buttons.addWidget(self.profile_tog)
 
         extras_splitter = QSplitter()
         extras_splitter.setOrientation(Qt.Orientation.Vertical)
@@ -693,6 +795,7 @@ class HomePage(QWidget):
         
         # Add splitter to main layout
         main_layout.addWidget(row_wrapper)
+        main_layout.addWidget(self.run_progress)
         main_layout.addLayout(row_buttons)
         
         self.setLayout(main_layout)
@@ -700,12 +803,20 @@ class HomePage(QWidget):
     def update_domain_color(self, ministry_name, status, count):
         """Update the color of a domain entry based on extraction progress"""
         self.section1.frame.update_item_color(ministry_name, status, count)
+    
+    def update_run_progress(self, snapshot):
+        """Show overall percent, throughput and ETA of the running extraction"""
+        if not self.run_progress.isVisible():
+            return
+        self.run_progress.setValue(snapshot['percent'])
+        self.run_progress.setFormat(format_progress(snapshot))
     def closeEvent(self, event):
         """Handle window close event to ensure proper cleanup"""
         print("Closing application...")
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     log_stream = LogStream(log_emitter.log_message)
     
     def setup_logging():
@@ -716,72 +827,36 @@ if __name__ == "__main__":
         """Restore original stdout"""
         sys.stdout = sys.__stdout__
     
-    async def extraction_worker():
-        """Background thread that handles browser and extraction"""
-        try:
-            print("Starting data initialization (gui)...")
-            egz.browser_ready.clear()
-            res = await egz.egz_extract_defaults()
-            
-            if res < 0:
-                print("Data initialization failed!")
-                egz.browser_ready.set()
-            else:
-                print("Data initialization successful!")
-            while True:
-                if not egz.eve_sig.is_set():
-                    await asyncio.sleep(1)
-                    continue 
-                print("Processing extraction request...")
-                domain_names = window.section1.frame.get_items()
-                keyword_data = window.section2.frame.get_items()
-                
-                if(await egz.extract_mids(domain_names, keyword_data) < 0):
-                    continue
-                
-                if not egz.eve_sig.is_set():
-                    print("Extraction was cancelled, stopping...")
-                    continue
-                    
-                print("Extraction completed successfully!\nNow downloading files...")
-                window.section1.frame.cleanup()
-                egz.egz_download()
-                egz.eve_sig.clear()
-        except KeyboardInterrupt:
-            print("Extraction worker interrupted by user")
-        except TimeoutError:
-            print("Timeout occurred during extraction")
-            egz.timeout_event.set()
-        except Exception as e:
-            print(f"Error during extraction: {e}")
-        finally:
-            egz.eve_sig.clear()
-
     try:
         print("Creating Qt application...")
         app = QApplication(sys.argv)
         error_msg = "Browser Initialization error"
         
         setup_logging()
-        egz.set_log_emitter(log_emitter)
         
-        def run_async_worker():
-            """Wrapper to run async worker in its own event loop"""
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.run_until_complete(extraction_worker())
-            except Exception as e:
-                print(f"Error in async worker: {e}")
-                egz.browser_ready.set()
-            finally:
-                try:
-                    loop.close()
-                except Exception as e:
-                    print(f"Error closing loop: {e}")
-        
-        extraction_thread = Thread(target=run_async_worker, daemon=True)
-        extraction_thread.start()
+        engine = EngineProcess()
+        app.aboutToQuit.connect(engine.shutdown)
+        
+        def pump_engine():
+            """Forward engine messages to the GUI and recover from engine crashes"""
+            for message in engine.poll():
+                kind = message[0]
+                if kind == 'log':
+                    log_emitter.log_message.emit(message[1])
+                elif kind == 'progress':
+                    log_emitter.progress_update.emit(*message[1:])
+                elif kind == 'stats':
+                    log_emitter.stats_update.emit(message[1])
+                elif kind == 'downloading':
+                    window.section1.frame.cleanup()
+                elif kind == 'crashed':
+                    _, exitcode, restarted = message
+                    state = "restarting" if restarted else "giving up"
+                    print(f"Extraction engine exited unexpectedly (code {exitcode}), {state}")
+        
+        engine_timer = QTimer()
+        engine_timer.timeout.connect(pump_engine)
+        engine_timer.start(50)
         
         print("Initializing browser in background...")
         window = HomePage([], [], keywords=[])
@@ -790,6 +865,19 @@ if __name__ == "__main__":
         window.setWindowTitle("E-PubChecker - Initializing...")
         window.show()
         
+        def on_first_paint():
+            """Record time to the first painted window, then launch the browser engine"""
+            elapsed_ms = (perf_counter() - startup_started) * 1000
+            print(f"First window painted after {elapsed_ms:.0f} ms")
+            record_startup_time(elapsed_ms)
+            if os.environ.get('EPUB_STARTUP_PROBE'):
+                sys.__stdout__.write(f"first_paint_ms={elapsed_ms:.1f}\n")
+                app.quit()
+                return
+            engine.start()
+        
+        # Runs once the event loop has processed the initial show/paint events
+        QTimer.singleShot(0, on_first_paint)
 
         def fields_extraction():
             global window
@@ -797,16 +885,16 @@ if __name__ == "__main__":
             browser_timer.stop()
             
             try:
-                ministries_list = list(egz.valdict.values()) if hasattr(egz, 'valdict') else []
+                ministries_list = list(engine.valdict.values()) if hasattr(engine, 'valdict') else []
                 print(f"Found {len(ministries_list)-2} ministries")
                 
-                if hasattr(egz, 'kwlist'):
-                    print(f"Keywords: {[i[0] for i in egz.kwlist]}")
+                if hasattr(engine, 'kwlist'):
+                    print(f"Keywords: {[i[0] for i in engine.kwlist]}")
                 
                 if ministries_list and len(ministries_list) > 2:
                     print("Browser initialization completed!")
-                    default_domains = [egz.valdict[i] for i in egz.mlist_input] if hasattr(egz, 'mlist_input') else []
-                    default_keywords = [i for i in egz.kwlist] if hasattr(egz, 'kwlist') else []
+                    default_domains = [engine.valdict[i] for i in engine.mlist_input] if hasattr(engine, 'mlist_input') else []
+                    default_keywords = [i for i in engine.kwlist] if hasattr(engine, 'kwlist') else []
                     
                     new_window = HomePage(default_domains, ministries_list, keywords=default_keywords)
                     new_window.setWindowTitle("E-PubChecker")
@@ -820,6 +908,7 @@ if __name__ == "__main__":
                     window.start_button.setVisible(False)
                     window.file_tog.setVisible(False)
                     window.log_tog.setVisible(False)
+                    window.profile_tog.setVisible(False)
                     window.setWindowTitle("E-PubChecker")
                     QMessageBox.warning(window, error_msg, "Ministry data is incomplete. Kindly close the application and try again.")
                     app.quit()
@@ -831,6 +920,7 @@ if __name__ == "__main__":
                 window.start_button.setVisible(False)
                 window.file_tog.setVisible(False)
                 window.log_tog.setVisible(False)
+                window.profile_tog.setVisible(False)
                 window.setWindowTitle("E-PubChecker")
                 QMessageBox.warning(window, error_msg, f"Error loading browser data: {e}\nKindly close the application and try again..")
                 app.quit()
@@ -856,11 +946,12 @@ if __name__ == "__main__":
                 window.start_button.setVisible(False)
                 window.file_tog.setVisible(False)
                 window.log_tog.setVisible(False)
+                window.profile_tog.setVisible(False)
                 window.setWindowTitle("E-PubChecker")
                 QMessageBox.warning(window, error_msg, "Process timed out. Kindly close the application and try again.")
                 app.quit()
                 
-            if egz.browser_ready.is_set():
+            if engine.browser_ready.is_set():
                 fields_extraction()
             else:
                 dots = "." * (check_browser_ready.timeout_counter % 4)
@@ -0,0 +1,87 @@
+"""
+Startup Measurement - import-time budget check and time-to-first-paint probe
+
+Usage:
+    python measure_startup.py            # import budget + first paint
+    python measure_startup.py --top 25   # show more of the slowest imports
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# Cumulative budget for `import gui`, which must stay free of playwright/bs4/requests
+IMPORT_BUDGET_MS = 400
+FORBIDDEN_MODULES = ('playwright', 'bs4', 'requests', 'extraction', 'qtawesome', 'pdf_viewer')
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_imports(module="gui"):
+    """Run `python -X importtime -c "import <module>"` and parse its report"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR, capture_output=True, text=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+    return entries
+
+
+def measure_first_paint(timeout=60):
+    """Launch the GUI in probe mode and return (wall ms, in-process ms) to first paint"""
+    env = dict(os.environ, EPUB_STARTUP_PROBE="1")
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "gui.py"], cwd=SRC_DIR, env=env,
+        capture_output=True, text=True, timeout=timeout,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    for line in result.stdout.splitlines():
+        if line.startswith("first_paint_ms="):
+            return wall_ms, float(line.split("=")[1])
+    return wall_ms, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure E-PubChecker startup cost")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    parser.add_argument("--no-paint", action="store_true", help="skip the first-paint probe")
+    args = parser.parse_args()
+
+    entries = measure_imports()
+    if not entries:
+        print("Could not import gui; run this from an environment with the app's dependencies")
+        return 2
+    total_ms = next((cumulative for name, _, cumulative in entries if name == "gui"), 0)
+    print(f"import gui: {total_ms:.0f} ms cumulative (budget {IMPORT_BUDGET_MS} ms)")
+    print("Slowest imports (cumulative ms):")
+    for name, self_ms, cumulative_ms in sorted(entries, key=lambda e: e[2], reverse=True)[:args.top]:
+        print(f"  {cumulative_ms:8.1f}  {self_ms:8.1f}  {name}")
+
+    status = 0
+    loaded = {name.split('.')[0] for name, _, _ in entries}
+    leaked = [name for name in FORBIDDEN_MODULES if name in loaded]
+    if leaked:
+        print(f"FAIL: heavy modules imported at GUI startup: {', '.join(leaked)}")
+        status = 1
+    if total_ms > IMPORT_BUDGET_MS:
+        print("FAIL: import budget exceeded")
+        status = 1
+
+    if not args.no_paint:
+        wall_ms, paint_ms = measure_first_paint()
+        if paint_ms is None:
+            print("First paint: probe did not report (is a display available?)")
+        else:
+            print(f"First paint: {paint_ms:.0f} ms after gui.py started importing, {wall_ms:.0f} ms wall clock incl. interpreter and exit")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""
+Page Scripts Module - selectors and in-page JavaScript used to read listing tables
+
+Kept free of side effects so tools such as bench_ais_table.py can use the shipped
+scripts without importing the extraction engine.
+"""
+
+# Reads (UGID, subject) span texts of the results grid in one browser round-trip,
+# stopping at the first row without them (the pager) like the old row walk did
+GAZETTE_ROWS_JS = """() => {
+    const table = document.querySelector('table#gvGazetteList');
+    if (!table) return null;
+    const rows = [];
+    for (const row of Array.from(table.rows).slice(1)) {
+        const ugid = row.querySelector('span[id^="gvGazetteList_lbl_UGID_"]');
+        const subject = row.querySelector('span[id^="gvGazetteList_lbl_Subject_"]');
+        if (!ugid || !subject) break;
+        rows.push([ugid.textContent, subject.textContent]);
+    }
+    return rows;
+}"""
+
+AIS_TABLE_SELECTOR = "table:has(tbody tr td a[href])"
+# Pulls (code, href) for every ARAI table row in a single browser round-trip
+AIS_ROWS_JS = """rows => rows.map(row => {
+    const cells = row.querySelectorAll('td');
+    const link = cells.length > 3 ? cells[3].querySelector('a') : null;
+    return [cells.length > 1 ? cells[1].textContent : null, link ? link.getAttribute('href') : null];
+})"""
@@ -3,20 +3,411 @@ PDF Viewer Module - Enhanced PDF viewing with full document display and navigati
 """
 
 import os
-from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QHBoxLayout, QLineEdit, QComboBox, QMessageBox
-from PySide6.QtCore import Qt, QPointF
+import sys
+import json
+import hashlib
+import re
+from collections import OrderedDict
+from threading import Condition, Lock
+from PySide6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel, QHBoxLayout, QLineEdit, QComboBox, QMessageBox, QListView, QSplitter, QListWidget, QListWidgetItem, QCheckBox
+from PySide6.QtCore import Qt, QPointF, QSize, QThread, QTimer, Signal, QAbstractListModel, QModelIndex
 from PySide6.QtPdfWidgets import QPdfView
-from PySide6.QtPdf import QPdfDocument
-from PySide6.QtGui import QKeySequence, QShortcut
+from PySide6.QtPdf import QPdfDocument, QPdfSearchModel
+from PySide6.QtGui import QKeySequence, QShortcut, QImage, QColor, QPainter, QTransform
+
+THUMBNAIL_WIDTH = 120
+# Pages rendered ahead of and behind the current page
+PREFETCH_PAGES = 6
+PAGE_CACHE_BYTES = 96 * 1024 * 1024
+# Total size of the PDF files kept loaded after their viewers close
+DOCUMENT_CACHE_BYTES = 256 * 1024 * 1024
+MAX_VIEWERS = 6
+# Characters of context shown before and after a hit in the jump list
+HIT_CONTEXT = (15, 40)
+MAX_LISTED_HITS = 2000
+HIGHLIGHT_COLOR = QColor(255, 200, 0, 90)
+
+
+def _files_path(*parts):
+    """Path under the app's files directory, accounting for PyInstaller bundle"""
+    base = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base, "files", *parts)
+
+
+def document_keywords(pdf_path):
+    """Keywords that made the extractor download this PDF, from the folder's keywords.json"""
+    try:
+        with open(os.path.join(os.path.dirname(pdf_path), 'keywords.json'), 'r') as f:
+            details = json.load(f)
+    except (OSError, ValueError):
+        return []
+    entry = details.get(os.path.splitext(os.path.basename(pdf_path))[0], {})
+    return entry.get('keywords', [])
+
+
+class PageImageCache:
+    """Size-bounded LRU of rendered page images keyed by (file, version, page, scale)"""
+
+    def __init__(self, max_bytes=PAGE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.images = OrderedDict()
+        self.used = 0
+        self.lock = Lock()
+
+    def get(self, key):
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+            return image
+
+    def put(self, key, image):
+        with self.lock:
+            old = self.images.pop(key, None)
+            if old is not None:
+                self.used -= old.sizeInBytes()
+            self.images[key] = image
+            self.used += image.sizeInBytes()
+            while self.used > self.max_bytes and len(self.images) > 1:
+                _, evicted = self.images.popitem(last=False)
+                self.used -= evicted.sizeInBytes()
+
+
+# Shared by every viewer so reopening a file reuses its thumbnails
+page_cache = PageImageCache()
+
+
+class PageRenderer(QThread):
+    """Renders page images on a worker thread with its own QPdfDocument.
+
+    request() replaces the pending pages, so a fast scroll only renders where the user
+    stopped; finished images go to page_cache and are announced through `rendered`.
+    """
+    rendered = Signal(int)
+
+    def __init__(self, pdf_path, width, parent=None):
+        super().__init__(parent)
+        self.pdf_path = pdf_path
+        self.width = width
+        # A re-downloaded or replaced file gets new keys instead of the old file's images
+        try:
+            stat = os.stat(pdf_path)
+            self.version = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            self.version = None
+        self.pending = []
+        self.condition = Condition()
+        self.stopping = False
+
+    def key(self, page):
+        return (self.pdf_path, self.version, page, self.width)
+
+    def request(self, pages):
+        """Render these pages next, first ones first, skipping anything already cached"""
+        with self.condition:
+            self.pending = [page for page in pages if page_cache.get(self.key(page)) is None]
+            self.condition.notify()
+
+    def stop(self):
+        with self.condition:
+            self.stopping = True
+            self.pending = []
+            self.condition.notify()
+        self.wait()
+
+    def run(self):
+        document = QPdfDocument()
+        document.load(self.pdf_path)
+        if document.status() != QPdfDocument.Status.Ready:
+            return
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopping:
+                    self.condition.wait()
+                if self.stopping:
+                    break
+                page = self.pending.pop(0)
+            if not 0 <= page < document.pageCount() or page_cache.get(self.key(page)) is not None:
+                continue
+            point_size = document.pagePointSize(page)
+            height = int(self.width * point_size.height() / max(point_size.width(), 1))
+            rendered = document.render(page, QSize(self.width, max(height, 1)))
+            if rendered.isNull():
+                continue
+            # Pages render with a transparent background; flatten onto white paper
+            image = QImage(rendered.size(), QImage.Format.Format_RGB32)
+            image.fill(Qt.GlobalColor.white)
+            painter = QPainter(image)
+            painter.drawImage(0, 0, rendered)
+            painter.end()
+            page_cache.put(self.key(page), image)
+            self.rendered.emit(page)
+        document.close()
+
+
+class DocumentCache:
+    """Loaded QPdfDocuments shared between viewers.
+
+    Documents stay loaded after their last viewer closes, so reopening a file skips
+    parsing; unused ones are dropped least recently used first once the total file size
+    of the cache exceeds max_bytes.
+    """
+
+    def __init__(self, max_bytes=DOCUMENT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # path -> {'document', 'stamp', 'users', 'cost'}
+        self.orphans = {}  # documents replaced by a newer file version while still in use
+
+    def acquire(self, pdf_path):
+        path = os.path.abspath(pdf_path)
+        stat = os.stat(path)
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        entry = self.entries.get(path)
+        if entry is not None and entry['stamp'] != stamp:
+            # The file changed on disk; never hand out the stale version again
+            del self.entries[path]
+            if entry['users']:
+                self.orphans[id(entry['document'])] = entry
+            else:
+                entry['document'].deleteLater()
+            entry = None
+        if entry is None:
+            document = QPdfDocument()
+            document.load(path)
+            entry = {'document': document, 'stamp': stamp, 'users': 0, 'cost': stat.st_size}
+            self.entries[path] = entry
+        entry['users'] += 1
+        self.entries.move_to_end(path)
+        self._evict()
+        return entry['document']
+
+    def release(self, document):
+        orphan = self.orphans.pop(id(document), None)
+        if orphan is not None:
+            orphan['users'] -= 1
+            if orphan['users']:
+                self.orphans[id(document)] = orphan
+            else:
+                document.deleteLater()
+            return
+        for entry in self.entries.values():
+            if entry['document'] is document:
+                entry['users'] -= 1
+                break
+        self._evict()
+
+    def _evict(self):
+        used = sum(entry['cost'] for entry in self.entries.values())
+        for path in list(self.entries):
+            if used <= self.max_bytes:
+                break
+            entry = self.entries[path]
+            if entry['users'] == 0:
+                del self.entries[path]
+                used -= entry['cost']
+                entry['document'].close()
+                entry['document'].deleteLater()
+
+
+document_cache = DocumentCache()
+
+
+class TextIndexer(QThread):
+    """Extracts the text of every page once on a worker thread, caching it on disk.
+
+    requestInterruption() stops it between pages, so closing a viewer never waits for
+    the whole document.
+    """
+    indexed = Signal(list)
+
+    def __init__(self, pdf_path, parent=None):
+        super().__init__(parent)
+        self.pdf_path = pdf_path
+
+    def cache_path(self):
+        stat = os.stat(self.pdf_path)
+        key = f"{os.path.abspath(self.pdf_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        return _files_path("cache", "text", hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def run(self):
+        try:
+            cache_path = self.cache_path()
+        except OSError:
+            return
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                self.indexed.emit(json.load(f))
+            return
+        except (OSError, ValueError):
+            pass
+        document = QPdfDocument()
+        document.load(self.pdf_path)
+        if document.status() != QPdfDocument.Status.Ready:
+            return
+        pages = []
+        for page in range(document.pageCount()):
+            # Set by a closing viewer; a partial index is neither cached nor emitted
+            if self.isInterruptionRequested():
+                document.close()
+                return
+            pages.append(document.getAllText(page).text())
+        document.close()
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(pages, f)
+        except OSError as e:
+            print(f"Could not cache text index: {e}")
+        self.indexed.emit(pages)
+
+
+def find_hits(pages, terms):
+    """(page, start, term, context) for every case-insensitive occurrence of the terms"""
+    hits = []
+    for term in terms:
+        pattern = re.compile(re.escape(term), re.IGNORECASE)
+        for page, text in enumerate(pages):
+            for match in pattern.finditer(text):
+                before = text[max(match.start() - HIT_CONTEXT[0], 0):match.start()]
+                after = text[match.end():match.end() + HIT_CONTEXT[1]]
+                context = f"…{before}[{match.group()}]{after}…".replace('\n', ' ')
+                hits.append((page, match.start(), term, context))
+    hits.sort()
+    return hits
+
+
+class HighlightPdfView(QPdfView):
+    """QPdfView that also highlights every hit of several terms.
+
+    QPdfSearchModel looks for one string at a time, so hits of the other terms are painted
+    over the pages here, from the text index. Page geometry follows QPdfView's own layout
+    (screen resolution times page size, fitted to the viewport in the fit modes).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.hits_by_page = {}
+        # page -> highlight rectangles in points, worked out when the page is first painted
+        self.hit_rects = {}
+
+    def set_hits(self, hits):
+        """hits are find_hits() tuples; an empty list clears the highlights"""
+        self.hits_by_page = {}
+        for page, start, term, _ in hits:
+            self.hits_by_page.setdefault(page, []).append((start, len(term)))
+        self.hit_rects = {}
+        self.viewport().update()
+
+    def page_rects(self, page):
+        if page not in self.hit_rects:
+            document = self.document()
+            rects = []
+            for start, length in self.hits_by_page[page]:
+                selection = document.getSelectionAtIndex(page, start, length)
+                if selection.isValid():
+                    rects += [polygon.boundingRect() for polygon in selection.bounds()]
+            self.hit_rects[page] = rects
+        return self.hit_rects[page]
+
+    def page_geometries(self):
+        """Viewport rectangle of every page, mirroring QPdfView's document layout"""
+        document = self.document()
+        resolution = self.logicalDpiY() / 72.0
+        margins = self.documentMargins()
+        viewport = self.viewport().size()
+        first = self.pageNavigator().currentPage() if self.pageMode() == QPdfView.PageMode.SinglePage else 0
+        last = first + 1 if self.pageMode() == QPdfView.PageMode.SinglePage else document.pageCount()
+        sizes = {}
+        for page in range(first, last):
+            size = (document.pagePointSize(page) * resolution).toSize()
+            if self.zoomMode() == QPdfView.ZoomMode.Custom:
+                size = (document.pagePointSize(page) * resolution * self.zoomFactor()).toSize()
+            elif self.zoomMode() == QPdfView.ZoomMode.FitToWidth:
+                factor = (viewport.width() - margins.left() - margins.right()) / max(size.width(), 1)
+                size = (size.toSizeF() * factor).toSize()
+            else:
+                size = size.scaled(viewport.width() - margins.left() - margins.right(),
+                                   viewport.height() - self.pageSpacing(), Qt.AspectRatioMode.KeepAspectRatio)
+            sizes[page] = size
+        total_width = max((size.width() for size in sizes.values()), default=0) + margins.left() + margins.right()
+        x_offset = -self.horizontalScrollBar().value()
+        y = margins.top() - self.verticalScrollBar().value()
+        geometries = {}
+        for page, size in sizes.items():
+            x = (max(total_width, viewport.width()) - size.width()) // 2
+            geometries[page] = (x + x_offset, y, size)
+            y += size.height() + self.pageSpacing()
+        return geometries
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        document = self.document()
+        if not self.hits_by_page or document is None or document.status() != QPdfDocument.Status.Ready:
+            return
+        painter = QPainter(self.viewport())
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(HIGHLIGHT_COLOR)
+        height = self.viewport().height()
+        for page, (x, y, size) in self.page_geometries().items():
+            if page not in self.hits_by_page or y > height or y + size.height() < 0:
+                continue
+            points = document.pagePointSize(page)
+            transform = QTransform(size.width() / points.width(), 0, 0, size.height() / points.height(), x, y)
+            for rect in self.page_rects(page):
+                painter.drawRect(transform.mapRect(rect))
+        painter.end()
+
+
+class ThumbnailModel(QAbstractListModel):
+    """One row per page; images are requested from the renderer as rows become visible"""
+
+    def __init__(self, renderer, page_count, on_miss, parent=None):
+        super().__init__(parent)
+        self.renderer = renderer
+        self.page_count = page_count
+        self.on_miss = on_miss
+        self.placeholder = QImage(THUMBNAIL_WIDTH, int(THUMBNAIL_WIDTH * 1.414), QImage.Format.Format_RGB32)
+        self.placeholder.fill(QColor('#e0e0e0'))
+        self.visible_pages = set()
+        renderer.rendered.connect(self.on_rendered)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.page_count
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        page = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(page + 1)
+        if role == Qt.ItemDataRole.DecorationRole:
+            # The view only asks for rows it paints, so this is the on-demand hook
+            image = page_cache.get(self.renderer.key(page))
+            if image is None:
+                self.visible_pages.add(page)
+                self.on_miss()
+                return self.placeholder
+            return image
+        return None
+
+    def on_rendered(self, page):
+        index = self.index(page)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
 
 
 class PdfViewer(QMainWindow):
     """Enhanced PDF viewer with full document display and comprehensive navigation"""
+    closed = Signal(str)
     
-    def __init__(self, pdf_path):
+    def __init__(self, pdf_path, keywords=None):
         super().__init__()
+        # Windows are deleted on close so their widgets and workers are actually released
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         self.pdf_path = pdf_path
+        self.keywords = document_keywords(pdf_path) if keywords is None else keywords
         self.current_page = 0
+        self.page_texts = None
+        self.indexer = None
         self.setup_ui()
         self.setup_shortcuts()
         self.load_pdf()
@@ -39,17 +430,49 @@ class PdfViewer(QMainWindow):
         self.create_toolbar()
 
         # PDF View - Set to show full document
-        self.pdf_view = QPdfView()
+        self.pdf_view = HighlightPdfView()
         self.pdf_view.setPageMode(QPdfView.PageMode.MultiPage)  # Show all pages
         self.pdf_view.setZoomMode(QPdfView.ZoomMode.FitToWidth)  # Fit to width by default
-        layout.addWidget(self.pdf_view)
 
-        # Document
-        self.document = QPdfDocument(self)
-        self.pdf_view.setDocument(self.document)
+        # Thumbnail strip, filled by a background renderer once the document is ready
+        self.thumbnails = QListView()
+        self.thumbnails.setViewMode(QListView.ViewMode.IconMode)
+        self.thumbnails.setFlow(QListView.Flow.TopToBottom)
+        self.thumbnails.setWrapping(False)
+        self.thumbnails.setUniformItemSizes(True)
+        self.thumbnails.setMovement(QListView.Movement.Static)
+        self.thumbnails.setIconSize(QSize(THUMBNAIL_WIDTH, int(THUMBNAIL_WIDTH * 1.414)))
+        self.thumbnails.setMinimumWidth(THUMBNAIL_WIDTH + 40)
+        self.thumbnails.setStyleSheet("QListView { background-color: #9e9e9e; }")
+        self.thumbnails.clicked.connect(lambda index: self.jump_to_page(index.row()))
+        self.renderer = None
+        # Coalesces the cache misses of one paint into a single render request
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(20)
+        self.prefetch_timer.timeout.connect(self.prefetch_thumbnails)
+
+        # Search: the text index answers instantly; the search model paints the highlights
+        self.search_model = QPdfSearchModel(self)
+        self.pdf_view.setSearchModel(self.search_model)
+        self.hit_list = QListWidget()
+        self.hit_list.setVisible(False)
+        self.hit_list.currentRowChanged.connect(self.jump_to_hit)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        splitter.addWidget(self.thumbnails)
+        splitter.addWidget(self.pdf_view)
+        splitter.addWidget(self.hit_list)
+        splitter.setStretchFactor(1, 1)
+        splitter.setSizes([THUMBNAIL_WIDTH + 40, 860, 240])
+        layout.addWidget(splitter)
+
+        # Document: an empty placeholder until load_pdf takes one from the shared cache
+        self.empty_document = QPdfDocument(self)
+        self.document = self.empty_document
+        self.shared_document = False
 
         # Connect signals
-        self.document.statusChanged.connect(self.on_status_changed)
         self.pdf_view.pageNavigator().currentPageChanged.connect(self.on_current_page_changed)
 
     def create_toolbar(self):
@@ -126,6 +549,40 @@ class PdfViewer(QMainWindow):
         self.fit_page_action.triggered.connect(self.fit_to_page)
         self.fit_page_action.setShortcut(QKeySequence("Ctrl+F"))
 
+        toolbar.addSeparator()
+        self.thumbnails_action = toolbar.addAction("▤ Thumbnails")
+        self.thumbnails_action.setCheckable(True)
+        self.thumbnails_action.setChecked(True)
+        self.thumbnails_action.toggled.connect(lambda shown: self.thumbnails.setVisible(shown))
+
+        # Search bar on its own row
+        self.addToolBarBreak()
+        search_bar = self.addToolBar("Search")
+        search_widget = QWidget()
+        search_layout = QHBoxLayout(search_widget)
+        search_layout.setContentsMargins(5, 0, 5, 0)
+        search_layout.addWidget(QLabel("Find:"))
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search in document")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.returnPressed.connect(self.search_from_input)
+        search_layout.addWidget(self.search_input)
+        self.hits_label = QLabel("")
+        search_layout.addWidget(self.hits_label)
+        self.keyword_check = QCheckBox("Highlight keywords")
+        self.keyword_check.setToolTip("Highlight the keywords that caused this file to be downloaded")
+        self.keyword_check.setChecked(bool(self.keywords))
+        self.keyword_check.setEnabled(bool(self.keywords))
+        self.keyword_check.toggled.connect(self.on_keyword_toggle)
+        search_layout.addWidget(self.keyword_check)
+        search_bar.addWidget(search_widget)
+        self.prev_hit_action = search_bar.addAction("▲ Previous hit")
+        self.prev_hit_action.triggered.connect(lambda: self.step_hit(-1))
+        self.prev_hit_action.setShortcut(QKeySequence("Shift+F3"))
+        self.next_hit_action = search_bar.addAction("▼ Next hit")
+        self.next_hit_action.triggered.connect(lambda: self.step_hit(1))
+        self.next_hit_action.setShortcut(QKeySequence("F3"))
+
         # Initially disable navigation actions
         self.update_navigation_actions(False)
 
@@ -141,13 +598,20 @@ class PdfViewer(QMainWindow):
         QShortcut(QKeySequence("Ctrl+0"), self, self.reset_zoom)
         QShortcut(QKeySequence("="), self, self.zoom_in)
         QShortcut(QKeySequence("-"), self, self.zoom_out)
+        QShortcut(QKeySequence("Ctrl+Shift+F"), self, self.search_input.setFocus)
 
     def load_pdf(self):
         """Load the PDF document"""
         if self.pdf_path and os.path.exists(self.pdf_path):
             try:
                 print(f"Loading PDF: {self.pdf_path}")
-                self.document.load(self.pdf_path)
+                self.document = document_cache.acquire(self.pdf_path)
+                self.shared_document = True
+                self.pdf_view.setDocument(self.document)
+                self.search_model.setDocument(self.document)
+                self.document.statusChanged.connect(self.on_status_changed)
+                # A cached document is already loaded and will not signal again
+                self.on_status_changed(self.document.status())
             except Exception as e:
                 self.show_error(f"Error loading PDF: {str(e)}")
         else:
@@ -172,6 +636,8 @@ class PdfViewer(QMainWindow):
             self.status_label.hide()
             self.update_navigation_controls()
             self.update_navigation_actions(True)
+            self.start_thumbnails(page_count)
+            self.start_text_index()
         elif status == QPdfDocument.Status.Error:
             self.show_error("Failed to load PDF document")
 
@@ -179,6 +645,116 @@ class PdfViewer(QMainWindow):
         """Handle current page changes from the PDF view"""
         self.current_page = page_number
         self.update_navigation_controls()
+        if self.renderer is not None:
+            index = self.thumbnails.model().index(page_number)
+            self.thumbnails.setCurrentIndex(index)
+            self.thumbnails.scrollTo(index)
+            self.prefetch_thumbnails()
+
+    def start_thumbnails(self, page_count):
+        """Start the background renderer and hook the thumbnail strip to it"""
+        self.stop_thumbnails()
+        self.renderer = PageRenderer(self.pdf_path, THUMBNAIL_WIDTH, self)
+        self.thumbnails.setModel(ThumbnailModel(self.renderer, page_count, self.prefetch_timer.start, self.thumbnails))
+        self.renderer.start()
+        self.prefetch_thumbnails()
+
+    def stop_thumbnails(self):
+        if self.renderer is not None:
+            self.renderer.stop()
+            self.renderer = None
+
+    def prefetch_thumbnails(self):
+        """Queue the thumbnails just painted as placeholders, then pages around the current page"""
+        if self.renderer is None:
+            return
+        model = self.thumbnails.model()
+        wanted = sorted(model.visible_pages)
+        model.visible_pages.clear()
+        for offset in range(PREFETCH_PAGES + 1):
+            wanted += [self.current_page + offset, self.current_page - offset]
+        seen = set()
+        self.renderer.request([page for page in wanted
+                               if 0 <= page < model.page_count and not (page in seen or seen.add(page))])
+
+    def start_text_index(self):
+        """Build (or load) the page text index in the background"""
+        self.hits_label.setText("Indexing...")
+        self.indexer = TextIndexer(self.pdf_path, self)
+        self.indexer.indexed.connect(self.on_text_indexed)
+        self.indexer.start()
+
+    def on_text_indexed(self, pages):
+        self.page_texts = pages
+        self.hits_label.setText("")
+        if self.search_input.text():
+            self.search_from_input()
+        elif self.keyword_check.isChecked():
+            self.show_hits(self.keywords)
+
+    def on_keyword_toggle(self, checked):
+        if checked:
+            self.search_input.clear()
+            self.show_hits(self.keywords)
+        elif not self.search_input.text():
+            self.show_hits([])
+
+    def search_from_input(self):
+        text = self.search_input.text().strip()
+        if text:
+            self.keyword_check.setChecked(False)
+            self.show_hits([text])
+        else:
+            self.show_hits(self.keywords if self.keyword_check.isChecked() else [])
+
+    def show_hits(self, terms):
+        """Fill the jump list with every occurrence of terms and highlight them"""
+        self.hit_list.blockSignals(True)
+        self.hit_list.clear()
+        self.hit_list.blockSignals(False)
+        self.hits = []
+        if not terms:
+            self.pdf_view.set_hits([])
+            self.search_model.setSearchString("")
+            self.hits_label.setText("")
+            self.hit_list.setVisible(False)
+            return
+        if self.page_texts is None:
+            self.hits_label.setText("Indexing...")
+            return
+        self.hits = find_hits(self.page_texts, terms)
+        for page, _, term, context in self.hits[:MAX_LISTED_HITS]:
+            item = QListWidgetItem(f"p.{page + 1}  {context}")
+            item.setToolTip(term)
+            self.hit_list.addItem(item)
+        pages = len({hit[0] for hit in self.hits})
+        self.hits_label.setText(f"{len(self.hits)} hits on {pages} pages")
+        self.hit_list.setVisible(bool(self.hits))
+        # Every term's hits are painted by the view; the search model marks the current one
+        self.pdf_view.set_hits(self.hits)
+        self.search_model.setSearchString(terms[0])
+        if self.hits:
+            self.hit_list.setCurrentRow(0)
+
+    def step_hit(self, step):
+        if self.hit_list.count():
+            self.hit_list.setCurrentRow((self.hit_list.currentRow() + step) % self.hit_list.count())
+
+    def jump_to_hit(self, row):
+        """Scroll to a hit and highlight its term"""
+        if not 0 <= row < len(self.hits):
+            return
+        page, start, term, _ = self.hits[row]
+        if self.search_model.searchString() != term:
+            self.search_model.setSearchString(term)
+        selection = self.document.getSelectionAtIndex(page, start, len(term))
+        location = selection.boundingRectangle().topLeft() if selection.isValid() else QPointF()
+        self.pdf_view.pageNavigator().jump(page, location, self.pdf_view.zoomFactor())
+
+    def jump_to_page(self, page):
+        """Navigate to a 0-based page"""
+        if self.document.status() == QPdfDocument.Status.Ready and 0 <= page < self.document.pageCount():
+            self.pdf_view.pageNavigator().jump(page, QPointF(), self.pdf_view.zoomFactor())
 
     def update_navigation_controls(self):
         """Update navigation controls based on current page"""
@@ -290,6 +866,22 @@ class PdfViewer(QMainWindow):
         print(f"PDF Viewer Error: {message}")
         QMessageBox.warning(self, "PDF Viewer Error", message)
 
+    def closeEvent(self, event):
+        """Stop the background workers and hand the document back to the shared cache"""
+        self.stop_thumbnails()
+        if self.indexer is not None:
+            self.indexer.requestInterruption()
+            self.indexer.wait()
+        if self.shared_document:
+            self.document.statusChanged.disconnect(self.on_status_changed)
+            self.search_model.setDocument(self.empty_document)
+            self.pdf_view.setDocument(self.empty_document)
+            document_cache.release(self.document)
+            self.document = self.empty_document
+            self.shared_document = False
+        self.closed.emit(self.pdf_path)
+        super().closeEvent(event)
+
     def keyPressEvent(self, event):
         """Handle key press events"""
         # Let shortcuts handle the events first
@@ -309,16 +901,58 @@ class PdfViewer(QMainWindow):
             super().wheelEvent(event)
 
 
-def create_pdf_viewer(pdf_path):
+def create_pdf_viewer(pdf_path, keywords=None):
     """Factory function to create a PDF viewer"""
-    return PdfViewer(pdf_path)
+    return PdfViewer(pdf_path, keywords)
+
+
+class ViewerPool:
+    """At most one viewer window per file and max_viewers in total; the least recently used closes first"""
+
+    def __init__(self, max_viewers=MAX_VIEWERS):
+        self.max_viewers = max_viewers
+        self.viewers = OrderedDict()
+        self.quit_hooked = False
+
+    def open(self, pdf_path, keywords=None):
+        path = os.path.abspath(pdf_path)
+        viewer = self.viewers.get(path)
+        if not self.quit_hooked:
+            # Workers must be stopped before the application tears down
+            QApplication.instance().aboutToQuit.connect(self.close_all)
+            self.quit_hooked = True
+        if viewer is None:
+            viewer = create_pdf_viewer(pdf_path, keywords)
+            viewer.closed.connect(self._forget)
+            self.viewers[path] = viewer
+            while len(self.viewers) > self.max_viewers:
+                _, oldest = self.viewers.popitem(last=False)
+                oldest.close()
+        self.viewers.move_to_end(path)
+        viewer.show()
+        viewer.raise_()
+        viewer.activateWindow()
+        return viewer
+
+    def _forget(self, pdf_path):
+        self.viewers.pop(os.path.abspath(pdf_path), None)
+
+    def close_all(self):
+        while self.viewers:
+            _, viewer = self.viewers.popitem()
+            viewer.close()
+
+
+viewer_pool = ViewerPool()
+
+
+def open_pdf(pdf_path, keywords=None):
+    """Show pdf_path, reusing its window if it is already open"""
+    return viewer_pool.open(pdf_path, keywords)
 
 
 if __name__ == "__main__":
     """Test the PDF viewer standalone"""
-    import sys
-    from PySide6.QtWidgets import QApplication
-    
     app = QApplication(sys.argv)
     
     # Test with a sample PDF
@@ -0,0 +1,276 @@
+"""
+Profiling Module - per-run cProfile, stack sampling and tracemalloc reports, usable in frozen builds
+
+Enabled for every run with EPUB_PROFILE=1 or per run from the GUI's "Profile run" toggle.
+Each profiled run writes to files/profiles/<run-id>/:
+
+    summary.json        stage timings, top functions, peak memory
+    cprofile.prof       raw pstats data of all threads (python -m pstats / snakeviz)
+    cprofile.txt        top functions by cumulative and own time
+    samples.txt         top sampled functions and call stacks (wall clock, includes waiting)
+    samples.folded      all sampled stacks in folded format for flame graph tools
+    memory.txt          allocation sites at (close to) the highest traced memory of the run
+
+cProfile counts calls but skews time towards small functions; the sampler sees where the
+run actually spends wall time, including waits on the browser and network. Both cover
+every thread, so the download helper threads show up next to the engine thread.
+"""
+
+import cProfile
+import datetime
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from threading import Event, Lock, Thread, get_ident
+
+PROFILE_ENV = 'EPUB_PROFILE'
+SAMPLE_INTERVAL = 0.005
+MEMORY_CHECK_INTERVAL = 0.5
+# take_snapshot() walks every traced block, so the peak snapshot is only retaken after
+# memory grew by SNAPSHOT_GROWTH, and spaced out so snapshots take at most SNAPSHOT_BUDGET
+# of the run's time (and never come closer than MIN_SNAPSHOT_INTERVAL seconds)
+SNAPSHOT_GROWTH = 1.25
+SNAPSHOT_BUDGET = 0.05
+MIN_SNAPSHOT_INTERVAL = 1.0
+TRACE_FRAMES = 10
+TOP_N = 30
+
+
+def enabled_by_env():
+    return os.environ.get(PROFILE_ENV, '').strip().lower() not in ('', '0', 'false', 'no')
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler(Thread):
+    """Samples the call stacks of every thread at a fixed interval.
+
+    Stacks are rooted at a "[thread name]" frame. Shares are per sampling tick, so a
+    function several threads run at once can exceed 100%.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL, ignore=()):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.ignore = set(ignore)
+        self.stacks = Counter()
+        self.samples = 0
+        self.stopped = Event()
+
+    def run(self):
+        self.ignore.add(get_ident())
+        while not self.stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident in self.ignore:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(f"[{names.get(ident, ident)}]")
+                self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def top_functions(self, n=TOP_N, thread=None):
+        """(function, share of samples on the stack, share as the innermost frame), optionally of one thread"""
+        inclusive = Counter()
+        own = Counter()
+        for stack, count in self.stacks.items():
+            if thread is not None and stack[0] != f"[{thread}]":
+                continue
+            for label in set(stack[1:]):
+                inclusive[label] += count
+            own[stack[-1]] += count
+        total = max(self.samples, 1)
+        return [(label, count / total, own[label] / total) for label, count in inclusive.most_common(n)]
+
+
+class RunProfiler:
+    """Profiles every thread from start() to stop() and writes the reports"""
+
+    def __init__(self, run_id, out_dir, top_n=TOP_N):
+        self.run_id = run_id
+        self.out_dir = out_dir
+        self.top_n = top_n
+        self.stages = []
+        self.peak_bytes = 0
+        self.peak_snapshot = None
+        self.snapshot_at = 0.0
+        self.snapshot_seconds = 0.0
+        self.memory_stopped = Event()
+        self.thread_profiles = []
+        self.lock = Lock()
+        self.profiling = False
+
+    @classmethod
+    def for_run(cls, run_id, files_path):
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        return cls(f"{stamp}-run{run_id}", files_path("profiles", f"{stamp}-run{run_id}"))
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.thread_name = threading.current_thread().name
+        self.tracing_memory = not tracemalloc.is_tracing()
+        if self.tracing_memory:
+            tracemalloc.start(TRACE_FRAMES)
+        tracemalloc.reset_peak()
+        self.memory_thread = Thread(target=self._watch_memory, name="profile-memory", daemon=True)
+        self.memory_thread.start()
+        self.sampler = StackSampler(ignore=(self.memory_thread.ident,))
+        self.sampler.start()
+        self.profiling = True
+        # cProfile only sees the thread that enables it: threads started from now on
+        # (download helpers, executor workers) get their own profiler, merged in stop()
+        threading.setprofile(self._profile_thread)
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def _profile_thread(self, frame, event, arg):
+        sys.setprofile(None)
+        if not self.profiling:
+            return
+        profile = cProfile.Profile()
+        with self.lock:
+            self.thread_profiles.append(profile)
+        profile.enable()
+
+    def _watch_memory(self):
+        while not self.memory_stopped.wait(MEMORY_CHECK_INTERVAL):
+            self._check_memory()
+
+    def _check_memory(self, final=False):
+        """Retake the peak snapshot if memory reached a clearly higher point"""
+        current, _ = tracemalloc.get_traced_memory()
+        if current <= self.peak_bytes * SNAPSHOT_GROWTH:
+            return
+        spacing = max(MIN_SNAPSHOT_INTERVAL, self.snapshot_seconds / SNAPSHOT_BUDGET)
+        if not final and self.peak_snapshot is not None and time.monotonic() - self.snapshot_at < spacing:
+            return
+        started = time.monotonic()
+        self.peak_bytes = current
+        self.peak_snapshot = tracemalloc.take_snapshot()
+        self.snapshot_at = time.monotonic()
+        self.snapshot_seconds = self.snapshot_at - started
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append({'stage': name, 'seconds': round(time.perf_counter() - started, 3),
+                                'peak_mb': round(tracemalloc.get_traced_memory()[1] / 1024 ** 2, 2)})
+
+    def stop(self):
+        """Stop profiling, write the reports and return a one-line summary"""
+        self.profile.disable()
+        self.profiling = False
+        threading.setprofile(None)
+        self.sampler.stop()
+        self.memory_stopped.set()
+        self.memory_thread.join()
+        self._check_memory(final=True)
+        peak = tracemalloc.get_traced_memory()[1]
+        if self.tracing_memory:
+            tracemalloc.stop()
+        wall = time.perf_counter() - self.started
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        stats = self._merged_stats()
+        stats.dump_stats(os.path.join(self.out_dir, "cprofile.prof"))
+        hot = self._write_cprofile(stats)
+        sampled = self.sampler.top_functions(self.top_n)
+        self._write_samples(sampled)
+        sites = self._write_memory(peak)
+        summary = {
+            'run_id': self.run_id,
+            'wall_seconds': round(wall, 3),
+            'stages': self.stages,
+            'samples': self.sampler.samples,
+            'threads_profiled': 1 + len(self.thread_profiles),
+            'top_sampled': [{'function': label, 'inclusive': round(inc, 4), 'own': round(own, 4)}
+                            for label, inc, own in sampled],
+            'top_cumulative': hot,
+            'peak_memory_mb': round(peak / 1024 ** 2, 2),
+            'peak_sites': sites,
+        }
+        with open(os.path.join(self.out_dir, "summary.json"), 'w') as f:
+            json.dump(summary, f, indent=2)
+
+        # Idle helper threads spend most samples waiting, so the headline comes from the run's own thread
+        busiest = max(self.sampler.top_functions(self.top_n, self.thread_name), key=lambda entry: entry[2], default=None)
+        hotspot = f"hotspot {busiest[0]} {busiest[2]:.0%} of samples" if busiest else "no samples"
+        top_site = f" at {sites[0]['site']}" if sites else ""
+        return (f"Profile {self.run_id}: {wall:.1f}s, {hotspot}, peak memory {peak / 1024 ** 2:.1f} MB"
+                f"{top_site} -> {self.out_dir}")
+
+    def _merged_stats(self):
+        stats = pstats.Stats(self.profile)
+        with self.lock:
+            profiles = list(self.thread_profiles)
+        for profile in profiles:
+            # A thread still running past stop() keeps calling its profiler; its stats
+            # are taken as they are at this point
+            try:
+                stats.add(profile)
+            except TypeError:
+                # A profiler that has not recorded a single call has no stats to add
+                pass
+        return stats
+
+    def _write_cprofile(self, stats):
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats('cumulative').print_stats(self.top_n)
+        stats.sort_stats('tottime').print_stats(self.top_n)
+        with open(os.path.join(self.out_dir, "cprofile.txt"), 'w') as f:
+            f.write(stream.getvalue())
+        ranked = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top_n]
+        return [{'function': f"{func} ({os.path.basename(filename)}:{line})", 'calls': calls,
+                 'cumulative_s': round(cumulative, 4), 'own_s': round(own, 4)}
+                for (filename, line, func), (_, calls, own, cumulative, _) in ranked]
+
+    def _write_samples(self, sampled):
+        with open(os.path.join(self.out_dir, "samples.txt"), 'w') as f:
+            f.write(f"{self.sampler.samples} samples of every thread every {self.sampler.interval * 1000:.0f} ms\n\n")
+            f.write(f"{'on stack':>9} {'own':>7}  function\n")
+            for label, inclusive, own in sampled:
+                f.write(f"{inclusive:9.1%} {own:7.1%}  {label}\n")
+            f.write("\nTop stacks\n")
+            for stack, count in self.sampler.stacks.most_common(10):
+                f.write(f"\n{count / max(self.sampler.samples, 1):.1%} {stack[0]}\n")
+                f.writelines(f"    {label}\n" for label in stack[1:][-12:])
+        with open(os.path.join(self.out_dir, "samples.folded"), 'w') as f:
+            f.writelines(f"{';'.join(stack)} {count}\n" for stack, count in self.sampler.stacks.items())
+
+    def _write_memory(self, peak):
+        sites = []
+        if self.peak_snapshot is not None:
+            snapshot = self.peak_snapshot.filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ))
+            for stat in snapshot.statistics('lineno')[:self.top_n]:
+                frame = stat.traceback[0]
+                sites.append({'site': f"{os.path.basename(frame.filename)}:{frame.lineno}",
+                              'kb': round(stat.size / 1024, 1), 'blocks': stat.count})
+        with open(os.path.join(self.out_dir, "memory.txt"), 'w') as f:
+            f.write(f"Peak traced memory: {peak / 1024 ** 2:.2f} MB; "
+                    f"snapshot at {self.peak_bytes / 1024 ** 2:.2f} MB\n\n")
+            for site in sites:
+                f.write(f"{site['kb']:10.1f} KB {site['blocks']:8d} blocks  {site['site']}\n")
+        return sites[:5]
@@ -0,0 +1,117 @@
+"""
+Progress Aggregator Module - coalesces progress into rate-limited updates with throughput and ETA
+"""
+
+from threading import Lock, Thread
+from time import monotonic, sleep
+
+
+class ProgressAggregator:
+    """Tracks rows, files and bytes per ministry and publishes at most `interval` apart.
+
+    publish_status(ministry, status, count) receives the latest status of each ministry
+    that changed since the previous flush; publish_stats(snapshot) receives the overall
+    snapshot. Both are called from the flusher thread.
+    """
+
+    def __init__(self, publish_status, publish_stats, interval=0.25):
+        self.publish_status = publish_status
+        self.publish_stats = publish_stats
+        self.interval = interval
+        self.lock = Lock()
+        self.start_run(0)
+        Thread(target=self._flush_loop, name="progress-flusher", daemon=True).start()
+
+    def start_run(self, ministry_count):
+        """Forget the previous run and start timing a new one over ministry_count ministries"""
+        with self.lock:
+            self.started = monotonic()
+            self.ministry_count = ministry_count
+            self.ministries = {}
+            self.pending = {}
+            self.dirty = False
+
+    def _ministry(self, name):
+        if name not in self.ministries:
+            self.ministries[name] = {'status': 'default', 'rows': 0, 'files': 0, 'files_total': 0, 'bytes': 0}
+        return self.ministries[name]
+
+    def status(self, name, status, count="-"):
+        with self.lock:
+            self._ministry(name)['status'] = status
+            self.pending[name] = (status, count)
+            self.dirty = True
+
+    def add_rows(self, name, rows=1):
+        with self.lock:
+            self._ministry(name)['rows'] += rows
+            self.dirty = True
+
+    def expect_files(self, name, total):
+        with self.lock:
+            self._ministry(name)['files_total'] = total
+            self.dirty = True
+
+    def add_bytes(self, name, nbytes):
+        with self.lock:
+            self._ministry(name)['bytes'] += nbytes
+            self.dirty = True
+
+    def file_done(self, name):
+        with self.lock:
+            self._ministry(name)['files'] += 1
+            self.dirty = True
+
+    def snapshot(self):
+        """Overall totals, rates and ETA for the current run"""
+        with self.lock:
+            elapsed = max(monotonic() - self.started, 1e-6)
+            values = list(self.ministries.values())
+            rows = sum(m['rows'] for m in values)
+            files = sum(m['files'] for m in values)
+            files_total = sum(m['files_total'] for m in values)
+            nbytes = sum(m['bytes'] for m in values)
+            scanned = sum(1 for m in values if m['status'] in ('completed', 'error', 'skipped'))
+            # One unit per ministry to scan plus one per known file to download
+            total_units = max(self.ministry_count, len(values)) + files_total
+            done_units = min(scanned, self.ministry_count or scanned) + files
+            ministries = {name: dict(m) for name, m in self.ministries.items()}
+        rate = done_units / elapsed
+        remaining = max(total_units - done_units, 0)
+        return {
+            'elapsed_s': round(elapsed, 1),
+            'rows': rows,
+            'files': files,
+            'files_total': files_total,
+            'bytes': nbytes,
+            'rows_per_s': round(rows / elapsed, 2),
+            'mb_per_s': round(nbytes / elapsed / (1024 * 1024), 3),
+            'percent': int(100 * done_units / total_units) if total_units else 0,
+            'eta_s': round(remaining / rate, 1) if rate > 0 and remaining else (0 if not remaining else None),
+            'ministries': ministries,
+        }
+
+    def flush(self):
+        """Publish pending statuses and a fresh snapshot if anything changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            pending, self.pending = self.pending, {}
+            self.dirty = False
+        for name, (status, count) in pending.items():
+            self.publish_status(name, status, count)
+        self.publish_stats(self.snapshot())
+
+    def _flush_loop(self):
+        while True:
+            sleep(self.interval)
+            self.flush()
+
+
+def format_progress(snapshot):
+    """One-line human readable summary used for the log and the progress bar"""
+    eta = snapshot['eta_s']
+    eta_text = "--" if eta is None else f"{int(eta // 60)}:{int(eta % 60):02d}"
+    return (f"{snapshot['percent']}% | {snapshot['files']}/{snapshot['files_total']} files | "
+            f"{snapshot['rows']} rows | {snapshot['mb_per_s']:.2f} MB/s | "
+            f"{snapshot['rows_per_s']:.1f} rows/s | ETA {eta_text}")
@@ -0,0 +1,362 @@
+"""
+Keyword Query Module - boolean and proximity keyword queries compiled into one matcher
+
+Every kwlist entry is a query. Plain text such as `Draft Rules` is matched as a literal
+phrase, exactly as before. Queries may also use (operators are upper case):
+
+    A AND B, A OR B, NOT A     boolean logic, precedence NOT > NEAR > AND > OR
+    (A OR B) AND C             grouping
+    "Light House"              quoted phrase, keeps operator words literal
+    =EV                        whole word only (no letter or digit on either side)
+    ~Tyres, ~"Brake system"    fuzzy: ignores case, hyphens, spelling variants, suffixes
+                               and small typos (see fuzzy.py)
+    A NEAR/3 B                 A and B at most 3 words apart (plain NEAR means NEAR/5)
+
+Runs of bare words form a phrase; other adjacent operands are ANDed. All literals of
+all queries are scanned in a single pass over the subject, then each query is decided
+from the recorded positions.
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+import re
+
+import fuzzy
+
+DEFAULT_NEAR = 5
+# Bump whenever a change here or in fuzzy.py alters what a query matches; cached
+# classifications (classification_cache.py) of older versions are then ignored
+MATCHER_VERSION = 1
+TOKEN_RE = re.compile(r'\s*(?:(?P<lparen>\()|(?P<rparen>\))|"(?P<quoted>[^"]*)"|(?P<word>[^\s()"]+))')
+NEAR_RE = re.compile(r'NEAR(?:/(\d+))?$')
+# Anything that makes an entry more than a plain literal phrase
+QUERY_HINT = re.compile(r'["()]|(?:^|\s)[=~]|\b(?:AND|OR|NOT|NEAR(?:/\d+)?)\b')
+WORD_RE = re.compile(r'\w+')
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+class Scan:
+    """Positions of every literal in one subject, shared by all queries"""
+
+    def __init__(self, text, positions, fuzzy_index=None):
+        self.text = text
+        self.positions = positions
+        self.fuzzy_index = fuzzy_index
+        self._word_starts = None
+        self._fuzzy_tokens = None
+
+    def fuzzy_tokens(self):
+        """(token starts, canonical keyword word -> indices of the tokens that may stand for it)"""
+        if self._fuzzy_tokens is None:
+            lookup = self.fuzzy_index.lookup
+            starts = []
+            where = {}
+            for i, match in enumerate(fuzzy.TOKEN_RE.finditer(self.text)):
+                starts.append(match.start())
+                for word in lookup(match.group()):
+                    where.setdefault(word, set()).add(i)
+            self._fuzzy_tokens = (starts, where)
+        return self._fuzzy_tokens
+
+    def word_index(self, pos):
+        if self._word_starts is None:
+            self._word_starts = [m.start() for m in WORD_RE.finditer(self.text)]
+        return bisect_right(self._word_starts, pos) - 1
+
+
+class Term:
+    def __init__(self, literal, case_sensitive, whole_word=False):
+        self.literal = literal
+        self.key = literal.lower()
+        self.case_sensitive = case_sensitive
+        self.whole_word = whole_word
+
+    def _boundary(self, text, start, end):
+        return not ((start > 0 and text[start - 1].isalnum()) or (end < len(text) and text[end].isalnum()))
+
+    def hits(self, scan):
+        text = scan.text
+        size = len(self.literal)
+        for pos in scan.positions.get(self.key, ()):
+            if self.case_sensitive and text[pos:pos + size] != self.literal:
+                continue
+            if self.whole_word and not self._boundary(text, pos, pos + size):
+                continue
+            yield pos
+
+    def matches(self, scan):
+        return next(self.hits(scan), None) is not None
+
+    def terms(self):
+        return [self]
+
+    def scored_terms(self):
+        return [self]
+
+
+class FuzzyTerm:
+    def __init__(self, phrase):
+        self.phrase = phrase
+        self.words = [fuzzy.canonical(word) for word in fuzzy.tokenize(phrase)]
+
+    def hits(self, scan):
+        starts, where = scan.fuzzy_tokens()
+        first = where.get(self.words[0])
+        if not first:
+            return
+        rest = [where.get(word, ()) for word in self.words[1:]]
+        for i in sorted(first):
+            if all(i + j in indices for j, indices in enumerate(rest, 1)):
+                yield starts[i]
+
+    def matches(self, scan):
+        return next(self.hits(scan), None) is not None
+
+    def terms(self):
+        return [self]
+
+    def scored_terms(self):
+        return [self]
+
+
+class Not:
+    def __init__(self, operand):
+        self.operand = operand
+
+    def matches(self, scan):
+        return not self.operand.matches(scan)
+
+    def terms(self):
+        return self.operand.terms()
+
+    def scored_terms(self):
+        return []
+
+
+class And:
+    def __init__(self, operands):
+        self.operands = operands
+
+    def matches(self, scan):
+        return all(operand.matches(scan) for operand in self.operands)
+
+    def terms(self):
+        return [term for operand in self.operands for term in operand.terms()]
+
+    def scored_terms(self):
+        return [term for operand in self.operands for term in operand.scored_terms()]
+
+
+class Or(And):
+    def matches(self, scan):
+        return any(operand.matches(scan) for operand in self.operands)
+
+
+class Near:
+    def __init__(self, left, right, distance):
+        self.left = left
+        self.right = right
+        self.distance = distance
+
+    def matches(self, scan):
+        left = [scan.word_index(pos) for pos in self.left.hits(scan)]
+        if not left:
+            return False
+        return any(abs(scan.word_index(pos) - word) <= self.distance
+                   for pos in self.right.hits(scan) for word in left)
+
+    def terms(self):
+        return [self.left, self.right]
+
+    def scored_terms(self):
+        return [self.left, self.right]
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise QuerySyntaxError(f"Unclosed quote in {text!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text, case_sensitive):
+        self.text = text
+        self.case_sensitive = case_sensitive
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def is_operator(self, token, *names):
+        kind, value = token
+        if kind != 'word':
+            return False
+        if 'NEAR' in names and NEAR_RE.match(value):
+            return True
+        return value in names
+
+    def parse(self):
+        node = self.parse_or()
+        if self.pos != len(self.tokens):
+            raise QuerySyntaxError(f"Unexpected {self.peek()[1]!r} in {self.text!r}")
+        return node
+
+    def parse_or(self):
+        operands = [self.parse_and()]
+        while self.is_operator(self.peek(), 'OR'):
+            self.take()
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else Or(operands)
+
+    def starts_operand(self, token):
+        kind = token[0]
+        if kind in ('lparen', 'quoted'):
+            return True
+        return kind == 'word' and not self.is_operator(token, 'AND', 'OR', 'NEAR')
+
+    def parse_and(self):
+        operands = [self.parse_near()]
+        while True:
+            if self.is_operator(self.peek(), 'AND'):
+                self.take()
+            elif not self.starts_operand(self.peek()):
+                break
+            operands.append(self.parse_near())
+        return operands[0] if len(operands) == 1 else And(operands)
+
+    def parse_near(self):
+        left = self.parse_unary()
+        if not self.is_operator(self.peek(), 'NEAR'):
+            return left
+        distance = NEAR_RE.match(self.take()[1]).group(1)
+        right = self.parse_unary()
+        if not (isinstance(left, (Term, FuzzyTerm)) and isinstance(right, (Term, FuzzyTerm))):
+            raise QuerySyntaxError(f"NEAR needs a word or phrase on each side in {self.text!r}")
+        return Near(left, right, int(distance) if distance else DEFAULT_NEAR)
+
+    def parse_unary(self):
+        if self.is_operator(self.peek(), 'NOT'):
+            self.take()
+            return Not(self.parse_unary())
+        return self.parse_primary()
+
+    def parse_primary(self):
+        kind, value = self.take()
+        if kind == 'lparen':
+            node = self.parse_or()
+            if self.take()[0] != 'rparen':
+                raise QuerySyntaxError(f"Missing ')' in {self.text!r}")
+            return node
+        if kind == 'quoted':
+            return self.term(value, '')
+        if kind == 'word' and not self.is_operator((kind, value), 'AND', 'OR', 'NOT', 'NEAR'):
+            # '=' (whole word) or '~' (fuzzy) applies to the word run or quoted phrase it starts
+            marker = value[0] if value[0] in '=~' else ''
+            if value == marker and self.peek()[0] == 'quoted':
+                return self.term(self.take()[1], marker)
+            words = [value[len(marker):]]
+            # A run of bare words is one phrase
+            while self.peek()[0] == 'word' and self.peek()[1][0] not in '=~' \
+                    and not self.is_operator(self.peek(), 'AND', 'OR', 'NOT', 'NEAR'):
+                words.append(self.take()[1])
+            return self.term(' '.join(words), marker)
+        raise QuerySyntaxError(f"Expected a keyword in {self.text!r}" + (f" near {value!r}" if value else ""))
+
+    def term(self, literal, marker):
+        if not literal.strip() or (marker == '~' and not fuzzy.tokenize(literal)):
+            raise QuerySyntaxError(f"Empty keyword in {self.text!r}")
+        if marker == '~':
+            return FuzzyTerm(literal)
+        return Term(literal, self.case_sensitive, marker == '=')
+
+
+def parse_query(text, case_sensitive=False):
+    """Parse one kwlist entry; plain phrases without operators stay literal"""
+    if not QUERY_HINT.search(text):
+        return Term(text, case_sensitive)
+    return _Parser(text, case_sensitive).parse()
+
+
+class KeywordMatcher:
+    """Every query of a keyword list, decided from a single scan of the subject"""
+
+    def __init__(self, patterns):
+        self.queries = []
+        for entry in patterns:
+            text, case_sensitive = entry[0], entry[1]
+            try:
+                node = parse_query(text, case_sensitive)
+            except QuerySyntaxError as e:
+                print(f"Invalid keyword query ({e}), matching it literally")
+                node = Term(text, case_sensitive)
+            self.queries.append((text, node))
+
+        terms = [term for _, node in self.queries for term in node.terms()]
+        fuzzy_words = {word for term in terms if isinstance(term, FuzzyTerm) for word in term.words}
+        # Precomputed once per keyword list; subject words are memoised inside the index
+        self.fuzzy_index = fuzzy.FuzzyIndex(fuzzy_words) if fuzzy_words else None
+        literals = sorted({term.key for term in terms if isinstance(term, Term)}, key=len, reverse=True)
+        # Zero-width lookahead so overlapping literals are all seen; longest first, and a
+        # literal's shorter prefixes (which must match at the same spot) come from `prefixes`
+        self.scanner = re.compile('(?=(' + '|'.join(re.escape(lit) for lit in literals) + '))', re.IGNORECASE) if literals else None
+        self.prefixes = {lit: [other for other in literals if other != lit and lit.startswith(other)] for lit in literals}
+
+    def scan(self, text):
+        positions = {}
+        if self.scanner is not None:
+            for match in self.scanner.finditer(text):
+                start = match.start()
+                found = match.group(1).lower()
+                for lit in [found] + self.prefixes.get(found, []):
+                    positions.setdefault(lit, []).append(start)
+        return Scan(text, positions, self.fuzzy_index)
+
+    def search_terms(self, queries):
+        """Plain strings worth highlighting in a document that matched these queries"""
+        terms = []
+        for query, node in self.queries:
+            if query in queries:
+                for term in node.scored_terms():
+                    text = term.literal if isinstance(term, Term) else term.phrase
+                    if text not in terms:
+                        terms.append(text)
+        return terms
+
+    def matching(self, text):
+        """Queries (as written) that match text"""
+        scan = self.scan(text)
+        return [query for query, node in self.queries if node.matches(scan)]
+
+    def hit_counts(self, text):
+        """Per query: 0 if it does not match, else how often its non-negated terms occur (at least 1)"""
+        scan = self.scan(text)
+        return [max(1, sum(1 for term in node.scored_terms() for _ in term.hits(scan))) if node.matches(scan) else 0
+                for _, node in self.queries]
+
+
+@lru_cache(maxsize=16)
+def _compile(key):
+    return KeywordMatcher(key)
+
+
+def compile_keywords(patterns):
+    """Cached KeywordMatcher for a kwlist of [query, case_sensitive] or [query, case_sensitive, weight] entries"""
+    # Weights only matter to scoring; leaving them out also lets reweighted lists share a matcher
+    return _compile(tuple((entry[0], bool(entry[1])) for entry in patterns))
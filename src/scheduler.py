@@ -0,0 +1,92 @@
+"""
+Ministry Scheduler Module - orders ministries by historical yield and latency
+"""
+
+import json
+import os
+import time
+
+# Weight given to history when folding in a new observation (exponential moving average)
+HISTORY_WEIGHT = 0.7
+# Keep this many past run metrics in the stats file
+RUN_HISTORY = 50
+
+
+class MinistryScheduler:
+    """Records per-ministry rows, hits and latency across runs and schedules the work queue"""
+
+    def __init__(self, stats_path):
+        self.stats_path = stats_path
+        self.ministries, self.runs = self._load()
+        self.run_started = None
+        self.first_hit = None
+        self.first_download = None
+        self.observations = []  # (mcode, rows, hits, seconds) recorded since start_run
+
+    def _load(self):
+        try:
+            with open(self.stats_path, 'r') as f:
+                data = json.load(f)
+            return data.get('ministries', {}), data.get('runs', [])
+        except (FileNotFoundError, ValueError):
+            return {}, []
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.stats_path), exist_ok=True)
+        with open(self.stats_path, 'w') as f:
+            json.dump({'ministries': self.ministries, 'runs': self.runs[-RUN_HISTORY:]}, f, indent=2)
+
+    def yield_rate(self, mcode):
+        """Expected relevant rows per second; unseen ministries rank first so they get measured"""
+        stats = self.ministries.get(str(mcode))
+        if not stats:
+            return float('inf')
+        return stats['hits'] / max(stats['seconds'], 0.1)
+
+    def order(self, mlist):
+        """Return mlist with high-yield, fast ministries first (stable for ties)"""
+        return sorted(mlist, key=self.yield_rate, reverse=True)
+
+    def start_run(self):
+        self.run_started = time.monotonic()
+        self.first_hit = None
+        self.first_download = None
+        self.observations = []
+
+    def record(self, mcode, rows, hits, seconds):
+        """Fold one ministry's observation into its moving averages"""
+        self.observations.append((mcode, rows, hits, seconds))
+        stats = self.ministries.get(str(mcode))
+        if stats is None:
+            stats = {'rows': rows, 'hits': hits, 'seconds': seconds, 'runs': 0}
+        else:
+            for key, value in (('rows', rows), ('hits', hits), ('seconds', seconds)):
+                stats[key] = HISTORY_WEIGHT * stats[key] + (1 - HISTORY_WEIGHT) * value
+        stats['runs'] += 1
+        stats['hit_rate'] = stats['hits'] / stats['rows'] if stats['rows'] else 0.0
+        self.ministries[str(mcode)] = stats
+
+    def note_hit(self):
+        """Mark the moment the first relevant gazette of the run was found"""
+        if self.first_hit is None and self.run_started is not None:
+            self.first_hit = time.monotonic() - self.run_started
+            print(f"Time to first relevant gazette: {self.first_hit:.1f}s")
+
+    def note_download(self):
+        """Mark the moment the first relevant PDF of the run was saved"""
+        if self.first_download is None and self.run_started is not None:
+            self.first_download = time.monotonic() - self.run_started
+            print(f"Time to first relevant PDF: {self.first_download:.1f}s")
+
+    def finish_run(self):
+        """Store this run's metrics and persist the stats"""
+        if self.run_started is None:
+            return
+        self.runs.append({
+            'finished': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'seconds': round(time.monotonic() - self.run_started, 1),
+            'first_relevant_s': self.first_hit,
+            'first_pdf_s': self.first_download,
+        })
+        self.run_started = None
+        self.save()
@@ -0,0 +1,73 @@
+"""
+Relevance Scoring Module - weighted TF-IDF ranking of one ministry's batch of gazette subjects
+"""
+
+import numpy as np
+
+from classification_cache import fingerprint, normalize_subject
+from query import compile_keywords
+
+
+class RelevanceScorer:
+    """Collects keyword hit counts over a batch of rows and ranks the matching ones.
+
+    kwlist entries are [query, case_sensitive] with an optional third element, the
+    keyword weight (default 1; zero or negative weights push a row down). A row's score
+    is the sum over matching queries of weight * (1 + log tf) * idf, where idf is taken
+    over the whole batch. Rows without any hit only count towards the batch size.
+
+    With a ClassificationCache, hit counts of subjects seen in earlier runs are reused
+    and only queries missing from the cache are evaluated.
+    """
+
+    def __init__(self, kwlist, threshold=0.0, top_k=None, cache=None):
+        self.patterns = [entry[:2] for entry in kwlist]
+        self.matcher = compile_keywords(self.patterns)
+        self.cache = cache
+        self.fingerprints = [fingerprint(query, case_sensitive) for query, case_sensitive in self.patterns]
+        self.weights = np.array([float(entry[2]) if len(entry) > 2 else 1.0 for entry in kwlist])
+        self.threshold = threshold
+        self.top_k = top_k
+        self.total = 0
+        self.ids = []
+        self.counts = []
+
+    def add(self, row_id, text):
+        """Count keyword hits in one row and return the queries that matched"""
+        self.total += 1
+        counts = self._hit_counts(text)
+        if not any(counts):
+            return []
+        self.ids.append(row_id)
+        self.counts.append(counts)
+        return [query for (query, _), count in zip(self.matcher.queries, counts) if count]
+
+    def _hit_counts(self, text):
+        # Both paths match the normalized subject, so caching never changes a classification
+        subject = normalize_subject(text)
+        if self.cache is None:
+            return self.matcher.hit_counts(subject)
+        known = self.cache.lookup(subject, self.fingerprints)
+        missing = [i for i, fp in enumerate(self.fingerprints) if fp not in known]
+        if missing:
+            # After a keyword tweak every subject misses the same queries, so this
+            # sub-matcher is compiled once and reused for the whole batch
+            fresh = compile_keywords([self.patterns[i] for i in missing]).hit_counts(subject)
+            counts = {self.fingerprints[i]: count for i, count in zip(missing, fresh)}
+            self.cache.store(subject, counts)
+            known.update(counts)
+        return [known[fp] for fp in self.fingerprints]
+
+    def ranked(self):
+        """(score, row_id) pairs scoring above the threshold, best first, at most top_k"""
+        if not self.ids:
+            return []
+        tf = np.array(self.counts, dtype=float)
+        df = np.count_nonzero(tf, axis=0)
+        idf = np.log((1 + self.total) / (1 + df)) + 1
+        scores = np.where(tf > 0, 1 + np.log(np.maximum(tf, 1)), 0) @ (self.weights * idf)
+        order = np.argsort(-scores, kind='stable')
+        order = order[scores[order] > self.threshold]
+        if self.top_k is not None:
+            order = order[:self.top_k]
+        return [(float(scores[i]), self.ids[i]) for i in order]
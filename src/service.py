@@ -0,0 +1,376 @@
+"""
+Service Module - local HTTP API over the extraction engine, for scripts and other tools
+
+Run `python service.py [--host 127.0.0.1] [--port 8765]`. The engine process and its
+browser start once and stay warm between jobs, so only the first job pays the cold start.
+
+    GET  /health                     engine state and the running job
+    GET  /ministries                 ministry names, default selection and default keywords
+    POST /jobs                       {"ministries": [...], "keywords": [[query, case_sensitive, weight], ...],
+                                      "months": [1-12, ...], "profile": true}; all but ministries optional
+    GET  /jobs, /jobs/<id>           job status
+    POST /jobs/<id>/cancel           cancel a running job
+    GET  /events?since=<n>           server-sent events: log, progress, stats and job updates
+    GET  /catalogue?q=&ministry=&status=&year=&month=&limit=&offset=
+    GET  /metrics                    live progress snapshot and the stats of previous runs
+
+One job runs at a time, as in the GUI; starting another while one runs returns 409.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Condition, Lock, Thread
+from urllib.parse import parse_qs, urlparse
+
+from catalogue import Catalogue
+from engine import EngineProcess
+from query import parse_query, QuerySyntaxError
+
+EVENT_HISTORY = 5000
+KEEPALIVE_SECONDS = 15
+POLL_INTERVAL = 0.05
+FINISHED = ('done', 'cancelled', 'failed')
+
+
+def _files_path(*parts):
+    """Path under the app's files directory, accounting for PyInstaller bundle"""
+    base = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base, "files", *parts)
+
+
+def _read_json_file(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _int_or_none(value):
+    return int(value) if value else None
+
+
+def _valid_keyword(entry):
+    """[query] or [query, case_sensitive] or [query, case_sensitive, weight]"""
+    if not isinstance(entry, list) or not 1 <= len(entry) <= 3 or not isinstance(entry[0], str):
+        return False
+    if len(entry) > 1 and not isinstance(entry[1], bool):
+        return False
+    if len(entry) > 2:
+        weight = entry[2]
+        # bool is an int subclass, but true/false is never meant as a weight
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or not 0 <= weight < float('inf'):
+            return False
+    return True
+
+
+class ServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class EventLog:
+    """Numbered, bounded history of engine events that streaming clients wait on"""
+
+    def __init__(self, size=EVENT_HISTORY):
+        self.events = deque(maxlen=size)
+        self.seq = 0
+        self.condition = Condition()
+
+    def publish(self, kind, data):
+        with self.condition:
+            self.seq += 1
+            self.events.append((self.seq, kind, data))
+            self.condition.notify_all()
+
+    def since(self, seq, timeout):
+        """Events numbered above seq, waiting up to timeout seconds for the first one"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.seq > seq, timeout)
+            return [event for event in self.events if event[0] > seq]
+
+
+class ExtractionService:
+    """Owns the engine, turns its messages into job state and events"""
+
+    def __init__(self):
+        self.engine = EngineProcess()
+        self.events = EventLog()
+        self.catalogue = Catalogue(_files_path("catalogue", "catalogue.sqlite"))
+        self.lock = Lock()
+        self.jobs = {}
+        self.current = None
+        self.latest_stats = None
+        self.stopping = False
+
+    def start(self):
+        self.engine.start()
+        Thread(target=self._pump, name="engine-pump", daemon=True).start()
+
+    def stop(self):
+        self.stopping = True
+        self.engine.shutdown()
+
+    def _pump(self):
+        while not self.stopping:
+            for message in self.engine.poll():
+                self._handle(message)
+            time.sleep(POLL_INTERVAL)
+
+    def _handle(self, message):
+        kind = message[0]
+        if kind == 'ready':
+            self.events.publish('ready', {'ministries': len(self.engine.valdict)})
+        elif kind == 'log':
+            self.events.publish('log', {'message': message[1]})
+        elif kind == 'progress':
+            _, ministry, status, count = message
+            self.events.publish('progress', {'ministry': ministry, 'status': status, 'count': count})
+        elif kind == 'stats':
+            self.latest_stats = message[1]
+            self.events.publish('stats', message[1])
+        elif kind == 'downloading':
+            self._update_job(self.current, state='downloading')
+        elif kind == 'done':
+            _, run_id, downloaded = message
+            job = self.jobs.get(run_id)
+            if job is not None:
+                self._update_job(run_id, state='cancelled' if job['cancel_requested'] else 'done',
+                                 downloaded=downloaded, finished=time.time())
+        elif kind == 'crashed':
+            _, exitcode, restarted = message
+            self.events.publish('engine', {'crashed': exitcode, 'restarted': restarted})
+            self._update_job(self.current, state='failed', finished=time.time(),
+                             error=f"engine exited with code {exitcode}")
+
+    def _update_job(self, job_id, **changes):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or job['state'] in FINISHED:
+                return
+            job.update(changes)
+            if job['state'] in FINISHED and self.current == job_id:
+                self.current = None
+            snapshot = dict(job)
+        self.events.publish('job', snapshot)
+
+    def health(self):
+        return {
+            'engine_ready': self.engine.browser_ready.is_set() and not self.engine.stopping,
+            'engine_alive': self.engine.process is not None and self.engine.process.is_alive(),
+            'ministries': len(self.engine.valdict),
+            'current_job': self.current,
+        }
+
+    def _default_ministries(self):
+        return [self.engine.valdict[code] for code in self.engine.mlist_input if code in self.engine.valdict]
+
+    def ministries(self):
+        self._require_ready()
+        return {
+            'ministries': list(self.engine.valdict.values()),
+            'default_ministries': self._default_ministries(),
+            'default_keywords': self.engine.kwlist,
+        }
+
+    def _require_ready(self):
+        if not self.engine.browser_ready.is_set() or self.engine.stopping:
+            raise ServiceError(503, "Extraction engine is not ready yet")
+
+    def start_job(self, request):
+        self._require_ready()
+        names = set(self.engine.valdict.values())
+        ministries = request.get('ministries') or self._default_ministries()
+        unknown = [name for name in ministries if name not in names]
+        if unknown:
+            raise ServiceError(400, f"Unknown ministries: {unknown}")
+        keywords = request.get('keywords') or self.engine.kwlist
+        if not isinstance(keywords, list):
+            raise ServiceError(400, "keywords must be a list of [query, case_sensitive, weight] entries")
+        for entry in keywords:
+            if not _valid_keyword(entry):
+                raise ServiceError(400, f"Keywords must be [query, case_sensitive, weight] lists "
+                                        f"(string, boolean, non-negative number), got {entry!r}")
+            try:
+                parse_query(entry[0])
+            except QuerySyntaxError as e:
+                raise ServiceError(400, str(e))
+        keywords = [[entry[0], entry[1] if len(entry) > 1 else False, *entry[2:3]] for entry in keywords]
+        months = request.get('months') or []
+        if any(not isinstance(month, int) or not 1 <= month <= 12 for month in months):
+            raise ServiceError(400, "months must be month numbers 1-12 of the current year")
+
+        with self.lock:
+            if self.current is not None:
+                raise ServiceError(409, f"Job {self.current} is still running")
+            job_id = self.engine.request_extraction(ministries, keywords, months, bool(request.get('profile')))
+            self.current = job_id
+            job = self.jobs[job_id] = {
+                'id': job_id, 'state': 'running', 'ministries': ministries, 'keywords': keywords,
+                'months': months, 'created': time.time(), 'finished': None, 'downloaded': None,
+                'cancel_requested': False, 'error': None,
+            }
+            snapshot = dict(job)
+        self.events.publish('job', snapshot)
+        return snapshot
+
+    def job(self, job_id):
+        with self.lock:
+            if job_id not in self.jobs:
+                raise ServiceError(404, f"No job {job_id}")
+            return dict(self.jobs[job_id])
+
+    def list_jobs(self):
+        with self.lock:
+            return [dict(job) for job in self.jobs.values()]
+
+    def cancel_job(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                raise ServiceError(404, f"No job {job_id}")
+            if job['state'] in FINISHED:
+                return dict(job)
+            job['cancel_requested'] = True
+            self.engine.cancel()
+            return dict(job)
+
+    def metrics(self):
+        return {
+            'progress': self.latest_stats,
+            'last_run': _read_json_file(_files_path("stats", "progress.json")),
+            'scheduler': _read_json_file(_files_path("stats", "ministry_stats.json")),
+            'timeouts': _read_json_file(_files_path("stats", "timeouts.json")),
+        }
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    service = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            payload = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ServiceError(400, "Request body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise ServiceError(400, "Request body must be a JSON object")
+        return payload
+
+    def _job_id(self, part):
+        try:
+            return int(part)
+        except ValueError:
+            raise ServiceError(404, f"No job {part}")
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            if method == 'GET' and parts == ['events']:
+                return self._stream_events(int(query.get('since', 0)))
+            self._send_json(*self._route(method, parts, query))
+        except ServiceError as e:
+            self._send_json(e.status, {'error': str(e)})
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+        except Exception as e:
+            print(f"Service error on {method} {self.path}: {e}")
+            self._send_json(500, {'error': str(e)})
+
+    def _route(self, method, parts, query):
+        service = self.service
+        if method == 'GET':
+            if parts == ['health']:
+                return 200, service.health()
+            if parts == ['ministries']:
+                return 200, service.ministries()
+            if parts == ['jobs']:
+                return 200, service.list_jobs()
+            if len(parts) == 2 and parts[0] == 'jobs':
+                return 200, service.job(self._job_id(parts[1]))
+            if parts == ['catalogue']:
+                return 200, service.catalogue.search(query.get('q'), query.get('ministry'), query.get('status'),
+                                                     min(int(query.get('limit', 100)), 1000), int(query.get('offset', 0)),
+                                                     _int_or_none(query.get('year')), _int_or_none(query.get('month')))
+            if parts == ['metrics']:
+                return 200, service.metrics()
+        elif method == 'POST':
+            if parts == ['jobs']:
+                return 202, service.start_job(self._read_json())
+            if len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'cancel':
+                return 200, service.cancel_job(self._job_id(parts[1]))
+        raise ServiceError(404, f"No route for {method} {self.path}")
+
+    def _stream_events(self, since):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        try:
+            while not self.service.stopping:
+                events = self.service.events.since(since, KEEPALIVE_SECONDS)
+                if not events:
+                    self.wfile.write(b": keepalive\n\n")
+                for seq, kind, data in events:
+                    self.wfile.write(f"id: {seq}\nevent: {kind}\ndata: {json.dumps(data)}\n\n".encode('utf-8'))
+                    since = seq
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the extraction engine as a local HTTP service")
+    parser.add_argument('--host', default='127.0.0.1', help="interface to listen on (default: localhost only)")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    service = ExtractionService()
+    ServiceHandler.service = service
+    server = ThreadingHTTPServer((args.host, args.port), ServiceHandler)
+    server.daemon_threads = True
+    service.start()
+    print(f"Extraction service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping extraction service...")
+    finally:
+        server.server_close()
+        service.stop()
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,129 @@
+"""
+Adaptive Timeouts Module - per-operation timeouts learned from observed latencies
+"""
+
+import json
+import os
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+
+# Starting points (ms); also the values used until enough samples are collected
+DEFAULT_TIMEOUTS = {
+    'egz_goto': 45000,
+    'search_menu': 20000,
+    'select': 15000,
+    'submit': 15000,
+    'results': 15000,
+    'result_count': 10000,
+    'page_click': 15000,
+    'page_load': 10000,
+    'ais_goto': 30000,
+    'ais_idle': 15000,
+    'ais_table': 15000,
+    'ais_rows': 10000,
+    'http': 30000,
+}
+MIN_TIMEOUT_MS = 2000
+# Learned timeouts may grow to this multiple of the default on slow days
+MAX_TIMEOUT_FACTOR = 2
+
+
+class AdaptiveTimeouts:
+    """Derives timeouts from a rolling latency window (p99 x factor, clamped) and tracks time lost to them"""
+
+    def __init__(self, path, timeout_errors=(TimeoutError,), factor=3.0, window=200, min_samples=20):
+        self.path = path
+        self.timeout_errors = timeout_errors
+        self.factor = factor
+        self.min_samples = min_samples
+        self.samples = {op: deque(maxlen=window) for op in DEFAULT_TIMEOUTS}
+        # Samples not yet handed on with take_fresh(), for merging into another instance
+        self.fresh = {op: deque(maxlen=window) for op in DEFAULT_TIMEOUTS}
+        self.reset_telemetry()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                saved = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        for op, values in saved.get('samples', {}).items():
+            if op in self.samples:
+                self.samples[op].extend(values)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({'samples': {op: [round(v) for v in values] for op, values in self.samples.items()}}, f)
+
+    def reset_telemetry(self):
+        self.timeouts_hit = {op: 0 for op in DEFAULT_TIMEOUTS}
+        self.waited_ms = {op: 0.0 for op in DEFAULT_TIMEOUTS}
+
+    def percentile(self, op, q):
+        values = sorted(self.samples[op])
+        if not values:
+            return None
+        return values[min(int(q * len(values)), len(values) - 1)]
+
+    def get(self, op):
+        """Current timeout for an operation in milliseconds"""
+        default = DEFAULT_TIMEOUTS[op]
+        if len(self.samples[op]) < self.min_samples:
+            return default
+        learned = self.percentile(op, 0.99) * self.factor
+        return int(min(max(learned, MIN_TIMEOUT_MS), default * MAX_TIMEOUT_FACTOR))
+
+    def observe(self, op, elapsed_ms):
+        self.samples[op].append(elapsed_ms)
+        self.fresh[op].append(elapsed_ms)
+
+    def take_fresh(self):
+        """{op: samples} observed since the last call"""
+        fresh = {op: list(values) for op, values in self.fresh.items() if values}
+        for values in self.fresh.values():
+            values.clear()
+        return fresh
+
+    def merge(self, samples):
+        """Add samples observed elsewhere (see take_fresh) to the latency windows"""
+        for op, values in samples.items():
+            if op in self.samples:
+                self.samples[op].extend(values)
+
+    def timed_out(self, op, waited_ms):
+        """Record a timeout; the wait goes into the window as a (censored) latency sample.
+
+        The operation took at least waited_ms, so counting it lets a limit learned on a
+        fast day grow back once a few percent of the window times out on a slow one.
+        """
+        self.timeouts_hit[op] += 1
+        self.waited_ms[op] += waited_ms
+        self.observe(op, waited_ms)
+
+    @contextmanager
+    def track(self, op):
+        """Yield the timeout for op, recording the latency on success and the wasted wait on timeout"""
+        started = perf_counter()
+        try:
+            yield self.get(op)
+        except self.timeout_errors:
+            self.timed_out(op, (perf_counter() - started) * 1000)
+            raise
+        self.observe(op, (perf_counter() - started) * 1000)
+
+    def report(self):
+        """One line per operation that was used or timed out this run"""
+        lines = []
+        for op in DEFAULT_TIMEOUTS:
+            if not self.samples[op] and not self.timeouts_hit[op]:
+                continue
+            p50 = self.percentile(op, 0.5) or 0
+            p99 = self.percentile(op, 0.99) or 0
+            lines.append(f"{op}: timeout {self.get(op) / 1000:.1f}s, p50 {p50 / 1000:.1f}s, p99 {p99 / 1000:.1f}s, "
+                         f"{self.timeouts_hit[op]} timeouts costing {self.waited_ms[op] / 1000:.1f}s")
+        total = sum(self.waited_ms.values()) / 1000
+        lines.append(f"Total time spent waiting on timeouts: {total:.1f}s")
+        return lines
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+
+@pytest.fixture
+def egz(tmp_path, monkeypatch):
+    """The extraction module with its state files redirected under tmp_path"""
+    import extraction
+    from catalogue import Catalogue
+    from classification_cache import ClassificationCache
+    from scheduler import MinistryScheduler
+    from timeouts import AdaptiveTimeouts
+
+    def files_path(*parts):
+        return os.path.join(str(tmp_path), "files", *parts)
+
+    monkeypatch.setattr(extraction, 'get_files_path', files_path)
+    monkeypatch.setattr(extraction, 'scheduler', MinistryScheduler(files_path("stats", "ministry_stats.json")))
+    monkeypatch.setattr(extraction, 'timeouts', AdaptiveTimeouts(files_path("stats", "timeouts.json"),
+                                                                 extraction.timeouts.timeout_errors))
+    monkeypatch.setattr(extraction, 'catalogue', Catalogue(files_path("catalogue", "catalogue.sqlite")))
+    monkeypatch.setattr(extraction, 'classification_cache', ClassificationCache(files_path("cache", "classification.sqlite")))
+    extraction.eve_sig.set()
+    yield extraction
+    extraction.eve_sig.clear()
+    extraction.catalogue.close()
+    extraction.classification_cache.close()
@@ -0,0 +1,112 @@
+"""Cancelling a run returns within a second, whatever the page or network is doing"""
+
+import asyncio
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANCEL_AFTER = 0.3
+MAX_LATENCY = 1.0
+SLOW_CHUNKS = 40  # of 1 KB, one every 50 ms
+
+
+def _cancel_run(egz, coro_factory):
+    """Run the coroutine, clear eve_sig from another thread and time how long it takes to return"""
+
+    async def main():
+        threading.Timer(CANCEL_AFTER, egz.eve_sig.clear).start()
+        started = time.perf_counter()
+        result = await egz.run_until_cancelled(coro_factory())
+        return result, time.perf_counter() - started
+
+    return asyncio.run(main())
+
+
+class SlowPool:
+    """Browser pool whose page never finishes loading"""
+
+    async def run(self, job, name):
+        await asyncio.sleep(30)
+
+
+def test_cancel_mid_ministry(egz, monkeypatch):
+    monkeypatch.setattr(egz, 'pool', SlowPool(), raising=False)
+    monkeypatch.setitem(egz.valdict, 1, "Ministry of Testing")
+
+    result, elapsed = _cancel_run(egz, lambda: egz.egz_extract_pdfs([1], [['Test', False]]))
+
+    assert result is None
+    assert elapsed < CANCEL_AFTER + MAX_LATENCY
+
+
+def test_cancel_during_ais_api_request(egz, monkeypatch):
+    release = threading.Event()
+
+    def slow_get(url, **kwargs):
+        release.wait(10)
+        raise egz.RequestException("released")
+
+    monkeypatch.setattr(egz, '_load_ais_endpoints', lambda: {'draft': 'https://example.invalid/ais.json'})
+    monkeypatch.setattr(egz, '_http_get', slow_get)
+
+    async def extract():
+        try:
+            return await egz.ais_extract_pdfs()
+        finally:
+            # Lets the abandoned request thread finish so the loop can shut down
+            release.set()
+
+    result, elapsed = _cancel_run(egz, extract)
+
+    assert result is None
+    assert elapsed < CANCEL_AFTER + MAX_LATENCY
+
+
+class SlowFileHandler(BaseHTTPRequestHandler):
+    """Serves a 40 KB file over two seconds"""
+
+    finished = None
+
+    def do_GET(self):
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/pdf')
+            self.send_header('Content-Length', str(SLOW_CHUNKS * 1024))
+            self.end_headers()
+            for _ in range(SLOW_CHUNKS):
+                self.wfile.write(b'x' * 1024)
+                self.wfile.flush()
+                time.sleep(0.05)
+        except OSError:
+            pass
+        finally:
+            self.finished.set()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_cancel_mid_download(egz, tmp_path, monkeypatch):
+    finished = threading.Event()
+    monkeypatch.setattr(SlowFileHandler, 'finished', finished)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowFileHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    folder = tmp_path / "downloads"
+    try:
+        threading.Timer(CANCEL_AFTER, egz.eve_sig.clear).start()
+        started = time.perf_counter()
+        result = egz._download(f"http://127.0.0.1:{server.server_port}/gazette.pdf",
+                               str(folder / "gazette.pdf"), "Ministry of Testing")
+        elapsed = time.perf_counter() - started
+        # A new run starts straight away; the abandoned transfer must still stop and clean up
+        egz.eve_sig.set()
+        assert finished.wait(5)
+        time.sleep(0.2)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert result is False
+    assert elapsed < CANCEL_AFTER + MAX_LATENCY
+    assert os.listdir(folder) == []
@@ -0,0 +1,85 @@
+"""Units are leased once each across local workers, and expired leases are leased again"""
+
+import functools
+import multiprocessing as mp
+import os
+import secrets
+import socket
+import time
+
+import coordinator
+from catalogue import Catalogue
+from scheduler import MinistryScheduler
+
+HANG_SECONDS = 3
+
+
+class StubRunner:
+    """Finishes units at once, except the first attempt at ministry "Hang", which outlives its lease"""
+
+    def __init__(self, marker_dir, worker_id):
+        self.marker_dir = marker_dir
+        self.worker_id = worker_id
+
+    def run(self, ministry, month, keywords):
+        if ministry == "Hang":
+            try:
+                os.close(os.open(os.path.join(self.marker_dir, "hung"), os.O_CREAT | os.O_EXCL))
+                time.sleep(HANG_SECONDS)
+            except FileExistsError:
+                pass
+        record = {'ministry': ministry, 'gid': f"{ministry}-{month}", 'path': f"{ministry}/{month}.pdf",
+                  'status': 'downloaded', 'year': 2026, 'month': month}
+        return [record], {'scheduler': [(ministry, 10, 1, 0.5)], 'timeouts': {'http': [120.0]}}
+
+    def cancel(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def test_units_leased_once_and_expired_lease_reissued(tmp_path):
+    units = [(ministry, month) for ministry in ("Ministry A", "Ministry B", "Hang") for month in (5, 6)]
+    catalogue = Catalogue(str(tmp_path / "catalogue.sqlite"))
+    scheduler = MinistryScheduler(str(tmp_path / "ministry_stats.json"))
+    coord = coordinator.Coordinator(units, None, catalogue, lease_seconds=1, scheduler=scheduler)
+    address = ('127.0.0.1', _free_port())
+    authkey = secrets.token_hex(16).encode('utf-8')
+
+    ctx = mp.get_context('spawn')
+    factory = functools.partial(StubRunner, str(tmp_path))
+    workers = [ctx.Process(target=coordinator.run_worker, args=(address, authkey, f"worker-{i}", factory))
+               for i in range(2)]
+    for worker in workers:
+        worker.start()
+    try:
+        coord.serve(address, authkey)
+    finally:
+        for worker in workers:
+            worker.join(30)
+            if worker.is_alive():
+                worker.kill()
+
+    by_unit = {(unit['ministry'], unit['month']): unit for unit in coord.units.values()}
+    assert all(unit['state'] == 'done' for unit in by_unit.values())
+    hung = by_unit[("Hang", 5)] if by_unit[("Hang", 5)]['attempts'] else by_unit[("Hang", 6)]
+    assert hung['leases'] == 2 and 'expired' in hung['error']
+    assert all(unit['leases'] == 1 for unit in by_unit.values() if unit is not hung)
+    assert len(catalogue.search(limit=-1)) == len(units)
+    # Worker observations reach the coordinator's scheduler, which saved them on finish
+    assert MinistryScheduler(str(tmp_path / "ministry_stats.json")).ministries.keys() == {"Ministry A", "Ministry B", "Hang"}
+    catalogue.close()
+
+
+def test_arai_lists_are_one_unit():
+    units = coordinator.split_units(["Ministry A", "ARAI - AIS - draft", "ARAI - AIS - published"], [5, 6])
+
+    assert units == [("Ministry A", 5), ("Ministry A", 6), ("ARAI - AIS - draft", None), ("ARAI - AIS - published", None)]
+    assert coordinator.split_units(["Ministry A"], []) == [("Ministry A", None)]
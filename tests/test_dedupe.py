@@ -0,0 +1,36 @@
+"""Near-duplicate gazettes across ministries stay visible under both"""
+
+import asyncio
+import json
+import os
+
+SUBJECT = "Draft notification amending the Central Motor Vehicles Rules 1989 regarding alternate fuel kits"
+
+
+async def _rows(rows):
+    for row in rows:
+        yield row
+
+
+def _details(egz, ministry):
+    path = egz.get_files_path(ministry, str(egz.today.year), str(egz.today.month), 'keywords.json')
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_cross_ministry_duplicate_is_recorded(egz, monkeypatch):
+    monkeypatch.setitem(egz.valdict, 1, "Ministry A")
+    monkeypatch.setitem(egz.valdict, 2, "Ministry B")
+    egz.duplicate_index.reset()
+    egz.canonical_ministry.clear()
+    kwlist = [['Motor Vehicles', False]]
+
+    asyncio.run(egz._save_filtered_results(1, _rows([("CG-DL-E-01062026-100001", SUBJECT)]), kwlist, "Ministry A"))
+    asyncio.run(egz._save_filtered_results(2, _rows([("CG-DL-E-02062026-100002", SUBJECT + ".")]), kwlist, "Ministry B"))
+
+    assert "100001" in _details(egz, "Ministry A")
+    duplicate = _details(egz, "Ministry B")["100002"]
+    assert duplicate["duplicate_of"] == {'ministry': "Ministry A", 'ugid': "CG-DL-E-01062026-100001"}
+    # The canonical policy downloads only the first ministry's copy
+    list_path = egz.get_files_path("Ministry B", str(egz.today.year), str(egz.today.month), 'gids_list.txt')
+    assert os.path.getsize(list_path) == 0
@@ -0,0 +1,31 @@
+"""Relevance ranking gives the same result with and without the classification cache"""
+
+from classification_cache import ClassificationCache
+from scoring import RelevanceScorer
+
+KWLIST = [['"Motor Vehicles"', False, 2], ['Rules', False]]
+ROWS = [("g1", "Central Motor \n  Vehicles Rules"), ("g2", "Draft Rules"), ("g3", "Unrelated notice")]
+
+
+def _ranked(cache=None, top_k=None):
+    scorer = RelevanceScorer(KWLIST, top_k=top_k, cache=cache)
+    for row_id, text in ROWS:
+        scorer.add(row_id, text)
+    return scorer.ranked()
+
+
+def test_cached_and_uncached_scores_agree(tmp_path):
+    cache = ClassificationCache(str(tmp_path / "classification.sqlite"))
+    try:
+        uncached = _ranked()
+        assert _ranked(cache) == uncached
+        # Second pass is answered from the cache
+        assert _ranked(cache) == uncached
+    finally:
+        cache.close()
+    assert [row_id for _, row_id in uncached] == ["g1", "g2"]
+
+
+def test_top_k_zero_keeps_nothing():
+    assert _ranked(top_k=0) == []
+    assert len(_ranked(top_k=None)) == 2
@@ -0,0 +1,48 @@
+"""Scanning a ministry's results keeps memory bounded by the page, not the result count"""
+
+import asyncio
+import tracemalloc
+
+PAGE_ROWS = 15
+FILLER = "notification regarding amendments to procedural schedules of the department " * 3
+
+
+def _page(start, total):
+    rows = []
+    for index in range(start, min(start + PAGE_ROWS, total)):
+        # One row in a hundred is relevant; every subject is unique, like real results
+        topic = "Central Motor Vehicles Rules" if index % 100 == 0 else "Customs tariff"
+        rows.append((f"CG-DL-E-01062026-{index:06d}", f"{topic} {index} {FILLER}"))
+    return rows
+
+
+def _scan_peak(egz, monkeypatch, total):
+    async def next_page(gazette_data, ministry_name):
+        gazette_data['rows'] = _page(gazette_data['index'], total)
+        return True
+
+    monkeypatch.setattr(egz, '_navigate_next_page', next_page)
+    gazette_data = {'gcount': total, 'rows': _page(0, total), 'index': 0, 'page_num': 1}
+    egz.duplicate_index.reset()
+    tracemalloc.start()
+    try:
+        rows = egz._iter_gazette_rows(gazette_data, "Ministry of Testing")
+        row_count, relevant = asyncio.run(egz._save_filtered_results(1, rows, [['Motor Vehicles', False]], "Ministry of Testing"))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert (row_count, relevant) == (total, total // 100)
+    return peak
+
+
+def test_peak_memory_does_not_grow_with_results(egz, monkeypatch):
+    monkeypatch.setitem(egz.valdict, 1, "Ministry of Testing")
+    # Row-by-row logging would otherwise pile up in pytest's capture buffer
+    monkeypatch.setattr(egz, 'print', lambda *args, **kwargs: None, raising=False)
+
+    small = _scan_peak(egz, monkeypatch, 5000)
+    large = _scan_peak(egz, monkeypatch, 25000)
+
+    # Holding the rows would take about 8 MB more for the extra 20k; only the relevant ones are kept
+    assert large < small + 3 * 1024 ** 2
+    assert large < 12 * 1024 ** 2
@@ -0,0 +1,19 @@
+"""Timeouts feed back into the learned limits"""
+
+from timeouts import MIN_TIMEOUT_MS, AdaptiveTimeouts
+
+
+def test_consecutive_timeouts_raise_the_limit(tmp_path):
+    timeouts = AdaptiveTimeouts(str(tmp_path / "timeouts.json"))
+    # A fast day: the learned limit is clamped down to the minimum
+    for _ in range(200):
+        timeouts.observe('page_load', 100)
+    learned = timeouts.get('page_load')
+    assert learned == MIN_TIMEOUT_MS
+
+    # A slow day: every wait runs into the current limit
+    for _ in range(10):
+        timeouts.timed_out('page_load', timeouts.get('page_load'))
+
+    assert timeouts.get('page_load') > learned
+    assert timeouts.timeouts_hit['page_load'] == 10